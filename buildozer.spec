@@ -3,7 +3,7 @@ title = Puzzle Halal Haram
 package.name = puzzlehalalharam
 package.domain = org.example
 source.dir = .
-source.include_exts = py,png,jpg,wav,kv,json
+source.include_exts = py,png,jpg,wav,ogg,kv,json,atlas
 version = 0.1
 requirements = python3,kivy==2.1.0
 # if you need other modules: e.g. kivy-deps.sdl2,kivy-deps.glew
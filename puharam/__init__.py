@@ -0,0 +1,8 @@
+"""PuHaRam: drag each food bubble into the HALAL or HARAM bucket.
+
+Kept import-free so `import puharam` is cheap; the menu path lives in
+puharam.app and everything else is imported on demand.
+"""
+from time import perf_counter
+
+STARTUP_T0 = perf_counter()  # for the startup-time log in PuHaRam.on_start
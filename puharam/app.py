@@ -0,0 +1,141 @@
+"""The PuHaRam app.
+
+Only the menu path is imported up front. The game screen, telemetry and
+session recording modules are imported when the game is first started,
+and the leaderboard client after the first frame, so cold start only
+pays for what the menu needs.
+"""
+import os
+import time
+from time import perf_counter
+
+import kivy
+kivy.require("2.3.0")
+
+from kivy.app import App  # noqa: E402
+from kivy.clock import Clock  # noqa: E402
+from kivy.uix.screenmanager import FadeTransition, ScreenManager  # noqa: E402
+
+from puharam import STARTUP_T0  # noqa: E402
+from puharam.assets import GameAssets  # noqa: E402
+from puharam.menu import MainMenuScreen  # noqa: E402
+from puharam.perf import perf  # noqa: E402
+from puharam.scores import ScoreStore  # noqa: E402
+
+# ----------------------------
+# App
+# ----------------------------
+class PuHaRam(App):
+    def build(self):
+        sm = ScreenManager(transition=FadeTransition())
+        menu = MainMenuScreen(name="menu")
+        sm.add_widget(menu)
+        sm.current = "menu"
+
+        # high score file lives in the writable app data dir, seeded from the bundled one
+        self.score_store = ScoreStore(os.path.join(self.user_data_dir, "highscore.json"),
+                                      seed_path="highscore.json")
+        self.score_store.start(on_loaded=menu.show_best)
+
+        # gameplay telemetry starts with the game screen (see get_game_screen)
+        self.telemetry = None
+        # online leaderboard, after the first frame (see start_leaderboard)
+        self.leaderboard = None
+
+        # game assets load in the background; GameScreen is built on first start
+        self.assets = GameAssets(on_progress=menu.set_progress, on_ready=menu.on_assets_ready)
+        self.assets.start()
+
+        # debug keys: F12 overlay, F11 cProfile capture, F10 dump samples,
+        # F9 leak / memory diagnostics
+        from kivy.core.window import Window
+        Window.bind(on_key_down=self.on_key_down)
+        if os.environ.get("PUHARAM_PROFILE") == "1":
+            perf.toggle_profile()
+        return sm
+
+    def on_start(self):
+        Clock.schedule_once(self.log_first_frame, 0)
+        Clock.schedule_once(self.start_leaderboard, 0)
+
+    def log_first_frame(self, dt):
+        print(f"startup: menu visible after {(perf_counter() - STARTUP_T0) * 1000:.0f} ms")
+
+    def start_leaderboard(self, dt):
+        # PUHARAM_LEADERBOARD_URL=http://host:port turns the online leaderboard on
+        # (tools/leaderboard_server.py is a local stand-in)
+        url = os.environ.get("PUHARAM_LEADERBOARD_URL")
+        if not url:
+            return
+        from puharam.leaderboard import LeaderboardClient
+        self.leaderboard = LeaderboardClient(url, os.path.join(self.user_data_dir, "leaderboard.json"),
+                                             name=os.environ.get("PUHARAM_PLAYER_NAME"))
+        self.leaderboard.start()
+        menu = self.root.get_screen("menu")
+        menu.show_leaderboard()
+        if self.root.has_screen("game"):
+            self.root.get_screen("game").leaderboard = self.leaderboard
+
+    def get_game_screen(self):
+        if not self.root.has_screen("game"):
+            t0 = perf_counter()
+            # game modules are only imported once a game is started
+            from puharam.game import GameScreen
+            # gameplay telemetry (PUHARAM_TELEMETRY=0 turns it off)
+            if os.environ.get("PUHARAM_TELEMETRY", "1") != "0":
+                from puharam.telemetry import Telemetry
+                self.telemetry = Telemetry(os.path.join(self.user_data_dir, "telemetry.db"))
+                self.telemetry.start()
+            self.root.add_widget(GameScreen(name="game", assets=self.assets,
+                                            score_store=self.score_store,
+                                            telemetry=self.telemetry,
+                                            leaderboard=self.leaderboard,
+                                            governor=os.environ.get("PUHARAM_GOVERNOR", "1") != "0"))
+            print(f"startup: GameScreen built in {(perf_counter() - t0) * 1000:.0f} ms "
+                  f"(assets loaded in {(self.assets.load_time or 0) * 1000:.0f} ms)")
+            # PUHARAM_RECORD=<dir> records the session for tools/replay.py
+            record_dir = os.environ.get("PUHARAM_RECORD")
+            if record_dir:
+                os.makedirs(record_dir, exist_ok=True)
+                name = time.strftime("session_%Y%m%d_%H%M%S.log.gz")
+                self.root.get_screen("game").start_recording(os.path.join(record_dir, name))
+        return self.root.get_screen("game")
+
+    def on_key_down(self, window, key, scancode, codepoint, modifiers):
+        try:
+            game = self.root.get_screen("game")
+        except Exception:
+            return False
+        if key == 293:    # F12
+            game.toggle_perf_overlay()
+            return True
+        if key == 292:    # F11
+            path = perf.toggle_profile()
+            if path:
+                print("cProfile capture written to", path)
+            return True
+        if key == 291:    # F10
+            print("perf samples written to", perf.dump())
+            return True
+        if key == 290:    # F9
+            from puharam.diagnostics import report
+            print(report(game))
+            return True
+        return False
+
+    def on_stop(self):
+        try:
+            game = self.root.get_screen("game")
+            game.stop_recording()
+            game.end_session()
+        except Exception:
+            pass
+        self.score_store.close()
+        if self.telemetry is not None:
+            self.telemetry.close()
+        if self.leaderboard is not None:
+            self.leaderboard.close()
+        if perf.profiler is not None:
+            print("cProfile capture written to", perf.toggle_profile())
+        if os.environ.get("PUHARAM_PERF_DUMP") == "1" and perf.frames:
+            print("perf samples written to", perf.dump())
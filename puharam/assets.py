@@ -0,0 +1,153 @@
+"""Asset paths, density-aware icons and the background asset loader."""
+import os
+import threading
+from time import perf_counter
+
+from kivy.clock import Clock
+from kivy.metrics import Metrics
+
+from puharam.dataset import open_food_dataset
+
+BGM_PATH = "assets/sounds/bgm_piano_islamic.wav"
+CORRECT_SFX_PATH = "assets/sounds/correct.wav"
+WRONG_SFX_PATH = "assets/sounds/wrong.wav"
+SFX_VOICES = 3  # overlapping plays per sound effect
+HEART_PATH = os.path.join("assets", "icons", "heart.png")
+PAUSE_ICON_PATH = "assets/icons/pause_icon2.png"
+# on-screen icon sizes in dp: bucket scale x size is the atlas pixel size
+HEART_SIZE = 44
+PAUSE_ICON_SIZE = 90
+
+# icon atlases built by tools/build_atlas.py, one per density bucket
+ATLAS_DIR = "assets/atlas"
+DENSITY_BUCKETS = (("mdpi", 1.0), ("hdpi", 1.5), ("xhdpi", 2.0), ("xxhdpi", 3.0))
+
+
+def density_bucket(density=None):
+    if density is None:
+        density = Metrics.density
+    for name, scale in DENSITY_BUCKETS:
+        if density <= scale:
+            return name
+    return DENSITY_BUCKETS[-1][0]
+
+
+def icon_atlas():
+    # atlas base path for this device, or None if the atlases were not built
+    base = f"{ATLAS_DIR}/icons-{density_bucket()}"
+    if os.path.exists(base + ".atlas"):
+        return base
+    return None
+
+
+def icon_source(name, fallback):
+    # all icons from one atlas share a single texture
+    base = icon_atlas()
+    if base is None:
+        return fallback
+    return f"atlas://{base}/{name}"
+
+
+def create_audio():
+    # the audio providers are imported with the first sound, after the menu is up
+    from puharam.audio import AudioManager
+    return AudioManager()
+
+
+def load_audio_step(audio, step):
+    kind, name, path, voices, volume = step
+    if kind == "bgm":
+        audio.load_bgm(path, volume)
+    else:
+        audio.load_sfx(name, path, voices, volume)
+
+
+# ----------------------------
+# Game assets (loaded in the background while the menu is shown)
+# ----------------------------
+class GameAssets:
+    """Dataset and sounds used by GameScreen.
+
+    start() parses the dataset and reads the asset files on a worker thread
+    (so the OS file cache is warm), then loads one sound per frame on the
+    UI thread, where SoundLoader has to run. The sounds end up in an
+    AudioManager (self.audio): SFX voice pools and the streamed BGM.
+    on_progress(fraction, text) and on_ready() are always called on the
+    UI thread.
+    """
+
+    def __init__(self, on_progress=None, on_ready=None):
+        self.on_progress = on_progress
+        self.on_ready = on_ready
+        self.food_dataset = []
+        self.audio = None
+        self.ready = False
+        self.progress = 0.0
+        self.load_time = None
+        self._t0 = None
+        # (kind, name, path, voices, volume); the bgm is streamed, not preloaded
+        self._sounds = [
+            ("bgm", "bgm", BGM_PATH, 1, 0.4),
+            ("sfx", "correct", CORRECT_SFX_PATH, SFX_VOICES, 1.0),
+            ("sfx", "wrong", WRONG_SFX_PATH, SFX_VOICES, 1.0),
+        ]
+        # file warm-up, one dataset step, one step per sound
+        atlas = icon_atlas()
+        icons = [atlas + "-0.png"] if atlas else [HEART_PATH, PAUSE_ICON_PATH]
+        self._files = [CORRECT_SFX_PATH, WRONG_SFX_PATH] + icons
+        self._steps = len(self._files) + 1 + len(self._sounds)
+        self._done = 0
+
+    # load everything right now (tools, benchmarks, GameScreen without a loader)
+    @classmethod
+    def load_sync(cls):
+        assets = cls()
+        assets.food_dataset = open_food_dataset()
+        assets.audio = create_audio()
+        for step in assets._sounds:
+            load_audio_step(assets.audio, step)
+        assets.ready = True
+        assets.progress = 1.0
+        return assets
+
+    def start(self):
+        self._t0 = perf_counter()
+        threading.Thread(target=self._load_files, name="asset-loader", daemon=True).start()
+
+    def _step(self, text):
+        self._done += 1
+        self.progress = self._done / float(self._steps)
+        if self.on_progress:
+            self.on_progress(self.progress, text)
+
+    def _load_files(self):
+        # worker thread: nothing here touches Kivy widgets, GL or audio
+        for path in self._files:
+            try:
+                with open(path, "rb") as f:
+                    while f.read(1 << 20):
+                        pass
+            except Exception:
+                pass
+            Clock.schedule_once(lambda dt, p=path: self._step(os.path.basename(p)), 0)
+        foods = open_food_dataset()
+        Clock.schedule_once(lambda dt: self._dataset_loaded(foods), 0)
+
+    def _dataset_loaded(self, foods):
+        self.food_dataset = foods
+        self._step("dataset")
+        Clock.schedule_once(self._load_next_sound, 0)
+
+    def _load_next_sound(self, dt):
+        if not self._sounds:
+            self.ready = True
+            self.load_time = perf_counter() - self._t0
+            if self.on_ready:
+                self.on_ready()
+            return
+        if self.audio is None:
+            self.audio = create_audio()
+        step = self._sounds.pop(0)
+        load_audio_step(self.audio, step)
+        self._step(os.path.basename(step[2]))
+        Clock.schedule_once(self._load_next_sound, 0)
@@ -0,0 +1,249 @@
+"""Sound effects and background music.
+
+Sound effects are preloaded into a few voices each, so a second "correct"
+right after the first overlaps it instead of cutting it off. When every
+voice of an effect (or the global voice limit) is busy, the voice that
+started first is stolen. The background music is streamed from disk
+(compressed if the encoded file exists, see tools/encode_audio.py)
+instead of being decoded into memory, and is ducked through named
+levels rather than by poking its volume from every popup.
+"""
+import os
+from time import perf_counter
+
+from kivy.animation import Animation
+from kivy.core.audio import SoundLoader
+
+# tried in this order next to the .wav (tools/encode_audio.py writes the .ogg)
+STREAM_FORMATS = ("ogg", "opus", "mp3", "wav")
+
+
+def stream_source(path, formats=STREAM_FORMATS):
+    """First existing compressed variant of path, else path itself."""
+    base = os.path.splitext(path)[0]
+    for ext in formats:
+        candidate = f"{base}.{ext}"
+        if os.path.exists(candidate):
+            return candidate
+    return path
+
+
+def open_stream(path):
+    # SoundSDL2 decodes the whole file into one chunk; the SDL2 "music"
+    # channel reads it from disk while playing (any format SDL_mixer knows).
+    # The other providers (ffpyplayer, gstreamer, android) stream anyway.
+    loaders = [cls.__name__ for cls in SoundLoader._classes]
+    if loaders and loaders[0] == "SoundSDL2":
+        try:
+            from kivy.core.audio.audio_sdl2 import MusicSDL2
+            return MusicSDL2(source=path)
+        except Exception as e:
+            print("Audio: streaming not available, loading", path, "-", e)
+    return SoundLoader.load(path)
+
+
+class SfxPool:
+    """A few preloaded voices of one sound effect."""
+
+    def __init__(self, path, voices=3, volume=1.0):
+        self.path = path
+        self.volume = volume
+        self.voices = []
+        self.started = []
+        for _ in range(max(1, voices)):
+            try:
+                sound = SoundLoader.load(path)
+            except Exception:
+                sound = None
+            if sound is None:
+                break
+            sound.volume = volume
+            self.voices.append(sound)
+            self.started.append(0.0)
+
+    def busy(self):
+        return sum(1 for s in self.voices if s.state == "play")
+
+    def oldest(self):
+        # index of the playing voice that started first, or None
+        best = None
+        for i, s in enumerate(self.voices):
+            if s.state == "play" and (best is None or self.started[i] < self.started[best]):
+                best = i
+        return best
+
+    def free_voice(self):
+        for i, s in enumerate(self.voices):
+            if s.state != "play":
+                return i
+        return None
+
+    def start(self, i, now):
+        sound = self.voices[i]
+        if sound.state == "play":
+            sound.stop()
+        sound.play()
+        self.started[i] = now
+
+
+class AudioManager:
+    """SFX voice pools, one streamed BGM and named ducking levels.
+
+    play(name) starts an effect on a free voice; when the effect has no
+    free voice or max_voices effects are already playing, the oldest
+    playing voice is restarted instead. duck(key, level) scales the music
+    to the lowest active level until unduck(key).
+    """
+
+    def __init__(self, max_voices=6, duck_fade=0.2):
+        self.max_voices = max_voices
+        self.duck_fade = duck_fade
+        self.pools = {}
+        self.voice_count = 0
+        self.bgm = None
+        self.bgm_volume = 1.0
+        self.ducks = {}
+        self.plays = 0
+        self.steals = 0
+        self.trigger_us = []
+
+    # ----------------------------
+    # loading
+    # ----------------------------
+    def load_sfx(self, name, path, voices=3, volume=1.0):
+        pool = SfxPool(path, voices, volume)
+        if pool.voices:
+            self.pools[name] = pool
+            self.voice_count = sum(len(p.voices) for p in self.pools.values())
+        else:
+            print("Audio: could not load", path)
+        return pool
+
+    def load_bgm(self, path, volume=0.4):
+        source = stream_source(path)
+        try:
+            self.bgm = open_stream(source)
+        except Exception as e:
+            print("Audio: could not load", source, "-", e)
+            self.bgm = None
+        self.bgm_volume = volume
+        if self.bgm is not None:
+            self.bgm.loop = True
+            self.bgm.volume = volume
+        return self.bgm
+
+    # ----------------------------
+    # sound effects
+    # ----------------------------
+    def play(self, name):
+        pool = self.pools.get(name)
+        if pool is None:
+            return
+        t0 = perf_counter()
+        try:
+            i = pool.free_voice()
+            if i is None:
+                # every voice of this effect is busy: restart its oldest one
+                i = pool.oldest() or 0
+                self.steals += 1
+            elif self.voice_count > self.max_voices and self.playing() >= self.max_voices:
+                # too many effects at once: cut the oldest one anywhere
+                self._stop_oldest()
+                self.steals += 1
+            pool.start(i, t0)
+            self.plays += 1
+        except Exception:
+            pass
+        if len(self.trigger_us) < 4096:
+            self.trigger_us.append((perf_counter() - t0) * 1e6)
+
+    def playing(self):
+        return sum(p.busy() for p in self.pools.values())
+
+    def _stop_oldest(self):
+        best = None
+        for pool in self.pools.values():
+            i = pool.oldest()
+            if i is not None and (best is None or pool.started[i] < best[0].started[best[1]]):
+                best = (pool, i)
+        if best is not None:
+            best[0].voices[best[1]].stop()
+
+    def stop_sfx(self):
+        for pool in self.pools.values():
+            for sound in pool.voices:
+                try:
+                    sound.stop()
+                except Exception:
+                    pass
+
+    # ----------------------------
+    # background music
+    # ----------------------------
+    def play_bgm(self, restart=False):
+        if self.bgm is None:
+            return
+        try:
+            if restart and self.bgm.state == "play":
+                self.bgm.stop()
+            if self.bgm.state != "play":
+                self._set_bgm_volume(self.target_volume(), fade=False)
+                self.bgm.play()
+        except Exception:
+            pass
+
+    def stop_bgm(self):
+        if self.bgm is None:
+            return
+        try:
+            Animation.cancel_all(self.bgm, "volume")
+            self.bgm.stop()
+        except Exception:
+            pass
+
+    def target_volume(self):
+        return self.bgm_volume * min(self.ducks.values(), default=1.0)
+
+    def duck(self, key, level):
+        """Lower the music to level (0..1 of its normal volume) until unduck(key)."""
+        self.ducks[key] = level
+        self._set_bgm_volume(self.target_volume())
+
+    def unduck(self, key=None):
+        # no key: drop every duck (restart, back to menu)
+        if key is None:
+            self.ducks.clear()
+        else:
+            self.ducks.pop(key, None)
+        self._set_bgm_volume(self.target_volume())
+
+    def _set_bgm_volume(self, volume, fade=True):
+        if self.bgm is None:
+            return
+        try:
+            Animation.cancel_all(self.bgm, "volume")
+            if fade and self.duck_fade > 0 and self.bgm.state == "play":
+                Animation(volume=volume, duration=self.duck_fade).start(self.bgm)
+            else:
+                self.bgm.volume = volume
+        except Exception:
+            pass
+
+    # ----------------------------
+    # stats (debug overlay, tools/audio_bench.py)
+    # ----------------------------
+    def stats(self):
+        samples = sorted(self.trigger_us)
+        p50 = samples[len(samples) // 2] if samples else 0.0
+        p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))] if samples else 0.0
+        return {
+            "voices": self.voice_count,
+            "playing": self.playing(),
+            "plays": self.plays,
+            "steals": self.steals,
+            "trigger_p50_us": p50,
+            "trigger_p99_us": p99,
+            "bgm": getattr(self.bgm, "source", None),
+            "bgm_streamed": self.bgm is not None and type(self.bgm).__name__ != "SoundSDL2",
+            "ducks": dict(self.ducks),
+        }
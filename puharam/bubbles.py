@@ -0,0 +1,511 @@
+"""Bubble widgets, their pool, the spatial index and the batched renderer."""
+from kivy.animation import Animation
+from kivy.clock import Clock
+from kivy.graphics import Color, Ellipse, InstructionGroup, Rectangle
+from kivy.metrics import sp
+from kivy.properties import BooleanProperty, ListProperty, StringProperty
+from kivy.uix.behaviors import ButtonBehavior
+from kivy.uix.floatlayout import FloatLayout
+from kivy.uix.widget import Widget
+
+from puharam.core import Bubble
+from puharam.labels import label_cache
+
+# ----------------------------
+# Draggable Bubble
+# ----------------------------
+class DraggableBubble(ButtonBehavior, FloatLayout):
+    is_dragging = BooleanProperty(False)
+    original_pos = ListProperty([0, 0])
+    text = StringProperty("")
+
+    # bubble size behavior
+    min_width = 150      # minimum width
+    max_width = 380      # maximum width before wrap
+
+    def __init__(self, text, bg_color, dx=1, dy=2, **kwargs):
+        super().__init__(**kwargs)
+
+        self.size_hint = (None, None)
+        self.height = 80          # default height
+
+        self.dx = dx
+        self.dy = dy
+        self.bg_color = bg_color
+        self.prev_x, self.prev_y = self.pos  # previous simulation state (see interpolate)
+
+        # background ellipse
+        with self.canvas.before:
+            self.bg_color_instr = Color(*self.bg_color)
+            self.bg_rect = Ellipse(pos=self.pos, size=self.size)
+
+        # text, drawn from the shared label texture cache
+        with self.canvas:
+            Color(1, 1, 1, 1)
+            self.text_rect = Rectangle(pos=self.pos, size=(0, 0))
+
+        # listeners
+        self.bind(pos=self.move_graphics)
+        self.bind(size=self.update_graphics)
+        self.bind(text=self.adjust_size_from_text)
+        self.text = text
+
+    # reuse this widget for a new bubble (see BubblePool)
+    def reset(self, text, bg_color, dx, dy, pos):
+        self.is_dragging = False
+        self.dx = dx
+        self.dy = dy
+        self.bg_color = bg_color
+        self.bg_color_instr.rgba = bg_color
+        self.opacity = 1
+        self.category = None
+        self.notes = ""
+        self.food_index = None
+        self.text = text
+        self.pos = pos
+        self.original_pos = pos
+        self.sync_prev()
+
+    # adjust size according to text (wrapped inside max_width)
+    def adjust_size_from_text(self, *args):
+        tex = label_cache.get(self.text, sp(26), wrap_width=self.max_width - 40,
+                              bold=True, padding=(20, 10))
+        self.text_rect.texture = tex
+        self.text_rect.size = tex.size
+        lw, lh = tex.size
+        new_width = lw + 40   # extra for padding
+        new_height = lh + 20
+
+        # apply limits
+        new_width = max(self.min_width, min(new_width, self.max_width))
+
+        self.size = (new_width, new_height)
+        self.update_graphics()
+
+    # fewer ellipse segments on low quality tiers (0 = Kivy's default)
+    def set_segments(self, segments):
+        if self.bg_rect.segments != segments:
+            self.bg_rect.segments = segments
+
+    # update graphics pos and size
+    def update_graphics(self, *args):
+        self.bg_rect.size = self.size
+        self.move_graphics()
+
+    # pos only: setting the ellipse size again would rebuild its vertices
+    def move_graphics(self, *args):
+        x, y = self.pos
+        self.bg_rect.pos = (x, y)
+        tw, th = self.text_rect.size
+        self.text_rect.pos = (x + (self.width - tw) / 2, y + (self.height - th) / 2)
+
+    # draw between the last two simulation states (alpha 0 = previous, 1 = current)
+    def interpolate(self, alpha):
+        if self.is_dragging:
+            x, y = self.pos
+        else:
+            x = self.prev_x + (self.x - self.prev_x) * alpha
+            y = self.prev_y + (self.y - self.prev_y) * alpha
+        self.bg_rect.pos = (x, y)
+        tw, th = self.text_rect.size
+        self.text_rect.pos = (x + (self.width - tw) / 2, y + (self.height - th) / 2)
+
+    # movement rules live in the Kivy-free core (one fixed step, see step_bubble)
+    sync_prev = Bubble.sync_prev
+    auto_move = Bubble.auto_move
+
+    def place(self, x, y):
+        self.pos = (x, y)
+
+    # drag handlers
+    def on_touch_down(self, touch):
+        if self.collide_point(*touch.pos):
+            self.is_dragging = True
+            self.original_pos = self.pos[:]
+            # bring to front
+            if self.parent:
+                try:
+                    children = self.parent.children[:]
+                    if children and children[0] != self:
+                        children.remove(self)
+                        children.insert(0, self)
+                        self.parent.children[:] = children
+                except Exception:
+                    pass
+            return True
+        return super().on_touch_down(touch)
+
+    def on_touch_move(self, touch):
+        if self.is_dragging:
+            self.x = touch.x - self.width / 2
+            self.y = touch.y - self.height / 2
+            return True
+        return super().on_touch_move(touch)
+
+    def on_touch_up(self, touch):
+        if self.is_dragging:
+            self.is_dragging = False
+            self.sync_prev()
+            return True
+        return super().on_touch_up(touch)
+
+
+
+# ----------------------------
+# Bubble pool
+# ----------------------------
+class BubblePool:
+    """Bounded free list of DraggableBubble widgets.
+
+    Released bubbles keep their canvas instructions, Label and bindings and
+    are reset for the next spawn instead of being rebuilt.
+    """
+
+    def __init__(self, max_size=32):
+        self.max_size = max_size
+        self.free = []
+        self.live = set()
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0
+        self.high_water = 0
+
+    def acquire(self, text, bg_color, dx=1, dy=2, pos=(0, 0)):
+        if self.free:
+            b = self.free.pop()
+            b.reset(text, bg_color, dx, dy, pos)
+            self.hits += 1
+        else:
+            b = DraggableBubble(text=text, bg_color=bg_color, dx=dx, dy=dy, pos=pos)
+            b.original_pos = pos
+            self.misses += 1
+        self.live.add(b)
+        self.high_water = max(self.high_water, len(self.live))
+        return b
+
+    def release(self, b):
+        # ignore bubbles that are already released or not from this pool
+        if b not in self.live:
+            return
+        self.live.discard(b)
+        Animation.cancel_all(b)
+        b.is_dragging = False
+        if len(self.free) < self.max_size:
+            self.free.append(b)
+        else:
+            self.discarded += 1
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "discarded": self.discarded,
+            "high_water": self.high_water,
+            "live": len(self.live),
+            "free": len(self.free),
+            "max_size": self.max_size,
+        }
+
+
+# ----------------------------
+# Spatial index for bubble hit-testing
+# ----------------------------
+class SpatialGrid:
+    """Uniform grid over bubble bounds.
+
+    Each bubble is linked into every cell its bounding box touches, so a
+    point query only looks at the few bubbles in one cell instead of
+    walking every bubble on screen.
+    """
+
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.item_cells = {}
+
+    def _cell_range(self, x, y, w, h):
+        cs = self.cell_size
+        return (int(x // cs), int(y // cs), int((x + w) // cs), int((y + h) // cs))
+
+    def _link(self, item, r):
+        x0, y0, x1, y1 = r
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                self.cells.setdefault((cx, cy), set()).add(item)
+
+    def _unlink(self, item, r):
+        x0, y0, x1, y1 = r
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = self.cells.get((cx, cy))
+                if cell is not None:
+                    cell.discard(item)
+                    if not cell:
+                        del self.cells[(cx, cy)]
+
+    def update(self, item, x, y, w, h):
+        r = self._cell_range(x, y, w, h)
+        old = self.item_cells.get(item)
+        if old == r:
+            return
+        if old is not None:
+            self._unlink(item, old)
+        self._link(item, r)
+        self.item_cells[item] = r
+
+    def remove(self, item):
+        old = self.item_cells.pop(item, None)
+        if old is not None:
+            self._unlink(item, old)
+
+    def query_point(self, x, y):
+        cs = self.cell_size
+        return self.cells.get((int(x // cs), int(y // cs)), ())
+
+    def clear(self):
+        self.cells.clear()
+        self.item_cells.clear()
+
+
+# ----------------------------
+# Batched bubble renderer
+# ----------------------------
+class BubbleRecord:
+    """One bubble of a BubbleField.
+
+    Plain attributes instead of Kivy properties, so moving a bubble costs
+    nothing until the field redraws. Has the same surface GameScreen uses on
+    a DraggableBubble (pos, collide_*, touch handlers, auto_move, opacity).
+    """
+    __slots__ = ("uid", "field", "live", "x", "y", "dx", "dy", "width", "height",
+                 "prev_x", "prev_y", "text", "bg_color", "category", "notes", "food_index",
+                 "spawned_at", "is_dragging",
+                 "original_pos", "z", "_opacity", "group", "color_instr", "ellipse",
+                 "text_color", "text_rect")
+
+    _next_uid = 0
+
+    def __init__(self, field):
+        # Animation keys its targets by uid
+        BubbleRecord._next_uid += 1
+        self.uid = -BubbleRecord._next_uid
+        self.field = field
+        self.live = False
+        self.z = 0
+        self._opacity = 1.0
+        self.group = InstructionGroup()
+        self.color_instr = Color(1, 1, 1, 1)
+        self.ellipse = Ellipse()
+        self.text_color = Color(1, 1, 1, 1)
+        self.text_rect = Rectangle(size=(0, 0))
+        for instr in (self.color_instr, self.ellipse, self.text_color, self.text_rect):
+            self.group.add(instr)
+
+    def reset(self, text, bg_color, dx, dy, pos):
+        self.is_dragging = False
+        self.dx = dx
+        self.dy = dy
+        self.bg_color = bg_color
+        self.color_instr.rgba = bg_color
+        self.category = None
+        self.notes = ""
+        self.food_index = None
+        self.x, self.y = pos
+        self.prev_x, self.prev_y = pos
+        self.original_pos = tuple(pos)
+        self.opacity = 1
+        self.set_text(text)
+
+    # same sizing rules as DraggableBubble.adjust_size_from_text
+    def set_text(self, text):
+        self.text = text
+        tex = label_cache.get(text, sp(26), wrap_width=DraggableBubble.max_width - 40,
+                              bold=True, padding=(20, 10))
+        self.text_rect.texture = tex
+        self.text_rect.size = tex.size
+        lw, lh = tex.size
+        self.width = max(DraggableBubble.min_width, min(lw + 40, DraggableBubble.max_width))
+        self.height = lh + 20
+        # the only place the size changes; redraw() only moves the ellipse
+        size = (self.width, self.height)
+        if tuple(self.ellipse.size) != size:
+            self.ellipse.size = size
+        if self.live:
+            self.field.trigger_redraw()
+
+    @property
+    def parent(self):
+        return self.field if self.live else None
+
+    @property
+    def pos(self):
+        return (self.x, self.y)
+
+    # moved outside the frame loop (spawn, wrong answer): draw it by the next frame
+    @pos.setter
+    def pos(self, value):
+        self.x, self.y = value
+        self.field.trigger_redraw()
+
+    # moved by a physics step: step_world redraws the whole field afterwards
+    def place(self, x, y):
+        self.x = x
+        self.y = y
+
+    @property
+    def right(self):
+        return self.x + self.width
+
+    @property
+    def top(self):
+        return self.y + self.height
+
+    @property
+    def center_x(self):
+        return self.x + self.width / 2
+
+    @property
+    def center_y(self):
+        return self.y + self.height / 2
+
+    @property
+    def center(self):
+        return (self.center_x, self.center_y)
+
+    @property
+    def opacity(self):
+        return self._opacity
+
+    @opacity.setter
+    def opacity(self, value):
+        self._opacity = value
+        self.color_instr.a = self.bg_color[3] * value
+        self.text_color.a = value
+
+    def collide_point(self, x, y):
+        return self.x <= x <= self.x + self.width and self.y <= y <= self.y + self.height
+
+    def collide_widget(self, wid):
+        return not (self.right < wid.x or self.x > wid.right
+                    or self.top < wid.y or self.y > wid.top)
+
+    # identical movement rules (and trajectories) to the widget renderer
+    auto_move = Bubble.auto_move
+    sync_prev = Bubble.sync_prev
+
+    def set_segments(self, segments):
+        if self.ellipse.segments != segments:
+            self.ellipse.segments = segments
+
+    def update_graphics(self, alpha=1.0):
+        if self.is_dragging:
+            x, y = self.x, self.y
+        else:
+            x = self.prev_x + (self.x - self.prev_x) * alpha
+            y = self.prev_y + (self.y - self.prev_y) * alpha
+        self.ellipse.pos = (x, y)
+        tw, th = self.text_rect.size
+        self.text_rect.pos = (x + (self.width - tw) / 2, y + (self.height - th) / 2)
+
+    # drag handlers (touch is already in field coordinates)
+    def on_touch_down(self, touch):
+        if not self.collide_point(*touch.pos):
+            return False
+        self.is_dragging = True
+        self.original_pos = (self.x, self.y)
+        self.field.raise_record(self)
+        return True
+
+    def on_touch_move(self, touch):
+        if not self.is_dragging:
+            return False
+        self.x = touch.x - self.width / 2
+        self.y = touch.y - self.height / 2
+        self.field.trigger_redraw()
+        return True
+
+    def on_touch_up(self, touch):
+        if not self.is_dragging:
+            return False
+        self.is_dragging = False
+        self.sync_prev()
+        return True
+
+
+class BubbleField(Widget):
+    """Draws every bubble from one InstructionGroup.
+
+    Bubbles are BubbleRecords rather than widgets: no property events, no
+    child Label, no per-bubble layout. Positions are written into the
+    canvas in a single pass per frame (redraw, interpolated between the
+    last two simulation steps), hit-testing goes through
+    the field's own SpatialGrid and dragging is handled by the records.
+    Removed records keep their instructions and are reused.
+    """
+
+    def __init__(self, max_free=64, cell_size=128, **kwargs):
+        super().__init__(**kwargs)
+        self.records = []
+        self.free = []
+        self.max_free = max_free
+        self.grid = SpatialGrid(cell_size=cell_size)
+        self.z = 0
+        self.alpha = 1.0
+        self.batch = InstructionGroup()
+        self.canvas.add(self.batch)
+        self.trigger_redraw = Clock.create_trigger(lambda dt: self.redraw(), -1)
+
+    def add(self, text, bg_color, dx=1, dy=2, pos=(0, 0)):
+        r = self.free.pop() if self.free else BubbleRecord(self)
+        r.reset(text, bg_color, dx, dy, pos)
+        r.live = True
+        self.records.append(r)
+        self.batch.add(r.group)
+        self.raise_record(r)
+        self.index(r)
+        r.update_graphics()
+        return r
+
+    def remove(self, r):
+        if not r.live:
+            return
+        r.live = False
+        r.is_dragging = False
+        Animation.cancel_all(r)
+        self.records.remove(r)
+        self.batch.remove(r.group)
+        self.grid.remove(r)
+        if len(self.free) < self.max_free:
+            self.free.append(r)
+
+    def clear_records(self):
+        for r in list(self.records):
+            self.remove(r)
+        self.grid.clear()
+
+    def raise_record(self, r):
+        # newest / last grabbed is on top, both for drawing and hit-testing
+        self.z += 1
+        r.z = self.z
+        if r.live and self.batch.children[-1] is not r.group:
+            self.batch.remove(r.group)
+            self.batch.add(r.group)
+
+    def index(self, r):
+        self.grid.update(r, r.x, r.y, r.width, r.height)
+
+    def bubble_at(self, x, y):
+        hit = None
+        for r in self.grid.query_point(x, y):
+            if r.collide_point(x, y) and (hit is None or r.z > hit.z):
+                hit = r
+        return hit
+
+    def redraw(self, alpha=None):
+        # a drag or spawn may have armed the trigger; this pass covers it
+        self.trigger_redraw.cancel()
+        if alpha is None:
+            alpha = self.alpha
+        self.alpha = alpha
+        for r in self.records:
+            r.update_graphics(alpha)
@@ -0,0 +1,355 @@
+"""Game rules without Kivy: score, lives, levels, drops, spawns and movement.
+
+GameScreen and the bubble widgets are a view over these rules; World
+plays a whole session with no window at all, which is what
+tools/batch_sim.py runs thousands of times to tune the difficulty curve.
+Nothing in here may import Kivy.
+"""
+import random
+
+from puharam.physics import MAX_BUBBLE_SPEED, REFERENCE_HZ, create_physics, step_bubble
+from puharam.selection import create_selector
+
+START_LIVES = 6
+CORRECT_POINTS = 10
+
+BUBBLE_COLORS = [
+    (0.2, 0.6, 1, 1), (1, 0.5, 0.6, 1), (0.7, 0.4, 1, 1),
+    (1, 0.65, 0.25, 1), (0.25, 0.8, 0.7, 1),
+]
+SPAWN_DX = (-2, -1, 1, 2)
+SPAWN_DY = (2, 3, 4)
+
+
+# ----------------------------
+# Difficulty curve
+# ----------------------------
+class Difficulty:
+    """Level from score, spawn interval and bubble speed per level.
+
+    The class defaults are the shipped game; tools/batch_sim.py passes
+    overrides (Difficulty(level_points=40)) to try other curves.
+    """
+    level_points = 50       # score per level
+    base_interval = 3.0     # seconds between spawns, before the level bonus
+    interval_step = 0.2     # seconds taken off per level
+    min_interval = 0.5
+    speed_step = 1          # |dx|, |dy| added per level
+    max_speed = MAX_BUBBLE_SPEED
+
+    def __init__(self, **overrides):
+        for key, value in overrides.items():
+            if key.startswith("_") or not hasattr(Difficulty, key) or callable(getattr(Difficulty, key)):
+                raise ValueError(f"unknown difficulty setting: {key}")
+            setattr(self, key, value)
+
+    def settings(self):
+        return {k: getattr(self, k) for k in ("level_points", "base_interval", "interval_step",
+                                              "min_interval", "speed_step", "max_speed")}
+
+    def level(self, score):
+        return max(1, score // self.level_points + 1)
+
+    def spawn_interval(self, level):
+        return max(self.min_interval, self.base_interval - level * self.interval_step)
+
+    def velocity(self, rng, level):
+        dx = min(rng.choice(SPAWN_DX) + level * self.speed_step, self.max_speed)
+        dy = min(rng.choice(SPAWN_DY) + level * self.speed_step, self.max_speed)
+        return dx, dy
+
+
+# ----------------------------
+# Score, lives, level
+# ----------------------------
+class GameState:
+    """Score, lives and level of one game, and the answers that change them."""
+
+    def __init__(self, difficulty=None, lives=START_LIVES):
+        self.difficulty = difficulty or Difficulty()
+        self.start_lives = lives
+        self.reset()
+
+    def reset(self):
+        self.lives = self.start_lives
+        self.score = 0
+        self.level = 1
+        self.correct = 0
+        self.wrong = 0
+
+    @property
+    def over(self):
+        return self.lives <= 0
+
+    def answer(self, correct):
+        """Apply one drop into a bucket; returns True when it was right."""
+        if correct:
+            self.correct += 1
+            self.score += CORRECT_POINTS
+            self.level = self.difficulty.level(self.score)
+        else:
+            self.wrong += 1
+            self.lives -= 1
+        return correct
+
+
+# ----------------------------
+# Layout rules shared by the screen and World
+# ----------------------------
+def overlaps(ax, ay, aw, ah, bx, by, bw, bh):
+    # same test as Widget.collide_widget (touching edges count)
+    return not (ax + aw < bx or ax > bx + bw or ay + ah < by or ay > by + bh)
+
+
+def drop_target(x, y, w, h, buckets):
+    """Status of the first bucket the rect overlaps, or None.
+
+    buckets is a sequence of (status, (x, y, w, h)), checked in order.
+    """
+    for status, (bx, by, bw, bh) in buckets:
+        if overlaps(x, y, w, h, bx, by, bw, bh):
+            return status
+    return None
+
+
+def spawn_params(rng, level, pw, buckets_top, hearts_y, difficulty=None,
+                 bubble_height=80, margin=12):
+    """(color, x, y, dx, dy) of the next bubble; draws from rng in a fixed order."""
+    # start above the buckets, below the hearts when there is room
+    start_y = max(hearts_y - bubble_height - margin, buckets_top + margin + 10)
+    color = rng.choice(BUBBLE_COLORS)
+    try:
+        start_x = rng.randint(50, int(pw * 0.75))
+    except ValueError:  # window narrower than ~67 px
+        start_x = rng.randint(50, 300)
+    dx, dy = (difficulty or Difficulty()).velocity(rng, level)
+    return color, start_x, start_y, dx, dy
+
+
+def clamp_spawn_x(x, width, pw):
+    # keep wide bubbles fully on screen
+    max_x = pw - 10 - width
+    if x > max_x:
+        return max(10, max_x)
+    return x
+
+
+# ----------------------------
+# Headless bubble
+# ----------------------------
+class Bubble:
+    """A bubble without a widget (what World simulates).
+
+    auto_move and sync_prev are the movement rules; DraggableBubble and
+    BubbleRecord use these same functions.
+    """
+    __slots__ = ("x", "y", "dx", "dy", "width", "height", "prev_x", "prev_y", "text",
+                 "category", "food_index", "spawned_at", "is_dragging", "original_pos",
+                 "parent", "decide_at")
+
+    def __init__(self, text, dx, dy, pos, size, parent=None):
+        self.text = text
+        self.dx = dx
+        self.dy = dy
+        self.x, self.y = pos
+        self.prev_x, self.prev_y = pos
+        self.original_pos = tuple(pos)
+        self.width, self.height = size
+        self.category = None
+        self.food_index = None
+        self.spawned_at = 0.0
+        self.is_dragging = False
+        self.parent = parent
+        self.decide_at = None
+
+    @property
+    def pos(self):
+        return (self.x, self.y)
+
+    @pos.setter
+    def pos(self, value):
+        self.x, self.y = value
+
+    # one fixed simulation step of dt seconds (see step_bubble)
+    def auto_move(self, dt, buckets_top=0, pw=800, ph=600):
+        if self.is_dragging or not self.parent:
+            return
+        x, y, self.dx, self.dy = step_bubble(self.x, self.y, self.dx, self.dy, self.width,
+                                             self.height, dt * REFERENCE_HZ, buckets_top, pw, ph)
+        self.place(x, y)
+
+    # position written by a physics step (renderers draw it on their own schedule)
+    def place(self, x, y):
+        self.x = x
+        self.y = y
+
+    def sync_prev(self):
+        self.prev_x, self.prev_y = self.x, self.y
+
+
+def estimate_bubble_size(text):
+    # fit of the rendered label sizes (26sp bold, wrapped at 340 px);
+    # a window-free stand-in for DraggableBubble.adjust_size_from_text
+    width = 12 * len(text) + 93
+    if width > 380:
+        return 380, 102
+    return max(150, width), 71
+
+
+# ----------------------------
+# Headless session
+# ----------------------------
+class ScriptedPlayer:
+    """A simulated player for World.
+
+    Takes the oldest bubble on screen, one at a time, decides after
+    reaction_s (gaussian, clipped at min_reaction_s) and drops it in the
+    right bucket with probability accuracy. The education card after a correct
+    answer is read for read_s seconds, during which the game is paused.
+    """
+
+    def __init__(self, rng, accuracy=0.85, reaction_s=2.0, reaction_sd=0.6,
+                 min_reaction_s=0.4, read_s=2.5):
+        self.rng = rng
+        self.accuracy = accuracy
+        self.reaction_s = reaction_s
+        self.reaction_sd = reaction_sd
+        self.min_reaction_s = min_reaction_s
+        self.read_s = read_s
+
+    def reaction(self):
+        return max(self.min_reaction_s, self.rng.gauss(self.reaction_s, self.reaction_sd))
+
+    def choose(self, bubble, statuses):
+        if self.rng.random() < self.accuracy:
+            return bubble.category
+        wrong = [s for s in statuses if s != bubble.category]
+        return self.rng.choice(wrong) if wrong else bubble.category
+
+
+class World:
+    """One game session with no widgets: the same rules as GameScreen.
+
+    Fixed timestep physics (any physics backend), the difficulty curve's
+    spawn timer, the max-live cap, drops into the two buckets and the
+    pause while the education card is shown. Geometry follows the
+    screen's layout at `size`; bubble sizes are estimated from the text.
+    """
+
+    def __init__(self, dataset, seed=0, size=(720, 1280), difficulty=None, sim_hz=REFERENCE_HZ,
+                 selection=None, physics=None, max_live=24):
+        self.dataset = dataset
+        self.rng = random.Random(seed)
+        self.game = GameState(difficulty)
+        self.difficulty = self.game.difficulty
+        self.selector = create_selector(dataset, selection, rng=self.rng)
+        self.physics = create_physics(physics)
+        self.sim_step = 1.0 / sim_hz
+        self.max_live = max_live
+        self.resize(*size)
+
+        self.bubbles = []
+        self.time = 0.0          # session clock, including paused time
+        self.sim_time = 0.0      # world clock, stops while paused
+        self.next_spawn = 0.0    # first bubble as soon as the game runs
+        self.waiting_for_room = False
+        self.paused_until = 0.0
+        self.spawns = 0
+        self.max_live_seen = 0
+        self.level_times = {1: 0.0}
+
+    def resize(self, pw, ph):
+        # mirrors GameScreen's layout: bucket row with 20 px padding/spacing
+        self.pw, self.ph = pw, ph
+        bw = (pw - 60) / 2.
+        self.buckets = [("HALAL", (20, 20, bw, 150)), ("HARAM", (40 + bw, 20, bw, 150))]
+        self.buckets_top = 170
+        self.hearts_y = ph * 0.88
+
+    @property
+    def paused(self):
+        return self.time < self.paused_until
+
+    def spawn(self):
+        if not self.dataset or len(self.bubbles) >= self.max_live:
+            return None
+        food_index = self.selector.pick()
+        name, status, notes = self.dataset[food_index]
+        color, x, y, dx, dy = spawn_params(self.rng, self.game.level, self.pw, self.buckets_top,
+                                           self.hearts_y, self.difficulty)
+        size = estimate_bubble_size(name)
+        b = Bubble(name, dx, dy, (clamp_spawn_x(x, size[0], self.pw), y), size, parent=self)
+        b.category = status
+        b.food_index = food_index
+        b.spawned_at = self.time
+        self.bubbles.append(b)
+        self.physics.add(b)
+        self.spawns += 1
+        self.max_live_seen = max(self.max_live_seen, len(self.bubbles))
+        return b
+
+    def drop(self, b, status):
+        """Drop bubble b into the bucket for status; returns True if it was right."""
+        correct = self.game.answer(status == b.category)
+        self.selector.record(b.food_index, correct)
+        if correct:
+            self.bubbles.remove(b)
+            self.physics.remove(b)
+            b.parent = None
+            self.level_times.setdefault(self.game.level, self.time)
+            if self.waiting_for_room:
+                # like SpawnScheduler: a full screen restarts the timer once there is room
+                self.waiting_for_room = False
+                self.next_spawn = self.sim_time + self.difficulty.spawn_interval(self.game.level)
+        return correct
+
+    def step(self, dt):
+        """Advance dt seconds of session time."""
+        self.time += dt
+        if self.paused or self.game.over:
+            return
+        self.sim_time += dt
+        if self.sim_time >= self.next_spawn and not self.waiting_for_room:
+            if self.spawn() is None:
+                self.waiting_for_room = True
+            else:
+                self.next_spawn = self.sim_time + self.difficulty.spawn_interval(self.game.level)
+        self.physics.step(self.bubbles, dt, self.buckets_top, self.pw, self.ph)
+
+    def run(self, player, max_time=600.0):
+        """Play until game over or max_time seconds; returns the session stats."""
+        statuses = [status for status, rect in self.buckets]
+        dt = self.sim_step
+        focus = None
+        while not self.game.over and self.time < max_time:
+            self.step(dt)
+            if self.paused:
+                continue
+            if focus is None:
+                # the oldest bubble on screen gets the player's attention next
+                if self.bubbles:
+                    focus = self.bubbles[0]
+                    focus.decide_at = self.time + player.reaction()
+            elif self.time >= focus.decide_at:
+                if self.drop(focus, player.choose(focus, statuses)):
+                    self.paused_until = self.time + player.read_s
+                    focus = None
+                else:
+                    # a wrong drop puts the bubble back; think again
+                    focus.decide_at = self.time + player.reaction()
+        return self.result()
+
+    def result(self):
+        game = self.game
+        return {
+            "score": game.score,
+            "level": game.level,
+            "lives": game.lives,
+            "correct": game.correct,
+            "wrong": game.wrong,
+            "game_over": game.over,
+            "duration_s": round(self.time, 3),
+            "spawns": self.spawns,
+            "max_live": self.max_live_seen,
+            "level_times": {level: round(t, 3) for level, t in self.level_times.items()},
+        }
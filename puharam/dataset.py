@@ -0,0 +1,285 @@
+"""Food dataset: food.json and its compiled, mmap-backed form."""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+
+from puharam.files import atomic_write
+
+FOOD_JSON = os.path.join("assets", "datasets", "food.json")
+
+
+def load_food_dataset(json_path=FOOD_JSON):
+    foods = []
+    try:
+        with open(json_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+            # convert status Halal / Haram → matching text for bucket
+            for item in data:
+                name = item.get("name", "")
+                status = item.get("status", "").upper()
+                notes = item.get("notes", "")
+                if status in ("HALAL", "HARAM"):
+                    foods.append((name, status, notes))
+    except Exception as e:
+        print("Failed loading foods JSON:", e)
+    return foods
+
+
+# ----------------------------
+# Compiled food dataset
+# ----------------------------
+# food.json compiled into one binary file that is opened with mmap. The
+# header and the small name/index directories are read on open; records
+# are decoded only when asked for. Layout (little-endian):
+#
+#   header         DATASET_HEADER
+#   names          status names, then category names (u16 length + utf-8)
+#   index dir      (offset u64, count u32) per status, then per category
+#   record table   (data offset u32, length u32, status u8, category u8, pad u16)
+#   id arrays      u32 record ids for every index entry
+#   data           "name\x1fstatus\x1fcategory\x1fnotes" utf-8 per record
+DATASET_MAGIC = b"PUHRDS\x00\x01"
+DATASET_VERSION = 1
+DATASET_HEADER = struct.Struct("<8sIIQQ32sHHQQQ")
+DATASET_RECORD = struct.Struct("<IIBBH")
+DATASET_INDEX = struct.Struct("<QI")
+DATASET_SEP = "\x1f"
+# where source_mtime sits in the header (rewritten by is_fresh)
+DATASET_MTIME_OFFSET = struct.calcsize("<8sIIQ")
+
+
+def _dataset_source_info(json_path):
+    st = os.stat(json_path)
+    return st.st_size, st.st_mtime_ns
+
+
+def _file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.digest()
+
+
+def compile_food_dataset(json_path=FOOD_JSON, out_path=None):
+    """Compile food.json into the mmap-friendly binary format."""
+    if out_path is None:
+        out_path = os.path.splitext(json_path)[0] + ".bin"
+    src_size, src_mtime = _dataset_source_info(json_path)
+    digest = _file_sha256(json_path)
+    with open(json_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    records = []
+    for item in data:
+        status = item.get("status", "").upper()
+        if status in ("HALAL", "HARAM"):
+            records.append((item.get("name", ""), status,
+                            item.get("category", ""), item.get("notes", "")))
+
+    statuses = sorted({r[1] for r in records})
+    categories = sorted({r[2] for r in records})
+    status_code = {v: i for i, v in enumerate(statuses)}
+    category_code = {v: i for i, v in enumerate(categories)}
+    by_status = [[] for _ in statuses]
+    by_category = [[] for _ in categories]
+    blobs = []
+    for i, (name, status, category, notes) in enumerate(records):
+        by_status[status_code[status]].append(i)
+        by_category[category_code[category]].append(i)
+        blobs.append(DATASET_SEP.join((name, status, category, notes)).encode("utf-8"))
+
+    names = b"".join(struct.pack("<H", len(b)) + b
+                     for b in (v.encode("utf-8") for v in statuses + categories))
+    names_off = DATASET_HEADER.size
+    index_off = names_off + len(names)
+    groups = by_status + by_category
+    table_off = index_off + DATASET_INDEX.size * len(groups)
+    ids_off = table_off + DATASET_RECORD.size * len(records)
+    data_off = ids_off + 4 * len(records) * 2
+
+    index_dir = []
+    ids = []
+    pos = ids_off
+    for group in groups:
+        index_dir.append(DATASET_INDEX.pack(pos, len(group)))
+        ids.append(struct.pack("<%dI" % len(group), *group))
+        pos += 4 * len(group)
+
+    table = []
+    offset = 0
+    for (name, status, category, notes), blob in zip(records, blobs):
+        table.append(DATASET_RECORD.pack(offset, len(blob), status_code[status],
+                                         category_code[category], 0))
+        offset += len(blob)
+
+    header = DATASET_HEADER.pack(DATASET_MAGIC, DATASET_VERSION, len(records), src_size,
+                                 src_mtime, digest, len(statuses), len(categories),
+                                 index_off, table_off, data_off)
+    # atomically, so a reader never maps a half-written file
+    atomic_write(out_path, b"".join([header, names] + index_dir + table + ids + blobs))
+    return out_path
+
+
+class CompiledFoodDataset:
+    """Read-only view over a compiled dataset file.
+
+    Behaves like the old list of (name, status, notes) tuples (len, index,
+    random.choice) but decodes a record only when it is accessed. Record ids
+    per status/category come straight from the mapped file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (magic, version, self.count, self.source_size, self.source_mtime, self.source_sha256,
+             n_status, n_category, index_off, self._table_off, self._data_off) = \
+                DATASET_HEADER.unpack_from(self._mm, 0)
+            if magic != DATASET_MAGIC or version != DATASET_VERSION:
+                raise ValueError(f"{path} is not a compiled food dataset (v{DATASET_VERSION})")
+            # a truncated file can still have a good header; check it covers what it points to
+            size = len(self._mm)
+            n_groups = n_status + n_category
+            if not (DATASET_HEADER.size <= index_off
+                    and index_off + n_groups * DATASET_INDEX.size <= self._table_off
+                    and self._table_off + self.count * DATASET_RECORD.size <= self._data_off
+                    <= size):
+                raise ValueError(f"{path} is truncated or corrupt (header extents)")
+
+            names = []
+            pos = DATASET_HEADER.size
+            for _ in range(n_groups):
+                (n,) = struct.unpack_from("<H", self._mm, pos)
+                names.append(bytes(self._mm[pos + 2:pos + 2 + n]).decode("utf-8"))
+                pos += 2 + n
+            self.statuses = names[:n_status]
+            self.categories = names[n_status:]
+
+            groups = [DATASET_INDEX.unpack_from(self._mm, index_off + i * DATASET_INDEX.size)
+                      for i in range(n_groups)]
+            data_end = self._data_off
+            if self.count:
+                offset, length, _, _, _ = self._entry(self.count - 1)
+                data_end += offset + length
+            ids_off = self._table_off + self.count * DATASET_RECORD.size
+            if data_end > size or not all(ids_off <= offset and offset + 4 * count <= self._data_off
+                                          for offset, count in groups):
+                raise ValueError(f"{path} is truncated or corrupt (data extents)")
+            self._status_index = dict(zip(self.statuses, groups[:n_status]))
+            self._category_index = dict(zip(self.categories, groups[n_status:]))
+        except Exception:
+            self._mm.close()
+            raise
+
+    @property
+    def version(self):
+        return self.source_sha256.hex()[:12]
+
+    def is_fresh(self, json_path):
+        # cheap mtime/size check first, hash only if those changed
+        try:
+            size, mtime = _dataset_source_info(json_path)
+        except OSError:
+            return True  # no source to compare against; keep the compiled copy
+        if (size, mtime) == (self.source_size, self.source_mtime):
+            return True
+        if size != self.source_size or _file_sha256(json_path) != self.source_sha256:
+            return False
+        # same content, new mtime (copied, checked out again): store it so the
+        # next launch takes the cheap path
+        self._store_source_mtime(mtime)
+        return True
+
+    def _store_source_mtime(self, mtime):
+        try:
+            with open(self.path, "r+b") as f:
+                f.seek(DATASET_MTIME_OFFSET)
+                f.write(struct.pack("<Q", mtime))
+            self.source_mtime = mtime
+        except OSError as e:
+            print("Could not update compiled dataset mtime:", e)
+
+    def __len__(self):
+        return self.count
+
+    def _entry(self, i):
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("food record index out of range")
+        return DATASET_RECORD.unpack_from(self._mm, self._table_off + i * DATASET_RECORD.size)
+
+    def record(self, i):
+        """(name, status, category, notes) of record i."""
+        offset, length, _, _, _ = self._entry(i)
+        start = self._data_off + offset
+        return tuple(bytes(self._mm[start:start + length]).decode("utf-8").split(DATASET_SEP, 3))
+
+    def __getitem__(self, i):
+        name, status, category, notes = self.record(i)
+        return (name, status, notes)
+
+    def status_of(self, i):
+        return self.statuses[self._entry(i)[2]]
+
+    def category_of(self, i):
+        return self.categories[self._entry(i)[3]]
+
+    def _ids(self, group):
+        offset, count = group
+        view = memoryview(self._mm)[offset:offset + 4 * count]
+        if sys.byteorder == "little":
+            return view.cast("I")
+        return list(struct.unpack("<%dI" % count, view))
+
+    def ids_by_status(self, status):
+        group = self._status_index.get(status.upper())
+        return self._ids(group) if group else ()
+
+    def ids_by_category(self, category):
+        group = self._category_index.get(category)
+        return self._ids(group) if group else ()
+
+    def close(self):
+        try:
+            self._mm.close()
+        except BufferError:
+            pass  # an id view is still alive; the map goes away with it
+
+
+def dataset_cache_path(json_path=FOOD_JSON):
+    # compiled copy lives in the app's data dir (writable on Android)
+    from kivy.app import App
+    app = App.get_running_app()
+    folder = app.user_data_dir if app else os.path.dirname(json_path)
+    return os.path.join(folder, os.path.splitext(os.path.basename(json_path))[0] + ".bin")
+
+
+def open_food_dataset(json_path=FOOD_JSON, compiled_path=None):
+    """Open the compiled dataset, (re)compiling it when missing or stale.
+
+    A compiled file that fails the header checks is recompiled. Falls back
+    to the plain list from load_food_dataset if compiling fails.
+    """
+    if compiled_path is None:
+        compiled_path = dataset_cache_path(json_path)
+    try:
+        if os.path.exists(compiled_path):
+            try:
+                ds = CompiledFoodDataset(compiled_path)
+            except (ValueError, struct.error) as e:
+                print("Compiled food dataset unusable, recompiling:", e)
+            else:
+                if ds.is_fresh(json_path):
+                    return ds
+                ds.close()
+        compile_food_dataset(json_path, compiled_path)
+        return CompiledFoodDataset(compiled_path)
+    except Exception as e:
+        print("Failed opening compiled food dataset:", e)
+        return load_food_dataset(json_path)
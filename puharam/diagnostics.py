@@ -0,0 +1,162 @@
+"""Leak and memory diagnostics for GameScreen.
+
+counts(screen) reports what is alive right now: bubble widgets and
+records (and how many of them the pools account for), overlay cards,
+widgets, running animations, scheduled Clock events and texture memory.
+MemoryTracker wraps tracemalloc and diffs snapshots, e.g. one per
+_do_restart. Both are only imported from the debug key (F9), from
+PUHARAM_TRACEMALLOC=1 and from tools/leak_check.py.
+"""
+import gc
+import tracemalloc
+from collections import Counter
+
+from kivy.animation import Animation
+from kivy.clock import Clock
+from kivy.graphics.texture import Texture, TextureRegion
+from kivy.uix.widget import Widget
+
+from puharam.bubbles import BubbleRecord, DraggableBubble
+from puharam.labels import label_cache
+from puharam.overlays import OverlayCard
+
+# size of one pixel per texture colour format (approximate GPU memory)
+PIXEL_BYTES = {"rgba": 4, "bgra": 4, "rgb": 3, "bgr": 3, "luminance_alpha": 2, "luminance": 1,
+               "alpha": 1, "red": 1, "rg": 2}
+
+
+def callback_name(cb):
+    if cb is None:
+        return "<dead weak callback>"
+    func = getattr(cb, "__func__", cb)
+    return getattr(func, "__qualname__", None) or repr(func)
+
+
+def clock_events():
+    """Counter of scheduled Clock callbacks by name."""
+    return Counter(callback_name(ev.get_callback()) for ev in Clock.get_events())
+
+
+def texture_bytes(textures):
+    # regions (atlas icons, sub-textures) share their owner's memory
+    total = 0
+    for tex in textures:
+        if not isinstance(tex, TextureRegion):
+            total += tex.width * tex.height * PIXEL_BYTES.get(tex.colorfmt, 4)
+    return total
+
+
+def counts(screen=None):
+    """Snapshot of live objects; run gc.collect() first for exact numbers."""
+    found = Counter()
+    textures = []
+    for obj in gc.get_objects():
+        # type(), not isinstance(): weak proxies (Widget.proxy_ref) pass isinstance
+        cls = type(obj)
+        if issubclass(cls, Widget):
+            found["widgets"] += 1
+            if issubclass(cls, DraggableBubble):
+                found["bubble_widgets"] += 1
+            elif issubclass(cls, OverlayCard):
+                found["overlay_cards"] += 1
+        elif cls is BubbleRecord:
+            found["bubble_records"] += 1
+        elif issubclass(cls, Texture):
+            textures.append(obj)
+    events = Clock.get_events()
+    # events of pooled bubbles come and go with the pool, not with a leak
+    bubble_events = sum(1 for ev in events
+                        if isinstance(getattr(ev.get_callback(), "__self__", None), DraggableBubble))
+    result = dict(found)
+    result.update({
+        "animations": len(Animation._instances),
+        "clock_events": len(events),
+        "bubble_clock_events": bubble_events,
+        "textures": len(textures),
+        "texture_kb": texture_bytes(textures) // 1024,
+        "label_cache_kb": label_cache.bytes // 1024,
+    })
+    if screen is not None:
+        pool = screen.bubble_pool
+        field = screen.bubble_field
+        result.update({
+            "bubbles_in_play": len(screen.bubble_widgets),
+            "bubble_pool_free": len(pool.free),
+            "bubble_pool_live": len(pool.live),
+            "field_records": len(field.records) + len(field.free) if field is not None else 0,
+            "overlays_shown": sum(1 for o in screen.overlays.values() if o.shown),
+        })
+    return result
+
+
+def unaccounted(screen, snapshot=None):
+    """Bubble objects alive but owned by neither the screen nor a pool.
+
+    After a restart every bubble should be back in a pool (or gone); any
+    left over are leaks.
+    """
+    c = snapshot or counts(screen)
+    return {
+        "bubble_widgets": c.get("bubble_widgets", 0) - c["bubble_pool_free"] - c["bubble_pool_live"],
+        "bubble_records": c.get("bubble_records", 0) - c["field_records"],
+    }
+
+
+def report(screen=None, top=8):
+    gc.collect()
+    c = counts(screen)
+    lines = ["diagnostics:"]
+    lines += [f"  {k:18} {v}" for k, v in sorted(c.items())]
+    if screen is not None:
+        lines += [f"  unaccounted {k:6} {v}" for k, v in unaccounted(screen, c).items()]
+    lines.append("  clock events by callback:")
+    lines += [f"    {n:3d}  {name}" for name, n in clock_events().most_common(top)]
+    return "\n".join(lines)
+
+
+class MemoryTracker:
+    """tracemalloc snapshots and the diff between the last two."""
+
+    def __init__(self, frames=8):
+        self.frames = frames
+        self.snapshots = []
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+
+    def stop(self):
+        tracemalloc.stop()
+        self.snapshots = []
+
+    def snapshot(self, label=""):
+        self.start()
+        gc.collect()
+        snap = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+        self.snapshots.append((label, snap))
+        del self.snapshots[:-2]  # only the last two are ever diffed
+        return snap
+
+    def diff(self, top=10):
+        """(total growth in bytes, top allocation sites) since the previous snapshot."""
+        if len(self.snapshots) < 2:
+            return 0, []
+        (_, old), (_, new) = self.snapshots[-2:]
+        stats = new.compare_to(old, "lineno")
+        growth = sum(s.size_diff for s in stats)
+        return growth, [s for s in stats if s.size_diff > 0][:top]
+
+    def checkpoint(self, label="", top=5):
+        # snapshot + print what grew since the previous one
+        self.snapshot(label)
+        growth, stats = self.diff(top)
+        if len(self.snapshots) < 2:
+            return growth
+        print(f"tracemalloc [{label}]: {growth / 1024.:+.1f} KB since previous snapshot")
+        for s in stats:
+            print(f"  {s.size_diff / 1024.:+8.1f} KB {s.count_diff:+6d}  {s.traceback[0]}")
+        return growth
@@ -0,0 +1,23 @@
+"""Crash-safe file writes shared by the score store, leaderboard queue and dataset."""
+import os
+
+
+def atomic_write(path, data):
+    """Replace `path` with `data` (str or bytes) so a crash leaves the old or the new file.
+
+    The data goes to path + ".tmp", is fsynced, then renamed over `path`;
+    the folder is created when missing. Errors are raised to the caller.
+    """
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    tmp_path = path + ".tmp"
+    if isinstance(data, str):
+        f = open(tmp_path, "w", encoding="utf-8")
+    else:
+        f = open(tmp_path, "wb")
+    with f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
@@ -0,0 +1,868 @@
+"""The game screen."""
+import os
+import random
+import time
+from time import perf_counter
+
+from kivy.animation import Animation
+from kivy.clock import Clock
+from kivy.graphics import Color, Ellipse, Rectangle, RoundedRectangle
+from kivy.metrics import dp, sp
+from kivy.properties import BooleanProperty, NumericProperty, OptionProperty
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.button import Button
+from kivy.uix.floatlayout import FloatLayout
+from kivy.uix.image import Image
+from kivy.uix.label import Label
+from kivy.uix.screenmanager import Screen
+
+from puharam.assets import (GameAssets, HEART_PATH, HEART_SIZE, PAUSE_ICON_PATH, PAUSE_ICON_SIZE,
+                            icon_source)
+from puharam.audio import AudioManager
+from puharam.bubbles import BubbleField, BubblePool, DraggableBubble, SpatialGrid
+from puharam.core import GameState, clamp_spawn_x, drop_target, spawn_params
+from puharam.governor import PerformanceGovernor, tier_index
+from puharam.labels import label_cache
+from puharam.overlays import OverlayCard
+from puharam.perf import perf, timed
+from puharam.physics import MAX_FRAME_TIME, create_physics, sim_rate
+from puharam.selection import create_selector
+from puharam.spawner import SpawnScheduler
+
+# ----------------------------
+# Drop Bucket
+# ----------------------------
+class DropBucket(BoxLayout):
+    def __init__(self, label, color, **kwargs):
+        super().__init__(**kwargs)
+        self.status = label  # the food status this bucket takes (see core.drop_target)
+        self.orientation = "vertical"
+        self.size_hint_y = None
+        self.height = 150
+        self.padding = 10
+        self.spacing = 5
+        with self.canvas.before:
+            Color(*color)
+            self.bg_rect = RoundedRectangle(radius=[30], pos=self.pos, size=self.size)
+        self.text = Label(text=label, font_size="22sp", color=(1,1,1,1), bold=True)
+        self.add_widget(self.text)
+        self.bind(pos=self.update_graphics)
+        self.bind(size=self.update_graphics)
+
+    def update_graphics(self, *args):
+        self.bg_rect.pos = self.pos
+        self.bg_rect.size = self.size
+
+
+# ----------------------------
+# Game Screen
+# ----------------------------
+class GameScreen(Screen):
+    # lives / score / level mirror self.game (the Kivy-free GameState, see sync_game_state)
+    lives = NumericProperty(6)
+    score = NumericProperty(0)
+    level = NumericProperty(1)
+    is_paused = BooleanProperty(False)   # mirrors state != "running"
+    # game loop state; movement and spawn timers only exist while "running"
+    state = OptionProperty("menu", options=("running", "paused", "popup", "menu", "game_over"))
+
+    def __init__(self, assets=None, score_store=None, renderer=None, seed=None, telemetry=None,
+                 difficulty=None, leaderboard=None, governor=False, **kwargs):
+        super().__init__(**kwargs)
+        if assets is None:
+            assets = GameAssets.load_sync()
+        # score, lives, level and the difficulty curve (puharam.core)
+        self.game = GameState(difficulty)
+        # optional persistence (see ScoreStore, Telemetry, LeaderboardClient); tools run without them
+        self.score_store = score_store
+        self.telemetry = telemetry
+        self.leaderboard = leaderboard
+        self.begin_session()
+
+        # all gameplay randomness comes from one seeded RNG so sessions can be replayed
+        if seed is None:
+            seed = int(os.environ.get("PUHARAM_SEED") or random.randrange(2 ** 32))
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.recorder = None
+
+        # main float layout for screen
+        self.root_layer = FloatLayout()
+        self.add_widget(self.root_layer)
+
+        # background
+        with self.root_layer.canvas:
+            Color(0.92, 0.96, 1, 1)
+            self.bg_rect = Rectangle(pos=self.root_layer.pos, size=self.root_layer.size)
+        self.root_layer.bind(size=self.update_bg, pos=self.update_bg)
+
+        # hearts box
+        # icons in dp, so the density bucket's atlas is drawn at its own pixel size
+        self.hearts_box = BoxLayout(orientation="horizontal", spacing=dp(8), size_hint=(None,None),
+                                    pos_hint={"x":0.02,"y":0.88})
+        self.hearts_box.height = dp(HEART_SIZE)
+        self.root_layer.add_widget(self.hearts_box)
+
+        self.heart_images = []
+        heart_source = icon_source("heart", HEART_PATH)
+        if heart_source != HEART_PATH or os.path.exists(HEART_PATH):
+            for i in range(6):
+                img = Image(source=heart_source, size_hint=(None,None),
+                            size=(dp(HEART_SIZE), dp(HEART_SIZE)))
+                self.heart_images.append(img)
+                self.hearts_box.add_widget(img)
+        else:
+            fallback = Label(text="♥♥♥", font_size="28sp", color=(1,0,0,1))
+            self.hearts_box.add_widget(fallback)
+            self.heart_images = None
+
+        # score label
+        self.score_label = Label(text=f"Score: {self.score}", font_size="24sp", bold=True,
+                                 size_hint=(None,None), size=(200,50),
+                                 pos_hint={"right":0.98,"top":0.95}, color=(0.2,0.6,0.9,1))
+        self.root_layer.add_widget(self.score_label)
+
+        # pause button (text icon) with circular bg drawn
+        self.pause_btn = Button(
+            size_hint=(None,None),
+            size=(dp(PAUSE_ICON_SIZE), dp(PAUSE_ICON_SIZE)),
+            pos_hint={"right": 0.98, "top": 0.80},
+            background_normal=icon_source("pause", PAUSE_ICON_PATH),
+            background_down=icon_source("pause", PAUSE_ICON_PATH),
+            font_size="28sp"
+        )
+        # position it on screen using pos_hint by adding to root_layer and setting pos manually on resize
+        self.root_layer.add_widget(self.pause_btn)
+        # draw circle behind the button
+        with self.pause_btn.canvas.before:
+            Color(0,0,0,0)
+            self.pause_circle = Ellipse(pos=self.pause_btn.pos, size=self.pause_btn.size)
+        # Stop touch agar pause tidak mengurangi nyawa
+        # ensure the circle follows the button
+        def _update_circle(instance, *l):
+            try:
+                self.pause_circle.pos = instance.pos
+                self.pause_circle.size = instance.size
+            except Exception:
+                pass
+        self.pause_btn.bind(pos=_update_circle, size=_update_circle)
+
+        # place pause button top-right on layout resize
+        def _place_pause(*a):
+            rw, rh = self.root_layer.width, self.root_layer.height
+            # align at 4% margin
+            margin_x = max(12, rw * 0.02)
+            margin_y = max(12, rh * 0.02)
+            self.pause_btn.pos = (rw - self.pause_btn.width - margin_x, rh - self.pause_btn.height - margin_y)
+        self.root_layer.bind(size=_place_pause, pos=_place_pause)
+        # bind action
+        self.pause_btn.bind(on_release=lambda x: self.pause_game())
+
+        # buckets bottom
+        bucket_area = BoxLayout(orientation="horizontal", size_hint=(1,0.25),
+                                pos_hint={"x":0,"y":0}, padding=20, spacing=20)
+        self.root_layer.add_widget(bucket_area)
+        self.bucket_halal = DropBucket("HALAL",(0.2,0.8,0.4,1))
+        self.bucket_haram = DropBucket("HARAM",(0.85,0.25,0.3,1))
+        bucket_area.add_widget(self.bucket_halal)
+        bucket_area.add_widget(self.bucket_haram)
+
+        # bubble storage
+        self.bubble_widgets = []
+        self.bubble_pool = BubblePool(max_size=32)
+        self.bubble_grid = SpatialGrid(cell_size=128)
+        self.bubble_z = 0  # stacking counter, newest / last grabbed is on top
+
+        # renderer: one widget per bubble, or one BubbleField drawing all of them
+        self.renderer = (renderer or os.environ.get("PUHARAM_RENDERER", "widgets")).lower()
+        self.bubble_field = None
+        if self.renderer == "field":
+            self.bubble_field = BubbleField()
+            self.root_layer.add_widget(self.bubble_field)
+            self.bubble_grid = self.bubble_field.grid
+
+        # one world tick steps every live bubble (removed bubbles drop out of the list);
+        # it is only scheduled while the game is running (see on_state)
+        self.physics = create_physics()
+        self.world_event = None
+        # fixed simulation timestep, independent of the frame rate (see step_world)
+        self.set_sim_rate(sim_rate())
+
+        # sfx voice pools and the streamed bgm (loaded by GameAssets; bgm starts in on_enter)
+        self.audio = assets.audio or AudioManager()
+
+        # foods dataset and the strategy that picks from it
+        self.food_dataset = assets.food_dataset
+        self.selector = create_selector(self.food_dataset, rng=self.rng)
+
+        # debug overlay (see PerfMonitor), built on demand
+        self.perf_label = None
+        self.perf_overlay_event = None
+        if perf.enabled:
+            self.set_perf_overlay(True)
+
+        # spawning; the first bubble comes as soon as the game starts running
+        self.spawner = SpawnScheduler(self, max_live=int(os.environ.get("PUHARAM_MAX_BUBBLES", 24)))
+        self.spawner.schedule_first(0)
+
+        # quality tiers (see PerformanceGovernor): the app turns the governor on,
+        # PUHARAM_QUALITY=<tier> fixes one; tools and replays keep full quality
+        self.base_sim_hz = self.sim_hz
+        self.base_max_live = self.spawner.max_live
+        self.animations = True
+        self.interpolate = True
+        self.bubble_segments = 0
+        self.governor = None
+        self.quality_forced = False
+        quality = os.environ.get("PUHARAM_QUALITY")
+        if governor or quality:
+            self.governor = PerformanceGovernor(self.apply_quality)
+            if quality:
+                try:
+                    self.governor.set_tier(tier_index(quality.lower()), lock=True)
+                    self.quality_forced = True
+                except ValueError as e:
+                    print(e)
+        self.is_paused = self.state != "running"
+        self.update_lives_display()
+
+        # overlays are built on first use (get_overlay); pause_layer is the
+        # pause / game over one currently shown
+        self.overlays = {}
+        self.pause_layer = None
+        self.education_bubble = None
+        self.education_shown_at = 0.0
+
+        # PUHARAM_TRACEMALLOC=1 prints what grew between restarts
+        self.memory_tracker = None
+        if os.environ.get("PUHARAM_TRACEMALLOC") == "1":
+            from puharam.diagnostics import MemoryTracker
+            self.memory_tracker = MemoryTracker()
+            self.memory_tracker.start()
+
+    # ----------------------------
+    # session stats (saved through score_store)
+    # ----------------------------
+    def begin_session(self):
+        self.session = {"correct": 0, "wrong": 0, "started": time.time()}
+        self.session_id = int(self.session["started"] * 1000)
+
+    def end_session(self):
+        if self.session is None:
+            return
+        seconds = time.time() - self.session["started"]
+        if self.score_store is not None:
+            self.score_store.end_session(self.score, self.level, self.session["correct"],
+                                         self.session["wrong"], seconds)
+        if self.leaderboard is not None and self.score > 0:
+            # only queued here; sent in a batch on the leaderboard thread
+            self.leaderboard.submit(self.score, self.level, seconds, self.session["correct"],
+                                    self.session["wrong"])
+        self.session = None
+
+    def flush_scores(self):
+        if self.score_store is not None:
+            self.score_store.flush()
+        if self.telemetry is not None:
+            self.telemetry.flush()
+        if self.leaderboard is not None:
+            self.leaderboard.flush()
+
+    def log_event(self, kind, b, ms=None):
+        # gameplay telemetry; a deque append, cheap enough for every event
+        if self.telemetry is not None:
+            if ms is None:
+                ms = (perf_counter() - b.spawned_at) * 1000
+            self.telemetry.log(kind, b.text, b.category, ms, self.session_id)
+
+    # ----------------------------
+    # session recording (see SessionRecorder)
+    # ----------------------------
+    def start_recording(self, path):
+        from puharam.recording import SessionRecorder
+        self.stop_recording()
+        # replays need one sim rate and bubble cap for the whole session
+        if self.governor is not None and not self.quality_forced:
+            self.governor.set_tier(0, lock=True)
+        self.recorder = SessionRecorder(path, self)
+        self.record("size", self.root_layer.width, self.root_layer.height)
+        self.root_layer.bind(size=self._record_size)
+        return self.recorder
+
+    def stop_recording(self):
+        if self.recorder is None:
+            return
+        self.root_layer.unbind(size=self._record_size)
+        self.recorder.close(self)
+        print("session recorded to", self.recorder.path)
+        self.recorder = None
+        if self.governor is not None and not self.quality_forced:
+            self.governor.locked = False
+
+    def record(self, kind, *args):
+        if self.recorder is not None:
+            self.recorder.event(kind, *args)
+
+    def _record_size(self, instance, size):
+        self.record("size", size[0], size[1])
+
+    def on_enter(self, *args):
+        self.record("enter")
+        # a finished game is not resumed from the menu
+        if self.game.over:
+            self._do_restart()
+        elif self.state == "menu":
+            self.state = "running"
+        # start the music only once the game is actually shown
+        self.audio.play_bgm()
+
+    def on_leave(self, *args):
+        self.record("leave")
+        self.state = "menu"
+
+    def update_bg(self, *args):
+        try:
+            self.bg_rect.pos = self.root_layer.pos
+            self.bg_rect.size = self.root_layer.size
+        except Exception:
+            pass
+
+    # ----------------------------
+    # world update: step all live bubbles
+    # ----------------------------
+    @timed("update")
+    def update_world(self, dt):
+        if self.is_paused:
+            return
+        self.spawner.observe_frame(dt)
+        if self.governor is not None:
+            self.governor.observe(dt)
+        self.step_world(dt)
+        if self.recorder is not None:
+            self.recorder.tick(self, dt)
+
+    def set_sim_rate(self, hz):
+        self.sim_hz = hz
+        self.sim_step = 1.0 / hz
+        self.sim_accumulator = 0.0
+
+    def step_world(self, dt):
+        # run whole simulation steps for the time that passed; the remainder
+        # carries over to the next frame and interpolates the drawing
+        self.sim_accumulator += min(dt, MAX_FRAME_TIME)
+        step = self.sim_step
+        steps = int(self.sim_accumulator / step + 1e-6)  # 1e-6: float sums of dt
+        self.sim_accumulator -= steps * step
+        bubbles = self.bubble_widgets
+
+        if bubbles and steps:
+            # look up bounds once per frame instead of once per bubble
+            try:
+                buckets_top = max(self.bucket_halal.top, self.bucket_haram.top)
+            except Exception:
+                buckets_top = 0
+            pw = self.root_layer.width
+            ph = self.root_layer.height
+
+            for i in range(steps):
+                if i == steps - 1:
+                    for b in bubbles:
+                        b.sync_prev()
+                self.physics.step(bubbles, step, buckets_top, pw, ph)
+            for b in bubbles:
+                self.index_bubble(b)
+
+        if not self.interpolate:
+            # lowest tier: bubbles stay where the last step left them
+            # (widgets follow their pos binding, the field redraws on steps)
+            if steps and self.bubble_field is not None:
+                self.bubble_field.redraw(1.0)
+            return
+        alpha = self.sim_accumulator / step
+        if self.bubble_field is not None:
+            self.bubble_field.redraw(alpha)
+        else:
+            for b in bubbles:
+                b.interpolate(alpha)
+
+    def apply_quality(self, tier):
+        """Apply a QualityTier (called by the governor on every tier change)."""
+        self.set_sim_rate(min(self.base_sim_hz, tier.sim_hz))
+        # restart the blend from the current positions (set_sim_rate dropped the remainder)
+        for b in self.bubble_widgets:
+            b.sync_prev()
+        self.spawner.max_live = min(self.base_max_live, tier.max_live)
+        self.animations = tier.animations
+        self.interpolate = tier.interpolate
+        if tier.segments != self.bubble_segments:
+            self.bubble_segments = tier.segments
+            idle = self.bubble_field.free if self.bubble_field is not None else self.bubble_pool.free
+            for b in self.bubble_widgets + idle:
+                b.set_segments(tier.segments)
+
+    def index_bubble(self, b):
+        self.bubble_grid.update(b, b.x, b.y, b.width, b.height)
+
+    def raise_bubble(self, b):
+        if self.bubble_field is not None:
+            self.bubble_field.raise_record(b)
+            return
+        self.bubble_z += 1
+        b.z = self.bubble_z
+
+    def bubble_at(self, x, y):
+        # topmost live bubble under (x, y), via the spatial grid
+        hit = None
+        for b in self.bubble_grid.query_point(x, y):
+            if b.collide_point(x, y) and (hit is None or b.z > hit.z):
+                hit = b
+        return hit
+
+    # ----------------------------
+    # debug overlay
+    # ----------------------------
+    def set_perf_overlay(self, enabled):
+        if enabled:
+            perf.enable()
+            if self.perf_label is None:
+                self.perf_label = Label(text="", font_size="13sp", color=(0.1, 0.1, 0.1, 1),
+                                        halign="left", valign="top", size_hint=(None, None),
+                                        size=(520, 150), pos_hint={"x": 0.02, "top": 0.86})
+                self.perf_label.bind(size=lambda inst, size: setattr(inst, "text_size", size))
+            if self.perf_label.parent is None:
+                self.root_layer.add_widget(self.perf_label)
+            if self.perf_overlay_event is None:
+                self.perf_overlay_event = Clock.schedule_interval(self.update_perf_overlay, 0.5)
+            self.update_perf_overlay()
+        else:
+            perf.disable()
+            if self.perf_overlay_event is not None:
+                self.perf_overlay_event.cancel()
+                self.perf_overlay_event = None
+            if self.perf_label is not None and self.perf_label.parent is not None:
+                self.perf_label.parent.remove_widget(self.perf_label)
+
+    def toggle_perf_overlay(self):
+        self.set_perf_overlay(not perf.enabled)
+
+    def update_perf_overlay(self, *args):
+        s = perf.summary()
+        f = s["frame_ms"]
+        lines = [
+            f"FPS {s['fps']:.1f}  frame p50 {f['p50']:.1f} p95 {f['p95']:.1f} p99 {f['p99']:.1f} ms",
+            f"bubbles {len(self.bubble_widgets)}  physics {self.physics.name} @ {self.sim_hz:g} Hz"
+            f"  renderer {self.renderer}",
+        ]
+        a = self.audio.stats()
+        lines.append(f"audio {a['playing']}/{a['voices']} voices, {a['steals']} stolen, "
+                     f"trigger p99 {a['trigger_p99_us']:.0f} us")
+        if self.governor is not None:
+            g = self.governor.status()
+            lines.append(f"quality {g['tier']}{' (fixed)' if g['locked'] else ''}  "
+                         f"p90 {g['p90_ms']:.1f} ms  {g['changes']} changes  "
+                         f"max {self.spawner.max_live} bubbles")
+        else:
+            lines.append("quality high (no governor)")
+        for name, v in sorted(s["sections_ms"].items()):
+            lines.append(f"{name}: {v['mean']:.2f} ms avg, {v['p95']:.2f} ms p95 ({v['count']})")
+        if perf.profiler is not None:
+            lines.append("cProfile capture running (F11 to stop)")
+        self.perf_label.text = "\n".join(lines)
+
+    # ----------------------------
+    # game loop state machine
+    # ----------------------------
+    # running: world tick + spawn timer scheduled
+    # paused / popup / menu / game_over: nothing scheduled at all
+    def on_state(self, instance, state):
+        self.is_paused = state != "running"
+        if state == "running":
+            if self.world_event is None:
+                self.world_event = Clock.schedule_interval(self.update_world, 0)
+            self.spawner.start()
+        else:
+            if self.world_event is not None:
+                self.world_event.cancel()
+                self.world_event = None
+            self.spawner.stop()
+
+    # ----------------------------
+    # spawn one bubble (timing comes from self.spawner)
+    # ----------------------------
+    @timed("spawn")
+    def spawn_bubble_step(self):
+        if self.is_paused:
+            return
+
+        if not self.food_dataset:  # jika json gagal
+            return
+        self.record("spawn")
+
+        # pick the next food (see create_selector)
+        food_index = self.selector.pick()
+        name, status, notes = self.food_dataset[food_index]
+
+        # compute bucket top y (safely)
+        try:
+            buckets_top = max(self.bucket_halal.top, self.bucket_haram.top)
+        except Exception:
+            buckets_top = 0
+        hearts_y = max(0, getattr(self.hearts_box, "y", 0))
+
+        # colour, start position and speed come from the core spawn rules
+        color, start_x, start_y, dx, dy = spawn_params(
+            self.rng, self.game.level, self.root_layer.width, buckets_top, hearts_y,
+            self.game.difficulty)
+        if self.bubble_field is not None:
+            b = self.bubble_field.add(name, color, dx=dx, dy=dy, pos=(start_x, start_y))
+        else:
+            b = self.bubble_pool.acquire(name, color, dx=dx, dy=dy, pos=(start_x, start_y))
+            self.root_layer.add_widget(b)
+        # keep wide bubbles fully on screen
+        x = clamp_spawn_x(b.x, b.width, self.root_layer.width)
+        if x != b.x:
+            b.pos = (x, b.y)
+            b.sync_prev()
+        b.set_segments(self.bubble_segments)
+        b.category = status
+        b.notes = notes
+        b.food_index = food_index
+        b.spawned_at = perf_counter()
+        self.log_event("spawn", b, 0.0)
+        self.bubble_widgets.append(b)
+        self.physics.add(b)
+        self.raise_bubble(b)
+        self.index_bubble(b)
+
+    # ----------------------------
+    # touch handling: grab one bubble per touch, drop only that one
+    # ----------------------------
+    def on_touch_down(self, touch):
+        if not self.is_paused and self.collide_point(*touch.pos):
+            x, y = self.to_local(*touch.pos)
+            b = self.bubble_at(x, y)
+            if b is not None:
+                self.record("down", touch.uid, x, y)
+                self.log_event("drag", b)
+                touch.ud["bubble"] = b
+                touch.push()
+                touch.apply_transform_2d(self.to_local)
+                b.on_touch_down(touch)
+                touch.pop()
+                self.physics.update(b)
+                self.raise_bubble(b)
+                return True
+        return super().on_touch_down(touch)
+
+    def on_touch_move(self, touch):
+        b = touch.ud.get("bubble")
+        if b is None:
+            return super().on_touch_move(touch)
+        touch.push()
+        touch.apply_transform_2d(self.to_local)
+        self.record("move", touch.uid, touch.x, touch.y)
+        b.on_touch_move(touch)
+        touch.pop()
+        if b in self.bubble_grid.item_cells:
+            self.index_bubble(b)
+        return True
+
+    # ----------------------------
+    # drop check
+    # ----------------------------
+    @timed("touch_up")
+    def on_touch_up(self, touch):
+        b = touch.ud.get("bubble")
+        if b is None:
+            return super().on_touch_up(touch)
+        touch.push()
+        touch.apply_transform_2d(self.to_local)
+        self.record("up", touch.uid, touch.x, touch.y)
+        b.on_touch_up(touch)
+        touch.pop()
+        self.physics.update(b)
+        self.log_event("drop", b)
+        if b in self.bubble_widgets and not self.is_paused:
+            self.check_drop(b)
+        return True
+
+    def bucket_rects(self):
+        return [(bucket.status, (bucket.x, bucket.y, bucket.width, bucket.height))
+                for bucket in (self.bucket_halal, self.bucket_haram)]
+
+    @timed("check_drop")
+    def check_drop(self, b):
+        target = drop_target(b.x, b.y, b.width, b.height, self.bucket_rects())
+        if target is None:
+            return False
+        if target == b.category:
+            self.correct(b)
+        else:
+            self.wrong(b)
+        return True
+
+    @timed("popup")
+    def show_education_popup(self, bubble):
+        self.state = "popup"
+
+        overlay = self.get_overlay("education")
+        overlay.title.texture = label_cache.get(bubble.text, sp(32), bold=True, color=(0,0,0,1))
+        overlay.info.texture = label_cache.get(bubble.notes, sp(22), wrap_width=420,
+                                               color=(0,0,0,1))
+        self.education_bubble = bubble
+        self.education_shown_at = perf_counter()
+        overlay.show(self)
+
+        # animasi popup agar lebih hidup
+        card = overlay.card
+        Animation.cancel_all(card)
+        if not self.animations:
+            card.opacity = 1
+            card.scale = 1
+            return
+        card.opacity = 0
+        card.scale = 0.6
+        Animation(opacity=1, duration=0.28, t="out_cubic").start(card)
+        Animation(scale=1, duration=0.28, t="out_cubic").start(card)
+
+    def _close_education_popup(self):
+        self.record("close_popup")
+        self.get_overlay("education").hide()
+        bubble, self.education_bubble = self.education_bubble, None
+        if bubble is not None:
+            shown_ms = (perf_counter() - self.education_shown_at) * 1000
+            self.log_event("popup_dismiss", bubble, shown_ms)
+        self.state = "running"
+        # baru hapus bubble setelah popup ditutup
+        if bubble is not None:
+            self.safe_remove_widget(bubble)
+
+    # ----------------------------
+    # overlays: built on first use, then reused
+    # ----------------------------
+    def get_overlay(self, name):
+        overlay = self.overlays.get(name)
+        if overlay is None:
+            overlay = self.overlays[name] = getattr(self, f"_build_{name}_overlay")()
+        return overlay
+
+    def _build_education_overlay(self):
+        overlay = OverlayCard((480, 380), (1, 1, 1, 1), radius=22)
+        overlay.title = Image()
+        overlay.card.add_widget(overlay.title)
+        overlay.info = Image()
+        overlay.card.add_widget(overlay.info)
+        overlay.add_button("Lanjut", (0.1, 0.65, 0.28, 1), self._close_education_popup,
+                           height=70, font_size="24sp")
+        return overlay
+
+    def _build_pause_overlay(self):
+        overlay = OverlayCard((360, 360), (0.08, 0.08, 0.08, 0.98))
+        overlay.add_title("PAUSED", "30sp")
+        overlay.add_button("Resume", (0.22,0.7,0.36,1), self._resume_from_overlay)
+        overlay.add_button("Restart", (0.12,0.56,1,1), self._restart_from_overlay)
+        overlay.add_button("Main Menu", (0.9,0.25,0.3,1), self._menu_from_overlay)
+        return overlay
+
+    def _build_game_over_overlay(self):
+        overlay = OverlayCard((360, 270), (0.10, 0.08, 0.08, 0.97))
+        overlay.add_title("GAME OVER", "32sp")
+        overlay.add_button("Retry", (0.12, 0.56, 1, 1), self._restart_from_overlay)
+        overlay.add_button("Main Menu", (0.9, 0.25, 0.3, 1), self._menu_from_overlay)
+        return overlay
+
+    def _hide_pause_layer(self):
+        if self.pause_layer is not None:
+            self.pause_layer.hide()
+            self.pause_layer = None
+
+    # ----------------------------
+    # correct / wrong
+    # ----------------------------
+    def correct(self, bubble):
+        self.audio.play("correct")
+        if self.animations:
+            anim = Animation(opacity=0, duration=0.25)
+            anim.bind(on_complete=lambda *args: self.safe_remove_widget(bubble))
+            anim.start(bubble)
+        else:
+            self.safe_remove_widget(bubble)
+        self.selector.record(getattr(bubble, "food_index", None), True)
+        self.log_event("correct", bubble)
+        self.game.answer(True)
+        self.sync_game_state()
+        if self.session is not None:
+            self.session["correct"] += 1
+        if self.score_store is not None:
+            self.score_store.report_score(self.score, self.level)
+         # popup edukasi
+        self.show_education_popup(bubble)
+
+    def wrong(self, bubble):
+        self.audio.play("wrong")
+        self.selector.record(getattr(bubble, "food_index", None), False)
+        self.log_event("wrong", bubble)
+        bubble.pos = bubble.original_pos
+        bubble.sync_prev()
+        self.physics.update(bubble)
+        self.index_bubble(bubble)
+        if self.session is not None:
+            self.session["wrong"] += 1
+        self.game.answer(False)
+        self.sync_game_state()
+        if self.game.over:
+            self.game_over_popup()
+
+    def safe_remove_widget(self, w):
+        try:
+            if w in self.root_layer.children:
+                self.root_layer.remove_widget(w)
+        except Exception:
+            pass
+        try:
+            if w in self.bubble_widgets:
+                self.bubble_widgets.remove(w)
+        except Exception:
+            pass
+        self.bubble_grid.remove(w)
+        self.physics.remove(w)
+        if self.bubble_field is not None:
+            self.bubble_field.remove(w)
+        else:
+            self.bubble_pool.release(w)
+        self.spawner.on_bubble_removed()
+
+    # ----------------------------
+    # score / lives display
+    # ----------------------------
+    def sync_game_state(self):
+        # the Kivy properties and labels are a view of self.game
+        game = self.game
+        self.score, self.lives, self.level = game.score, game.lives, game.level
+        self.score_label.text = f"Score: {self.score}"
+        self.update_lives_display()
+
+    def update_lives_display(self):
+        if self.heart_images is None:
+            try:
+                lbl = self.hearts_box.children[0]
+                lbl.text = "♥" * max(0, self.lives)
+            except Exception:
+                pass
+        else:
+            for i, img in enumerate(self.heart_images):
+                img.opacity = 1.0 if i < self.lives else 0.25
+
+    # ----------------------------
+    # pause menu (overlay)
+    # ----------------------------
+    @timed("popup")
+    def pause_game(self):
+        if self.state != "running":
+            return
+        self.record("pause")
+        self.state = "paused"
+
+        # soften BGM
+        self.audio.duck("pause", 0.2)
+
+        self.pause_layer = self.get_overlay("pause")
+        self.pause_layer.show(self)
+
+    def _resume_from_overlay(self):
+        self.record("resume")
+        # remove overlay
+        self._hide_pause_layer()
+        # restore bgm
+        self.audio.unduck("pause")
+        self.state = "running"
+
+    def _restart_from_overlay(self):
+        self.record("restart")
+        # remove overlay
+        self._hide_pause_layer()
+        # restart
+        self._do_restart()
+
+    def _menu_from_overlay(self):
+        self.record("menu")
+        self._hide_pause_layer()
+        # stop bgm
+        self.audio.stop_bgm()
+        self.audio.unduck()
+        self.flush_scores()
+        self.state = "menu"
+        # switch to menu
+        try:
+            self.manager.current = "menu"
+        except Exception:
+            pass
+
+    # compatibility: previous resume_game name
+    def resume_game(self):
+        self._resume_from_overlay()
+
+    # ----------------------------
+    # game over (keeps popup)
+    # ----------------------------
+    @timed("popup")
+    def game_over_popup(self):
+        if self.state != "running":
+            return
+        self.state = "game_over"
+        self.end_session()
+        self.flush_scores()
+
+        # soften BGM
+        self.audio.duck("game_over", 0.125)
+
+        self.pause_layer = self.get_overlay("game_over")   # supaya bisa dihapus nanti
+        self.pause_layer.show(self)
+
+    def _do_restart(self):
+        # a restart from the pause menu still counts as a finished game
+        self.end_session()
+        self.begin_session()
+        # reset state
+        self.game.reset()
+        self.sync_game_state()
+        self.clear_bubbles()
+        # restart bgm
+        self.audio.unduck()
+        self.audio.play_bgm(restart=True)
+        self.spawner.reset()
+        self.spawner.schedule_first(0)
+        self.state = "running"
+        if self.memory_tracker is not None:
+            self.memory_tracker.checkpoint("restart")
+
+    def reset_game(self, popup):
+        try:
+            popup.dismiss()
+        except Exception:
+            pass
+        self._do_restart()
+
+    def clear_bubbles(self):
+        for c in list(self.root_layer.children):
+            if isinstance(c, DraggableBubble):
+                try:
+                    self.root_layer.remove_widget(c)
+                except Exception:
+                    pass
+                self.bubble_pool.release(c)
+        if self.bubble_field is not None:
+            self.bubble_field.clear_records()
+        self.bubble_widgets = []
+        self.physics.clear()
+        self.bubble_grid.clear()
+
+    def back_to_menu_popup(self):
+        self.state = "menu"
+        # stop bgm safely then go to menu
+        self.audio.stop_bgm()
+        self.audio.unduck()
+        try:
+            self.manager.current = "menu"
+        except Exception:
+            pass
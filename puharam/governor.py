@@ -0,0 +1,146 @@
+"""Quality tiers and the governor that steps between them to hold the frame rate."""
+from collections import deque
+
+# ----------------------------
+# Quality tiers
+# ----------------------------
+class QualityTier:
+    """What one quality level allows (applied by GameScreen.apply_quality).
+
+    sim_hz and max_live are upper limits; PUHARAM_SIM_HZ and
+    PUHARAM_MAX_BUBBLES still win when they are lower. segments is the
+    Ellipse segment count of a bubble (0 = Kivy's default, ~180).
+    interpolate=False draws bubbles where the last simulation step left
+    them instead of blending every frame.
+    """
+
+    def __init__(self, name, sim_hz, animations, max_live, segments, interpolate):
+        self.name = name
+        self.sim_hz = sim_hz
+        self.animations = animations
+        self.max_live = max_live
+        self.segments = segments
+        self.interpolate = interpolate
+
+
+# cheapest visual loss first: effects, then simulation rate and load, then smoothness
+TIERS = (
+    QualityTier("high", 60, True, 24, 0, True),
+    QualityTier("medium", 60, False, 18, 48, True),
+    QualityTier("low", 30, False, 12, 32, True),
+    QualityTier("minimal", 30, False, 8, 24, False),
+)
+
+
+def tier_index(name, tiers=TIERS):
+    for i, tier in enumerate(tiers):
+        if tier.name == name:
+            return i
+    raise ValueError(f"unknown quality tier: {name} (one of {', '.join(t.name for t in tiers)})")
+
+
+# ----------------------------
+# Performance governor
+# ----------------------------
+class PerformanceGovernor:
+    """Steps quality tiers from the rolling frame time.
+
+    observe(dt) is fed every running frame. Every `window` seconds of
+    frames the 90th percentile frame time is compared with the budget
+    (1 / target_fps):
+
+    * above budget * slow for `down_after` windows in a row: one tier down,
+    * at most budget * fast for `up_after` windows in a row: one tier up,
+    * in between: hold.
+
+    Going down is quick and going up is slow, so the tier does not flap.
+    If the game has to step down again within `probation` seconds of a
+    step up, the wait before the next step up doubles (up to
+    `max_up_after` windows). Single hitches over `max_dt` (GC, loading,
+    resuming) are ignored.
+    """
+
+    def __init__(self, apply, tiers=TIERS, target_fps=60.0, window=1.0, slow=1.25, fast=1.1,
+                 down_after=2, up_after=5, max_up_after=60, probation=10.0, max_dt=0.25):
+        self.apply = apply
+        self.tiers = tiers
+        self.budget = 1.0 / target_fps
+        self.window = window
+        self.slow = slow
+        self.fast = fast
+        self.down_after = down_after
+        self.up_after = up_after
+        self.max_up_after = max_up_after
+        self.probation = probation
+        self.max_dt = max_dt
+        self.frames = deque()
+        self.elapsed = 0.0       # frame time collected in the current window
+        self.clock = 0.0         # observed running time
+        self.slow_windows = 0
+        self.fast_windows = 0
+        self.stepped_up_at = None
+        self.tier = 0
+        self.locked = False
+        self.changes = 0
+        self.last_p90 = 0.0
+
+    @property
+    def current(self):
+        return self.tiers[self.tier]
+
+    def set_tier(self, index, lock=None):
+        """Switch to a tier now; lock=True keeps it there (forced quality, recording)."""
+        if lock is not None:
+            self.locked = lock
+        index = max(0, min(len(self.tiers) - 1, index))
+        if index != self.tier:
+            self.changes += 1
+        self.tier = index
+        self.slow_windows = self.fast_windows = 0
+        self.frames.clear()
+        self.elapsed = 0.0
+        self.apply(self.tiers[index])
+
+    def observe(self, dt):
+        if self.locked or dt > self.max_dt:
+            return
+        self.frames.append(dt)
+        self.elapsed += dt
+        if self.elapsed >= self.window - 1e-9:  # float sums of dt
+            self.evaluate()
+
+    def evaluate(self):
+        frames = sorted(self.frames)
+        p90 = frames[min(len(frames) - 1, int(len(frames) * 0.9))]
+        self.last_p90 = p90
+        self.clock += self.elapsed
+        self.frames.clear()
+        self.elapsed = 0.0
+
+        if p90 > self.budget * self.slow:
+            self.fast_windows = 0
+            self.slow_windows += 1
+            if self.slow_windows >= self.down_after and self.tier < len(self.tiers) - 1:
+                if self.stepped_up_at is not None and self.clock - self.stepped_up_at < self.probation:
+                    # that step up did not hold: wait longer before the next one
+                    self.up_after = min(self.max_up_after, self.up_after * 2)
+                self.stepped_up_at = None
+                self.set_tier(self.tier + 1)
+        elif p90 <= self.budget * self.fast:
+            self.slow_windows = 0
+            self.fast_windows += 1
+            if self.fast_windows >= self.up_after and self.tier > 0:
+                self.stepped_up_at = self.clock
+                self.set_tier(self.tier - 1)
+        else:
+            self.slow_windows = self.fast_windows = 0
+
+    def status(self):
+        return {
+            "tier": self.current.name,
+            "index": self.tier,
+            "locked": self.locked,
+            "p90_ms": self.last_p90 * 1000,
+            "changes": self.changes,
+            "up_after": self.up_after,
+        }
@@ -0,0 +1,86 @@
+"""Shared cache of rendered label textures."""
+import os
+from collections import OrderedDict
+
+from kivy.core.text import Label as CoreLabel
+
+# ----------------------------
+# Label texture cache
+# ----------------------------
+class LabelTextureCache:
+    """LRU cache of rendered text textures.
+
+    Entries are keyed by (text, font size, wrap width, style). Each string
+    is measured and laid out once; later bubbles and education cards with
+    the same text reuse the texture. The cache is bounded both by entry
+    count and by approximate texture memory (width * height * 4 bytes).
+    """
+
+    def __init__(self, max_entries=256, max_bytes=16 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, text, font_size, wrap_width=None, bold=False,
+            color=(1, 1, 1, 1), halign="center", padding=(0, 0), markup=False):
+        key = (text, font_size, wrap_width, bold, tuple(color), halign, tuple(padding), markup)
+        tex = self.entries.get(key)
+        if tex is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return tex
+
+        self.misses += 1
+        lbl = CoreLabel(text=text, font_size=font_size, bold=bold, color=color,
+                        halign=halign, valign="middle", padding=padding, markup=markup)
+        # measure once; only wrap when the text does not fit
+        if wrap_width is not None:
+            w, h = lbl.get_extents(text)
+            if w + 2 * padding[0] > wrap_width:
+                lbl.text_size = (wrap_width, None)
+        lbl.refresh()
+        tex = lbl.texture
+
+        self.entries[key] = tex
+        self.bytes += self._cost(tex)
+        self._evict()
+        return tex
+
+    def _cost(self, tex):
+        try:
+            return tex.width * tex.height * 4
+        except Exception:
+            return 0
+
+    def _evict(self):
+        # always keep the newest entry, even if it alone exceeds max_bytes
+        while len(self.entries) > 1 and (len(self.entries) > self.max_entries
+                                         or self.bytes > self.max_bytes):
+            _, tex = self.entries.popitem(last=False)
+            self.bytes -= self._cost(tex)
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+    def stats(self):
+        return {
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+        }
+
+
+label_cache = LabelTextureCache(
+    max_entries=int(os.environ.get("PUHARAM_LABEL_CACHE_ENTRIES", 256)),
+    max_bytes=int(os.environ.get("PUHARAM_LABEL_CACHE_BYTES", 16 * 1024 * 1024)),
+)
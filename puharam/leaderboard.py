@@ -0,0 +1,314 @@
+"""Online leaderboard client: queued score submission and cached pages."""
+import http.client
+import json
+import random
+import threading
+import time
+import uuid
+from urllib.parse import urlencode, urlsplit
+
+from kivy.clock import Clock
+
+from puharam.files import atomic_write
+
+# ----------------------------
+# Leaderboard client
+# ----------------------------
+class LeaderboardClient:
+    """Submits scores to and fetches pages from a leaderboard server.
+
+    All network I/O happens on one worker thread over one keep-alive
+    HTTP(S) connection, reopened after an error; the UI thread only
+    appends to the queue or reads the page cache, and callbacks are
+    posted back with Clock.schedule_once.
+
+    submit() queues a score. The worker waits `batch_delay` seconds for
+    more, then POSTs up to `batch_size` of them in one request. On a
+    network or server error it backs off exponentially (with jitter, up
+    to `max_backoff` seconds) and tries again; scores the server rejects
+    (4xx) are dropped. Every score carries an id, so a batch that is
+    retried after a lost response is not counted twice. The queue and the
+    player id live in a small JSON file (see atomic_write), rewritten as
+    soon as a score is queued, so scores submitted offline are sent on a
+    later run even if the app is killed.
+
+    fetch() answers from the page cache while it is younger than
+    `cache_ttl` seconds. Otherwise it asks the worker, and when the
+    server cannot be reached it falls back to the stale page, marked
+    "stale": True.
+
+    Server API (see tools/leaderboard_server.py):
+        POST /scores        {"scores": [{"id", "player", "name", "score", "level", ...}]}
+                            -> {"accepted": n}
+        GET  /leaderboard?page=0&size=10
+                            -> {"page", "size", "total", "entries": [{"rank", "name", ...}]}
+    """
+
+    def __init__(self, url, path, name=None, batch_size=20, batch_delay=1.0, timeout=5.0,
+                 backoff=2.0, max_backoff=300.0, cache_ttl=60.0, max_queue=500, post=None):
+        parts = urlsplit(url)
+        self.scheme = parts.scheme or "http"
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port
+        self.prefix = parts.path.rstrip("/")
+        self.path = path
+        self.name = name
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.timeout = timeout
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.cache_ttl = cache_ttl
+        self.max_queue = max_queue
+        # how callbacks reach the UI thread; tools pass post=lambda f: f()
+        self.post = post or (lambda f: Clock.schedule_once(lambda dt: f(), 0))
+
+        self.player = None
+        self.queue = []          # scores not yet accepted by the server
+        self.queue_dirty = False
+        self.fetches = []        # [(page, size, [callbacks])]
+        self.cache = {}          # (page, size) -> (monotonic time, page dict)
+        self.failures = 0
+        self.retry_at = 0.0      # monotonic; no submit before this
+        self.send_after = 0.0    # end of the batch_delay window
+        self.sent = 0
+        self.dropped = 0
+        self.requests = 0
+        self.connects = 0
+        self.online = None       # unknown until the first request
+        self.closed = False
+        self.conn = None
+        self.cond = threading.Condition()
+        self.thread = threading.Thread(target=self._run, name="leaderboard", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    # ----------------------------
+    # UI thread
+    # ----------------------------
+    def submit(self, score, level, seconds=0, correct=0, wrong=0):
+        with self.cond:
+            self.queue.append({"id": uuid.uuid4().hex, "score": int(score), "level": int(level),
+                               "seconds": int(seconds), "correct": int(correct),
+                               "wrong": int(wrong), "ended": int(time.time())})
+            if len(self.queue) > self.max_queue:
+                # offline for a long time: keep the newest scores
+                self.dropped += len(self.queue) - self.max_queue
+                del self.queue[:-self.max_queue]
+            self.queue_dirty = True
+            if len(self.queue) == 1:
+                self.send_after = time.monotonic() + self.batch_delay
+            self.cond.notify()
+
+    def flush(self):
+        # end of a game: skip batch_delay (a pending backoff still applies)
+        with self.cond:
+            self.send_after = 0.0
+            self.cond.notify()
+
+    def fetch(self, callback, page=0, size=10):
+        """callback(page dict or None) on the UI thread; from the cache when fresh."""
+        key = (page, size)
+        with self.cond:
+            cached = self.cache.get(key)
+            if cached is not None and time.monotonic() - cached[0] < self.cache_ttl:
+                result = cached[1]
+            else:
+                for p, s, callbacks in self.fetches:
+                    if (p, s) == key:
+                        callbacks.append(callback)
+                        break
+                else:
+                    self.fetches.append((page, size, [callback]))
+                self.cond.notify()
+                return False
+        self.post(lambda: callback(result))
+        return True
+
+    def close(self, timeout=2.0):
+        # unsent scores stay in the queue file for the next run
+        with self.cond:
+            self.closed = True
+            self.cond.notify()
+        if self.thread.is_alive():
+            self.thread.join(timeout)
+
+    def stats(self):
+        with self.cond:
+            return {
+                "queued": len(self.queue),
+                "sent": self.sent,
+                "dropped": self.dropped,
+                "requests": self.requests,
+                "connects": self.connects,
+                "failures": self.failures,
+                "online": self.online,
+                "cached_pages": len(self.cache),
+            }
+
+    # ----------------------------
+    # worker thread
+    # ----------------------------
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except FileNotFoundError:
+            stored = {}
+        except Exception as e:
+            print("Failed loading leaderboard queue:", e)
+            stored = {}
+        with self.cond:
+            self.player = stored.get("player") or uuid.uuid4().hex
+            if self.name is None:
+                self.name = stored.get("name") or "Player-" + self.player[:4].upper()
+            # scores submitted before loading finished go after the saved ones
+            self.queue[:0] = [s for s in stored.get("queue", []) if isinstance(s, dict)]
+            self.queue_dirty = self.queue_dirty or "player" not in stored
+            if self.queue:
+                self.send_after = 0.0
+
+    def _save(self):
+        with self.cond:
+            if not self.queue_dirty:
+                return
+            payload = json.dumps({"player": self.player, "name": self.name, "queue": self.queue})
+            self.queue_dirty = False
+        try:
+            atomic_write(self.path, payload)
+        except Exception as e:
+            print("Failed saving leaderboard queue:", e)
+
+    def _connection(self):
+        if self.conn is None:
+            cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            self.conn = cls(self.host, self.port, timeout=self.timeout)
+            self.connects += 1
+        return self.conn
+
+    def _drop_connection(self):
+        if self.conn is not None:
+            try:
+                self.conn.close()
+            except Exception:
+                pass
+            self.conn = None
+
+    def _request(self, method, path, body=None):
+        """(status, decoded JSON or None); raises OSError / HTTPException when unreachable."""
+        headers = {"Accept": "application/json"}
+        data = None
+        if body is not None:
+            data = json.dumps(body).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        # a kept-alive connection the server has since closed fails once; retry on a new one
+        for attempt in (0, 1):
+            conn = self._connection()
+            try:
+                conn.request(method, self.prefix + path, data, headers)
+                resp = conn.getresponse()
+                payload = resp.read()
+                break
+            except (OSError, http.client.HTTPException):
+                self._drop_connection()
+                if attempt:
+                    raise
+        self.requests += 1
+        if resp.will_close:
+            self._drop_connection()
+        try:
+            return resp.status, json.loads(payload.decode("utf-8")) if payload else None
+        except ValueError:
+            return resp.status, None
+
+    def _failed(self, retry_after=None):
+        # exponential backoff with jitter, shared by all submissions
+        self.failures += 1
+        self.online = False
+        delay = min(self.max_backoff, self.backoff * 2 ** (self.failures - 1))
+        delay *= random.uniform(0.5, 1.0)
+        if retry_after:
+            delay = max(delay, retry_after)
+        self.retry_at = time.monotonic() + delay
+
+    def _send(self, batch):
+        body = {"scores": [dict(s, player=self.player, name=self.name) for s in batch]}
+        try:
+            status, _ = self._request("POST", "/scores", body)
+        except (OSError, http.client.HTTPException) as e:
+            print("Leaderboard offline, will retry:", e)
+            with self.cond:
+                self._failed()
+            return
+        with self.cond:
+            if status < 300 or (400 <= status < 500 and status not in (408, 429)):
+                if status >= 400:
+                    print("Leaderboard rejected", len(batch), "scores:", status)
+                    self.dropped += len(batch)
+                else:
+                    self.sent += len(batch)
+                    self.online = True
+                sent = {s["id"] for s in batch}
+                self.queue = [s for s in self.queue if s["id"] not in sent]
+                self.queue_dirty = True
+                self.failures = 0
+                self.retry_at = 0.0
+                # new scores change the ranking
+                self.cache.clear()
+            else:
+                self._failed(30.0 if status == 429 else None)
+
+    def _fetch(self, page, size, callbacks):
+        key = (page, size)
+        result = None
+        try:
+            status, data = self._request("GET", "/leaderboard?" + urlencode({"page": page,
+                                                                              "size": size}))
+            if status == 200 and isinstance(data, dict):
+                result = dict(data, stale=False)
+                with self.cond:
+                    self.cache[key] = (time.monotonic(), result)
+                    self.online = True
+            else:
+                print("Leaderboard fetch failed:", status)
+        except (OSError, http.client.HTTPException) as e:
+            print("Leaderboard offline:", e)
+            with self.cond:
+                self.online = False
+        if result is None:
+            with self.cond:
+                cached = self.cache.get(key)
+            if cached is not None:
+                result = dict(cached[1], stale=True)
+        for cb in callbacks:
+            self.post(lambda cb=cb: cb(result))
+
+    def _run(self):
+        self._load()
+        while True:
+            with self.cond:
+                while True:
+                    # a new score is saved right away, even while backing off
+                    if self.closed or self.fetches or self.queue_dirty:
+                        break
+                    now = time.monotonic()
+                    wake = max(self.retry_at, self.send_after)
+                    if self.queue and now >= wake:
+                        break
+                    self.cond.wait(wake - now if self.queue else None)
+                closed = self.closed
+                fetches, self.fetches = self.fetches, []
+                batch = []
+                if not closed and self.queue and time.monotonic() >= max(self.retry_at,
+                                                                         self.send_after):
+                    batch = self.queue[:self.batch_size]
+            self._save()
+            if closed:
+                break
+            for page, size, callbacks in fetches:
+                self._fetch(page, size, callbacks)
+            if batch:
+                self._send(batch)
+                self._save()
+        self._drop_connection()
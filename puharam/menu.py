@@ -0,0 +1,100 @@
+"""Main menu screen."""
+from kivy.app import App
+from kivy.uix.button import Button
+from kivy.uix.floatlayout import FloatLayout
+from kivy.uix.label import Label
+from kivy.uix.progressbar import ProgressBar
+from kivy.uix.screenmanager import Screen
+
+# ----------------------------
+# Main Menu Screen
+# ----------------------------
+class MainMenuScreen(Screen):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        layout = FloatLayout()
+        title = Label(text="PuHaRam", font_size="36sp", bold=True,
+                      pos_hint={"center_x":0.5,"center_y":0.7}, color=(0.08,0.4,0.6,1))
+        layout.add_widget(title)
+
+        start_btn = Button(text="Start Game", size_hint=(0.5, 0.14), pos_hint={"center_x":0.5,"center_y":0.48},
+                           font_size="22sp", background_color=(0.16,0.56,1,1), color=(1,1,1,1))
+        layout.add_widget(start_btn)
+        start_btn.bind(on_release=lambda x: self.start_game())
+
+        # Add Exit Button
+        exit_btn = Button(text="Exit", size_hint=(0.5, 0.14), pos_hint={"center_x":0.5,"center_y":0.32},
+                          font_size="22sp", background_color=(1,0.25,0.25,1), color=(1,1,1,1))
+        layout.add_widget(exit_btn)
+        exit_btn.bind(on_release=lambda x: App.get_running_app().stop())
+
+
+        # best score, filled in once the score file has been read
+        self.best_label = Label(text="", font_size="18sp", pos_hint={"center_x":0.5,"center_y":0.64},
+                                color=(0.08,0.4,0.6,1))
+        layout.add_widget(self.best_label)
+
+        # online top 3, when the leaderboard is on (PUHARAM_LEADERBOARD_URL)
+        self.board_label = Label(text="", font_size="14sp", halign="center",
+                                 pos_hint={"center_x":0.5,"center_y":0.09}, color=(0.08,0.4,0.6,1))
+        layout.add_widget(self.board_label)
+
+        # small info at bottom
+        info = Label(text="Tap the bubble and drag to correct bucket", font_size="14sp",
+                     pos_hint={"center_x":0.5,"center_y":0.18}, color=(0.2,0.2,0.2,1))
+        layout.add_widget(info)
+
+        # asset loading progress
+        self.loading_bar = ProgressBar(max=1.0, value=0, size_hint=(0.5, None), height=16,
+                                       pos_hint={"center_x":0.5,"center_y":0.595})
+        layout.add_widget(self.loading_bar)
+        self.loading_label = Label(text="Loading...", font_size="14sp",
+                                   pos_hint={"center_x":0.5,"center_y":0.57}, color=(0.2,0.2,0.2,1))
+        layout.add_widget(self.loading_label)
+        self.start_pending = False
+
+        self.add_widget(layout)
+
+    def on_pre_enter(self, *args):
+        self.show_best()
+        self.show_leaderboard()
+
+    def show_best(self, *args):
+        app = App.get_running_app()
+        store = getattr(app, "score_store", None)
+        if store is not None and store.loaded:
+            self.best_label.text = f"Best: {store.get('highscore', 0)}"
+
+    def show_leaderboard(self, *args):
+        # cached pages answer at once; otherwise the label fills in when the page arrives
+        board = getattr(App.get_running_app(), "leaderboard", None)
+        if board is not None:
+            board.fetch(self.on_leaderboard, page=0, size=3)
+
+    def on_leaderboard(self, page):
+        if not page or not page.get("entries"):
+            return
+        rows = [f"{e['rank']}. {e['name']}  {e['score']}" for e in page["entries"]]
+        self.board_label.text = ("Top players" + (" (offline)" if page.get("stale") else "")
+                                 + "\n" + "\n".join(rows))
+
+    def set_progress(self, fraction, text=""):
+        self.loading_bar.value = fraction
+        self.loading_label.text = f"Loading {text}... {int(fraction * 100)}%"
+
+    def on_assets_ready(self):
+        self.loading_bar.opacity = 0
+        self.loading_label.text = ""
+        if self.start_pending:
+            self.start_pending = False
+            self.start_game()
+
+    def start_game(self):
+        app = App.get_running_app()
+        if not app.assets.ready:
+            # start as soon as loading finishes
+            self.start_pending = True
+            self.loading_label.text = "Loading... the game starts when ready"
+            return
+        app.get_game_screen()
+        self.manager.current = "game"
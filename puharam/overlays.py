@@ -0,0 +1,65 @@
+"""Reusable overlay card (pause, game over, education card)."""
+from kivy.graphics import Color, Rectangle, RoundedRectangle
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.button import Button
+from kivy.uix.floatlayout import FloatLayout
+from kivy.uix.label import Label
+
+# ----------------------------
+# Reusable overlay (pause, game over, education card)
+# ----------------------------
+class OverlayCard(FloatLayout):
+    """Dimmed full-screen overlay with a centred card.
+
+    Built once and shown/hidden by adding it to / removing it from the
+    screen, so opening a popup does not rebuild its widget tree.
+    """
+
+    def __init__(self, card_size, card_color, radius=20, **kwargs):
+        super().__init__(size_hint=(1, 1), **kwargs)
+        with self.canvas:
+            Color(0, 0, 0, 0.55)
+            self.dim_rect = Rectangle(pos=self.pos, size=self.size)
+        self.bind(pos=self._update_dim, size=self._update_dim)
+
+        self.card = BoxLayout(orientation="vertical", spacing=14, padding=22,
+                              size_hint=(None, None), size=card_size,
+                              pos_hint={"center_x": 0.5, "center_y": 0.5})
+        with self.card.canvas.before:
+            Color(*card_color)
+            self.card_bg = RoundedRectangle(pos=self.card.pos, size=self.card.size, radius=[radius])
+        self.card.bind(pos=self._update_card, size=self._update_card)
+        self.add_widget(self.card)
+
+    def _update_dim(self, *args):
+        self.dim_rect.pos = self.pos
+        self.dim_rect.size = self.size
+
+    def _update_card(self, *args):
+        self.card_bg.pos = self.card.pos
+        self.card_bg.size = self.card.size
+
+    def add_title(self, text, font_size):
+        title = Label(text=f"[b]{text}[/b]", markup=True, font_size=font_size,
+                      size_hint=(1, None), height=60, color=(1, 1, 1, 1))
+        self.card.add_widget(title)
+        return title
+
+    def add_button(self, text, color, on_release, height=64, font_size="20sp"):
+        btn = Button(text=text, size_hint=(1, None), height=height, font_size=font_size,
+                     background_normal="", background_color=color, color=(1, 1, 1, 1))
+        btn.bind(on_release=lambda x: on_release())
+        self.card.add_widget(btn)
+        return btn
+
+    @property
+    def shown(self):
+        return self.parent is not None
+
+    def show(self, parent):
+        if self.parent is None:
+            parent.add_widget(self)
+
+    def hide(self):
+        if self.parent is not None:
+            self.parent.remove_widget(self)
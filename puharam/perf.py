@@ -0,0 +1,139 @@
+"""Frame-time and hot-path instrumentation (debug overlay, cProfile capture)."""
+import json
+import os
+import time
+from collections import deque
+from functools import wraps
+from time import perf_counter
+
+from kivy.clock import Clock
+
+# ----------------------------
+# Performance instrumentation
+# ----------------------------
+class PerfMonitor:
+    """Frame-time and hot-path timings for the debug overlay.
+
+    Off by default. While disabled the frame hook is not scheduled and the
+    @timed wrappers only check one attribute, so the cost is close to zero.
+    Enable with PUHARAM_PERF=1 or F12 in game; F11 starts/stops a cProfile
+    capture and F10 dumps the collected samples to JSON.
+    """
+
+    def __init__(self, enabled=False, max_samples=3600, dump_dir="."):
+        self.enabled = False
+        self.max_samples = max_samples
+        self.dump_dir = dump_dir
+        self.frames = deque(maxlen=max_samples)
+        self.sections = {}
+        self.frame_event = None
+        self.profiler = None
+        if enabled:
+            self.enable()
+
+    def enable(self):
+        if self.enabled:
+            return
+        self.enabled = True
+        self.frame_event = Clock.schedule_interval(self.on_frame, 0)
+
+    def disable(self):
+        self.enabled = False
+        if self.frame_event is not None:
+            self.frame_event.cancel()
+            self.frame_event = None
+
+    def toggle(self):
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+        return self.enabled
+
+    def on_frame(self, dt):
+        self.frames.append(dt)
+
+    def record(self, name, seconds):
+        samples = self.sections.get(name)
+        if samples is None:
+            samples = self.sections[name] = deque(maxlen=self.max_samples)
+        samples.append(seconds)
+
+    def reset(self):
+        self.frames.clear()
+        self.sections.clear()
+
+    @staticmethod
+    def percentile(values, p):
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        k = min(len(ordered) - 1, max(0, int(round(p / 100.0 * (len(ordered) - 1)))))
+        return ordered[k]
+
+    def summary(self):
+        frames = list(self.frames)
+        mean = sum(frames) / len(frames) if frames else 0.0
+        result = {
+            "fps": 1.0 / mean if mean else 0.0,
+            "frame_ms": {
+                "p50": self.percentile(frames, 50) * 1000,
+                "p95": self.percentile(frames, 95) * 1000,
+                "p99": self.percentile(frames, 99) * 1000,
+            },
+            "sections_ms": {},
+        }
+        for name, samples in self.sections.items():
+            values = list(samples)
+            result["sections_ms"][name] = {
+                "mean": sum(values) / len(values) * 1000 if values else 0.0,
+                "p95": self.percentile(values, 95) * 1000,
+                "count": len(values),
+            }
+        return result
+
+    def dump(self, path=None):
+        if path is None:
+            path = os.path.join(self.dump_dir, time.strftime("perf_%Y%m%d_%H%M%S.json"))
+        data = {
+            "summary": self.summary(),
+            "frames": list(self.frames),
+            "sections": {k: list(v) for k, v in self.sections.items()},
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        return path
+
+    def toggle_profile(self, path=None):
+        # start a capture, or stop the running one and write it to a .prof file
+        if self.profiler is None:
+            import cProfile
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+            return None
+        self.profiler.disable()
+        if path is None:
+            path = os.path.join(self.dump_dir, time.strftime("profile_%Y%m%d_%H%M%S.prof"))
+        self.profiler.dump_stats(path)
+        self.profiler = None
+        return path
+
+
+perf = PerfMonitor(enabled=os.environ.get("PUHARAM_PERF") == "1",
+                   dump_dir=os.environ.get("PUHARAM_PERF_DIR", "."))
+
+
+def timed(name):
+    """Record the wrapped method's run time under `name` while perf is enabled."""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not perf.enabled:
+                return fn(*args, **kwargs)
+            t0 = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                perf.record(name, perf_counter() - t0)
+        return wrapper
+    return decorator
@@ -0,0 +1,256 @@
+"""Simulation timing and the bubble physics backends."""
+import os
+
+np = None  # numpy is imported on first use (see load_numpy); it is a slow import
+
+# ----------------------------
+# Simulation timing
+# ----------------------------
+# bubble velocities (dx, dy) are in pixels per 1/REFERENCE_HZ s, so gameplay
+# speed does not depend on the simulation rate or the frame rate
+REFERENCE_HZ = 60
+MAX_FRAME_TIME = 0.25     # longer frames are clamped (the game slows down instead of exploding)
+MAX_BUBBLE_SPEED = 14     # |dx|, |dy| cap; speed used to grow with the level without bound
+
+
+def sim_rate(hz=None):
+    """Simulation ticks per second (default: $PUHARAM_SIM_HZ or 60)."""
+    try:
+        hz = float(hz or os.environ.get("PUHARAM_SIM_HZ", REFERENCE_HZ))
+    except ValueError:
+        hz = REFERENCE_HZ
+    return min(240.0, max(10.0, hz))
+
+
+# ----------------------------
+# Bubble kinematics
+# ----------------------------
+def step_bubble(x, y, dx, dy, w, h, scale, buckets_top, pw, ph):
+    """One simulation step of a free bubble; returns the new (x, y, dx, dy).
+
+    scale is the step length in reference frames (dt * REFERENCE_HZ).
+    """
+    # move; an edge crossed during the step reflects the overshoot back
+    # (swept bounds), so a fast bubble cannot end up past an edge. A
+    # bubble that was already outside (dropped there) is pushed back in.
+    nx = x + dx * scale
+    lo, hi = 10, pw - 10 - w
+    if nx < lo:
+        nx = 2 * lo - nx if x >= lo else lo
+        dx = abs(dx)
+    elif nx > hi:
+        nx = 2 * hi - nx if x <= hi else hi
+        dx = -abs(dx)
+    nx = max(lo, min(nx, hi))
+
+    # vertical constraints: do not go into bucket area
+    lo = buckets_top + 8  # sedikit jarak dari bucket top
+    # also keep some minimum screen area (avoid too low)
+    lo = max(lo, ph * 0.28)
+    hi = ph - 20 - h
+
+    ny = y + dy * scale
+    if ny < lo:
+        # bounce off the bucket line, or push a bubble that was dropped
+        # below it back above the buckets; either way it moves upward
+        ny = 2 * lo - ny if y >= lo else lo
+        dy = abs(dy) if dy != 0 else 2
+    elif ny > hi:
+        # bounce at top
+        ny = 2 * hi - ny if y <= hi else hi
+        dy = -abs(dy)
+    ny = min(max(ny, lo), hi)
+    return nx, ny, dx, dy
+
+
+# ----------------------------
+# Bubble physics backends
+# ----------------------------
+class ScalarBubblePhysics:
+    """Steps each bubble with its own auto_move (see step_bubble)."""
+    name = "scalar"
+
+    # bubbles are read from the list every step; nothing to keep in sync
+    def add(self, b):
+        pass
+
+    def update(self, b):
+        pass
+
+    def remove(self, b):
+        pass
+
+    def clear(self):
+        pass
+
+    def step(self, bubbles, dt, buckets_top, pw, ph):
+        for b in bubbles:
+            b.auto_move(dt, buckets_top, pw, ph)
+
+
+class NumpyBubblePhysics:
+    """Batched version of step_bubble.
+
+    x, y, dx, dy, width and height of all bubbles live in NumPy arrays
+    (struct-of-arrays), one row per bubble, for the bubble's whole life:
+    add() fills a row when a bubble spawns, remove() swaps the last row
+    into its place. Movement, the side bounces, the clamp above the
+    buckets and the top bounce are applied to every row at once, in the
+    same order as the scalar code, so trajectories come out identical.
+
+    The arrays are the positions of record. After a step the new position
+    of every moving row is written to its bubble (the renderer draws from
+    it), and dx/dy only for rows that bounced. Rows of dragged bubbles are
+    frozen; update(b) reads a row back from its bubble once the game has
+    moved it (grab, drop, back to its start after a wrong answer).
+    """
+    name = "numpy"
+
+    def __init__(self, capacity=64):
+        self.n = 0
+        self.rows = {}      # bubble -> row
+        self.bubbles = []   # row -> bubble
+        self.capacity = 0
+        self._grow(capacity)
+
+    def _grow(self, capacity):
+        old = self.capacity and (self.x, self.y, self.dx, self.dy, self.w, self.h, self.active)
+        self.capacity = capacity
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.dx = np.zeros(capacity)
+        self.dy = np.zeros(capacity)
+        self.w = np.zeros(capacity)
+        self.h = np.zeros(capacity)
+        self.active = np.zeros(capacity, dtype=bool)
+        if old:
+            n = self.n
+            for new, prev in zip((self.x, self.y, self.dx, self.dy, self.w, self.h, self.active), old):
+                new[:n] = prev[:n]
+
+    def _read(self, i, b):
+        self.x[i] = b.x
+        self.y[i] = b.y
+        self.dx[i] = b.dx
+        self.dy[i] = b.dy
+        self.w[i] = b.width
+        self.h[i] = b.height
+        self.active[i] = not b.is_dragging and b.parent is not None
+
+    def add(self, b):
+        i = self.rows.get(b)
+        if i is None:
+            if self.n == self.capacity:
+                self._grow(self.capacity * 2)
+            i = self.rows[b] = self.n
+            self.bubbles.append(b)
+            self.n += 1
+        self._read(i, b)
+
+    def update(self, b):
+        i = self.rows.get(b)
+        if i is not None:
+            self._read(i, b)
+
+    def remove(self, b):
+        i = self.rows.pop(b, None)
+        if i is None:
+            return
+        last = self.n - 1
+        if i != last:
+            for a in (self.x, self.y, self.dx, self.dy, self.w, self.h, self.active):
+                a[i] = a[last]
+            moved = self.bubbles[i] = self.bubbles[last]
+            self.rows[moved] = i
+        self.bubbles.pop()
+        self.n = last
+
+    def clear(self):
+        self.rows.clear()
+        self.bubbles = []
+        self.n = 0
+
+    def rebuild(self, bubbles):
+        # the list changed without add/remove (e.g. a backend swapped in mid-game)
+        self.clear()
+        for b in bubbles:
+            self.add(b)
+
+    def integrate(self, n, dt, buckets_top, pw, ph):
+        """One step for rows [0, n); returns the rows whose dx or dy changed."""
+        x, y = self.x[:n], self.y[:n]
+        dx, dy = self.dx[:n], self.dy[:n]
+        w, h = self.w[:n], self.h[:n]
+        active = self.active[:n]
+        scale = dt * REFERENCE_HZ
+
+        # move + swept horizontal bounce
+        xn = x + dx * scale
+        lo, hi = 10, pw - 10 - w
+        m_lo = active & (xn < lo)
+        xn[m_lo] = np.where(x[m_lo] >= lo, 2 * lo - xn[m_lo], lo)
+        dx[m_lo] = np.abs(dx[m_lo])
+        m_hi = active & ~m_lo & (xn > hi)
+        xn[m_hi] = np.where(x[m_hi] <= hi[m_hi], 2 * hi[m_hi] - xn[m_hi], hi[m_hi])
+        dx[m_hi] = -np.abs(dx[m_hi])
+        x[active] = np.maximum(lo, np.minimum(xn, hi))[active]
+        bounced = m_lo | m_hi
+
+        # vertical: bounce off (or get pushed back above) the buckets, bounce at top
+        lo = max(buckets_top + 8, ph * 0.28)
+        hi = ph - 20 - h
+        yn = y + dy * scale
+        m_lo = active & (yn < lo)
+        yn[m_lo] = np.where(y[m_lo] >= lo, 2 * lo - yn[m_lo], lo)
+        dy[m_lo] = np.where(dy[m_lo] != 0, np.abs(dy[m_lo]), 2)
+        m_hi = active & ~m_lo & (yn > hi)
+        yn[m_hi] = np.where(y[m_hi] <= hi[m_hi], 2 * hi[m_hi] - yn[m_hi], hi[m_hi])
+        dy[m_hi] = -np.abs(dy[m_hi])
+        y[active] = np.minimum(np.maximum(yn, lo), hi)[active]
+        return np.flatnonzero(bounced | m_lo | m_hi)
+
+    def store(self, n, bounced):
+        bubbles = self.bubbles
+        xs = self.x[:n].tolist()
+        ys = self.y[:n].tolist()
+        active = self.active[:n]
+        if active.all():
+            for b, x, y in zip(bubbles, xs, ys):
+                b.place(x, y)
+        else:
+            for i in np.flatnonzero(active).tolist():
+                bubbles[i].place(xs[i], ys[i])
+        dx, dy = self.dx, self.dy
+        for i in bounced.tolist():
+            b = bubbles[i]
+            b.dx = float(dx[i])
+            b.dy = float(dy[i])
+
+    def step(self, bubbles, dt, buckets_top, pw, ph):
+        if self.n != len(bubbles):
+            self.rebuild(bubbles)
+        n = self.n
+        if n:
+            self.store(n, self.integrate(n, dt, buckets_top, pw, ph))
+
+
+def load_numpy():
+    """Import numpy on first use; None if it is not installed."""
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:  # numpy is optional; the scalar physics always works
+            return None
+        np = numpy
+    return np
+
+
+def create_physics(name=None):
+    """Pick a physics backend by name (default: $PUHARAM_PHYSICS or scalar)."""
+    name = (name or os.environ.get("PUHARAM_PHYSICS", "scalar")).lower()
+    if name == "numpy":
+        if load_numpy() is not None:
+            return NumpyBubblePhysics()
+        print("NumPy not available, using scalar bubble physics")
+    return ScalarBubblePhysics()
@@ -0,0 +1,87 @@
+"""Deterministic session recording (replayed by tools/replay.py)."""
+import gzip
+import hashlib
+import json
+import struct
+import time
+from time import perf_counter
+
+from kivy.metrics import Metrics
+
+# ----------------------------
+# Session recording (replayed by tools/replay.py)
+# ----------------------------
+SESSION_FORMAT = "puharam-session"
+SESSION_VERSION = 2
+
+
+def session_snapshot(screen):
+    """(score, lives, level, digest of every bubble's x, y, dx, dy)."""
+    h = hashlib.blake2b(digest_size=8)
+    for b in screen.bubble_widgets:
+        # + 0.0 folds -0.0 (numpy physics) into 0.0 (scalar physics)
+        h.update(struct.pack("<4d", b.x + 0.0, b.y + 0.0, b.dx + 0.0, b.dy + 0.0))
+    return [int(screen.score), int(screen.lives), int(screen.level), h.hexdigest()]
+
+
+class SessionRecorder:
+    """Writes everything needed to replay one GameScreen session.
+
+    The log is gzipped JSON lines: a header (RNG seed, dataset version,
+    physics / selection / renderer) followed by one [ms, kind, *args] list
+    per world tick, spawn, bubble touch, overlay action and screen resize.
+    Every `checkpoint_every` ticks a snapshot (score, lives, level and a
+    digest of all bubble trajectories) is written so the replayer can
+    point at the first tick that diverges.
+    """
+    checkpoint_every = 60
+
+    def __init__(self, path, screen):
+        self.path = path
+        self.file = gzip.open(path, "wt", encoding="utf-8")
+        self.t0 = perf_counter()
+        self.ticks = 0
+        self._write({
+            "format": SESSION_FORMAT,
+            "version": SESSION_VERSION,
+            "seed": screen.seed,
+            "dataset": getattr(screen.food_dataset, "version", None),
+            "physics": screen.physics.name,
+            "sim_hz": screen.sim_hz,
+            "selection": screen.selector.name,
+            "renderer": screen.renderer,
+            "density": Metrics.density,
+            "created": time.time(),
+        })
+
+    def _write(self, item):
+        self.file.write(json.dumps(item, separators=(",", ":")) + "\n")
+
+    def event(self, kind, *args):
+        self._write([round((perf_counter() - self.t0) * 1000, 1), kind, *args])
+
+    def tick(self, screen, dt):
+        self.event("tick", dt)
+        self.ticks += 1
+        if self.ticks % self.checkpoint_every == 0:
+            self.event("check", *session_snapshot(screen))
+
+    def close(self, screen=None):
+        if self.file is None:
+            return
+        if screen is not None:
+            self.event("end", *session_snapshot(screen))
+        self.file.close()
+        self.file = None
+
+
+def read_session(path):
+    """Return (header, events) of a log written by SessionRecorder."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        if header.get("format") != SESSION_FORMAT:
+            raise ValueError(f"{path} is not a session log")
+        if header.get("version") != SESSION_VERSION:
+            raise ValueError(f"unsupported session log version {header.get('version')}")
+        events = [json.loads(line) for line in f if line.strip()]
+    return header, events
@@ -0,0 +1,149 @@
+"""High score and session stats, saved on a worker thread."""
+import json
+import os
+import threading
+import time
+
+from kivy.clock import Clock
+
+from puharam.files import atomic_write
+
+# ----------------------------
+# High score and session stats
+# ----------------------------
+class ScoreStore:
+    """High score and session stats kept in a small JSON file.
+
+    Reading and writing happen on a worker thread. update() only changes
+    the in-memory copy; the worker coalesces changes and writes at most once
+    per `coalesce` seconds, or right away after flush(). Writes go through
+    atomic_write, so a crash mid-write never leaves a broken file.
+    """
+
+    DEFAULTS = {
+        "highscore": 0,
+        "best_level": 1,
+        "games_played": 0,
+        "total_correct": 0,
+        "total_wrong": 0,
+        "total_seconds": 0,
+        "last_session": None,
+    }
+
+    def __init__(self, path, seed_path=None, coalesce=2.0):
+        self.path = path
+        self.seed_path = seed_path
+        self.coalesce = coalesce
+        self.data = dict(self.DEFAULTS)
+        self.loaded = False
+        self.dirty = False
+        self.urgent = False
+        self.closed = False
+        self.cond = threading.Condition()
+        self.on_loaded = None
+        self.thread = threading.Thread(target=self._run, name="score-store", daemon=True)
+
+    def start(self, on_loaded=None):
+        # on_loaded(store) runs on the UI thread once the file has been read
+        self.on_loaded = on_loaded
+        self.thread.start()
+
+    def get(self, key, default=None):
+        with self.cond:
+            return self.data.get(key, default)
+
+    def update(self, **fields):
+        with self.cond:
+            self.data.update(fields)
+            self.dirty = True
+            self.cond.notify()
+
+    def report_score(self, score, level):
+        with self.cond:
+            changed = False
+            if score > self.data["highscore"]:
+                self.data["highscore"] = score
+                changed = True
+            if level > self.data["best_level"]:
+                self.data["best_level"] = level
+                changed = True
+            if changed:
+                self.dirty = True
+                self.cond.notify()
+
+    def end_session(self, score, level, correct, wrong, seconds):
+        with self.cond:
+            d = self.data
+            d["games_played"] += 1
+            d["total_correct"] += correct
+            d["total_wrong"] += wrong
+            d["total_seconds"] += int(seconds)
+            d["highscore"] = max(d["highscore"], score)
+            d["best_level"] = max(d["best_level"], level)
+            d["last_session"] = {"score": score, "level": level, "correct": correct,
+                                 "wrong": wrong, "seconds": int(seconds),
+                                 "ended": int(time.time())}
+            self.dirty = True
+            self.cond.notify()
+
+    def flush(self):
+        # end of a game: skip the coalesce delay
+        with self.cond:
+            self.urgent = True
+            self.cond.notify()
+
+    def close(self, timeout=2.0):
+        # App.on_stop: let the worker write pending stats, then join it
+        with self.cond:
+            self.closed = True
+            self.cond.notify()
+        if self.thread.is_alive():
+            self.thread.join(timeout)
+
+    def _load(self):
+        for path in (self.path, self.seed_path):
+            if not path or not os.path.exists(path):
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    stored = json.load(f)
+                with self.cond:
+                    for key, value in stored.items():
+                        # keep anything updated before loading finished
+                        if key in self.DEFAULTS and isinstance(self.data[key], int):
+                            self.data[key] = max(self.data[key], value)
+                        else:
+                            self.data[key] = value
+                break
+            except Exception as e:
+                print("Failed loading scores from", path, e)
+        self.loaded = True
+        if self.on_loaded:
+            Clock.schedule_once(lambda dt: self.on_loaded(self), 0)
+
+    def _write(self, payload):
+        try:
+            atomic_write(self.path, payload)
+        except Exception as e:
+            print("Failed saving scores:", e)
+
+    def _run(self):
+        self._load()
+        while True:
+            with self.cond:
+                while not self.dirty and not self.closed:
+                    self.urgent = False
+                    self.cond.wait()
+                # coalesce further updates unless a flush or close comes in
+                deadline = time.monotonic() + self.coalesce
+                while self.dirty and not self.urgent and not self.closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.cond.wait(remaining)
+                if not self.dirty:
+                    return  # closed with nothing left to write
+                payload = json.dumps(self.data, indent=2)
+                self.dirty = False
+                self.urgent = False
+            self._write(payload)
@@ -0,0 +1,195 @@
+"""Strategies that pick the next food to spawn."""
+import heapq
+import os
+import random
+from array import array
+
+from puharam.dataset import CompiledFoodDataset
+
+# ----------------------------
+# Item selection strategies
+# ----------------------------
+# Each strategy picks a record index into the food dataset and may learn
+# from record(index, correct). All picks are O(1) or O(log n).
+class ShuffleBag:
+    """Every item once per round, in random order, never the same item twice in a row."""
+    name = "shuffle"
+
+    def __init__(self, dataset, rng=random):
+        self.n = len(dataset)
+        self.rng = rng
+        self.order = None
+        self.left = 0
+        self.last = None
+
+    def pick(self):
+        if self.n == 0:
+            return None
+        if self.left == 0:
+            if self.order is None:
+                self.order = array("I", range(self.n))
+            self.left = self.n
+        # one step of Fisher-Yates per pick (no O(n) reshuffle)
+        j = self.rng.randrange(self.left)
+        if self.n > 1 and self.left == self.n:
+            while self.order[j] == self.last:
+                j = self.rng.randrange(self.left)
+        self.left -= 1
+        order = self.order
+        order[j], order[self.left] = order[self.left], order[j]
+        self.last = order[self.left]
+        return self.last
+
+    def record(self, index, correct):
+        pass
+
+
+class AliasTable:
+    """Vose alias table: O(k) build, O(1) weighted pick among k outcomes."""
+
+    def __init__(self, weights, rng=random):
+        self.rng = rng
+        k = len(weights)
+        total = float(sum(weights))
+        scaled = [w * k / total for w in weights]
+        self.prob = [0.0] * k
+        self.alias = list(range(k))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        for i in small + large:
+            self.prob[i] = 1.0
+
+    def pick(self):
+        i = self.rng.randrange(len(self.prob))
+        return i if self.rng.random() < self.prob[i] else self.alias[i]
+
+
+class WeightedSampler:
+    """Weighted pick of a category (or status) group, then a uniform item in it.
+
+    weights maps group name -> weight; groups without a weight get 1, so by
+    default every category shows up equally often however big it is.
+
+    by is "category" or "status". Plain (name, status, notes) lists from
+    load_food_dataset carry no category, so they only support
+    by="status"; anything else raises ValueError.
+    """
+    name = "weighted"
+
+    def __init__(self, dataset, rng=random, by="category", weights=None):
+        self.rng = rng
+        self.groups = self._groups(dataset, by)
+        self.names = [g for g in self.groups if len(self.groups[g])]
+        weights = weights or {}
+        self.table = AliasTable([weights.get(g, 1.0) for g in self.names], rng) if self.names else None
+        self.last = None
+
+    @staticmethod
+    def _groups(dataset, by):
+        # compiled datasets carry the indexes; plain lists are grouped once
+        if by not in ("category", "status"):
+            raise ValueError(f"cannot group foods by {by!r} (category or status)")
+        if isinstance(dataset, CompiledFoodDataset):
+            if by == "status":
+                return {s: dataset.ids_by_status(s) for s in dataset.statuses}
+            return {c: dataset.ids_by_category(c) for c in dataset.categories}
+        if by != "status":
+            raise ValueError(f"a plain food list has no {by}; group it by status")
+        groups = {}
+        for i, (name, status, notes) in enumerate(dataset):
+            groups.setdefault(status, []).append(i)
+        return groups
+
+    def pick(self):
+        if self.table is None:
+            return None
+        for _ in range(8):
+            ids = self.groups[self.names[self.table.pick()]]
+            index = ids[self.rng.randrange(len(ids))]
+            if index != self.last:
+                break
+        self.last = index
+        return index
+
+    def record(self, index, correct):
+        pass
+
+
+class SpacedRepetition:
+    """Brings back items the player got wrong, Leitner style.
+
+    A wrong answer puts the item in box 0 (due again after a few spawns);
+    each later correct answer moves it up a box with a longer interval
+    until it graduates. Due items sit in a heap keyed by spawn count; when
+    nothing is due, new items come from a ShuffleBag.
+    """
+    name = "srs"
+    intervals = (3, 8, 20, 50)  # spawns until the next review, per box
+
+    def __init__(self, dataset, rng=random):
+        self.bag = ShuffleBag(dataset, rng)
+        self.heap = []
+        self.due = {}
+        self.box = {}
+        self.tick = 0
+        self.seq = 0
+        self.last = None
+
+    def pick(self):
+        self.tick += 1
+        heap = self.heap
+        # drop entries that were rescheduled since they were pushed
+        while heap and self.due.get(heap[0][2]) != heap[0][0]:
+            heapq.heappop(heap)
+        if heap and heap[0][0] <= self.tick and heap[0][2] != self.last:
+            _, _, index = heapq.heappop(heap)
+            del self.due[index]
+        else:
+            index = self.bag.pick()
+            if index == self.last and self.bag.n > 1:
+                index = self.bag.pick()
+        self.last = index
+        return index
+
+    def record(self, index, correct):
+        if index is None:
+            return
+        if correct:
+            if index not in self.box:
+                return  # never missed, nothing to review
+            box = self.box[index] + 1
+            if box >= len(self.intervals):
+                del self.box[index]
+                self.due.pop(index, None)
+                return
+        else:
+            box = 0
+        self.box[index] = box
+        due = self.tick + self.intervals[box]
+        self.due[index] = due
+        self.seq += 1
+        heapq.heappush(self.heap, (due, self.seq, index))
+
+
+SELECTORS = {cls.name: cls for cls in (ShuffleBag, WeightedSampler, SpacedRepetition)}
+
+
+def create_selector(dataset, name=None, rng=random):
+    """Pick a selection strategy by name (default: $PUHARAM_SELECTION or srs)."""
+    name = (name or os.environ.get("PUHARAM_SELECTION", "srs")).lower()
+    cls = SELECTORS.get(name)
+    if cls is None:
+        print("Unknown selection strategy", name, "- using srs")
+        cls = SpacedRepetition
+    try:
+        return cls(dataset, rng=rng)
+    except ValueError as e:
+        # e.g. weighted by category on the plain list (compiled dataset failed to open)
+        print("Selection strategy", name, "unavailable:", e, "- using srs")
+        return SpacedRepetition(dataset, rng=rng)
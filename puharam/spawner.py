@@ -0,0 +1,93 @@
+"""Spawn timing for GameScreen."""
+from kivy.clock import Clock
+
+# ----------------------------
+# Spawn scheduler
+# ----------------------------
+class SpawnScheduler:
+    """Drives GameScreen.spawn_bubble_step.
+
+    Keeps the level based difficulty curve, but never lets more than
+    max_live bubbles exist at once and stretches the interval while the
+    measured frame time is over budget. It is started and stopped by the
+    screen's game loop state instead of polling.
+    """
+
+    def __init__(self, screen, max_live=24, frame_budget=1 / 60.):
+        self.screen = screen
+        self.max_live = max_live
+        self.frame_budget = frame_budget
+        self.frame_time = frame_budget  # smoothed (EMA) frame time
+        self.event = None
+        self.next_at = None
+        self.remaining = None
+        self.running = False
+        self.waiting_for_room = False
+
+    def base_interval(self, level):
+        return self.screen.game.difficulty.spawn_interval(level)
+
+    def interval(self):
+        interval = self.base_interval(self.screen.level)
+        # over budget: spawn proportionally slower (up to 4x)
+        load = self.frame_time / self.frame_budget
+        if load > 1.1:
+            interval *= min(load, 4.0)
+        return interval
+
+    def observe_frame(self, dt):
+        self.frame_time += (dt - self.frame_time) * 0.1
+
+    def has_room(self):
+        return len(self.screen.bubble_widgets) < self.max_live
+
+    def start(self, delay=None):
+        self.running = True
+        if delay is None:
+            delay = self.remaining if self.remaining is not None else self.interval()
+        self.remaining = None
+        self._schedule(delay)
+
+    def stop(self):
+        if self.event is not None:
+            self.event.cancel()
+            self.event = None
+            self.remaining = max(0, self.next_at - Clock.get_time())
+        self.running = False
+        self.waiting_for_room = False
+
+    def reset(self):
+        self.stop()
+        self.remaining = None
+        self.frame_time = self.frame_budget
+
+    def schedule_first(self, delay=0):
+        # the next start() fires after `delay` instead of a full interval
+        self.remaining = delay
+
+    def _schedule(self, delay):
+        if self.event is not None:
+            self.event.cancel()
+            self.event = None
+        if not self.running:
+            return
+        if not self.has_room():
+            self.waiting_for_room = True
+            return
+        self.waiting_for_room = False
+        self.next_at = Clock.get_time() + delay
+        self.event = Clock.schedule_once(self._fire, delay)
+
+    def _fire(self, dt):
+        self.event = None
+        if not self.running:
+            return
+        if not self.has_room():
+            self.waiting_for_room = True
+            return
+        self.screen.spawn_bubble_step()
+        self._schedule(self.interval())
+
+    def on_bubble_removed(self):
+        if self.running and self.waiting_for_room and self.has_room():
+            self._schedule(self.interval())
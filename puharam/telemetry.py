@@ -0,0 +1,143 @@
+"""Buffered gameplay telemetry stored in SQLite."""
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+
+# ----------------------------
+# Gameplay telemetry (SQLite)
+# ----------------------------
+class Telemetry:
+    """Gameplay events (spawn, drag, drop, correct, wrong, popup dismiss) in SQLite.
+
+    log() only appends a tuple to an in-memory ring buffer (a bounded deque,
+    no lock, no I/O); a worker thread drains it every `flush_interval`
+    seconds, or sooner once `batch_size` events are waiting, and inserts
+    the batch in one transaction. When the buffer is full the oldest
+    events are dropped (and counted) instead of stalling the game.
+
+    `ms` is the time since the bubble spawned, except for popup_dismiss
+    where it is how long the education card was open.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS events ("
+        " id INTEGER PRIMARY KEY, session INTEGER, ts REAL, kind TEXT,"
+        " food TEXT, category TEXT, ms REAL)",
+        "CREATE INDEX IF NOT EXISTS events_food_kind ON events (food, kind)",
+    )
+    INSERT = "INSERT INTO events (session, ts, kind, food, category, ms) VALUES (?, ?, ?, ?, ?, ?)"
+
+    def __init__(self, path, capacity=4096, batch_size=256, flush_interval=5.0):
+        self.path = path
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.buffer = deque(maxlen=capacity)
+        self.logged = 0
+        self.dropped = 0
+        self.written = 0
+        self.closed = False
+        self.wake = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="telemetry", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def log(self, kind, food=None, category=None, ms=None, session=None):
+        buffer = self.buffer
+        if len(buffer) == self.capacity:
+            self.dropped += 1
+        buffer.append((session, time.time(), kind, food, category, ms))
+        self.logged += 1
+        if len(buffer) >= self.batch_size:
+            self.wake.set()
+
+    def flush(self):
+        # wake the worker to drain the buffer before the next interval
+        self.wake.set()
+
+    def close(self, timeout=2.0):
+        # one last drain; events logged after this are not written
+        self.closed = True
+        self.wake.set()
+        if self.thread.is_alive():
+            self.thread.join(timeout)
+
+    def stats(self):
+        return {
+            "logged": self.logged,
+            "written": self.written,
+            "dropped": self.dropped,
+            "buffered": len(self.buffer),
+        }
+
+    def _connect(self):
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        for sql in self.SCHEMA:
+            conn.execute(sql)
+        conn.commit()
+        return conn
+
+    def _drain(self, conn):
+        batch = []
+        pop = self.buffer.popleft
+        try:
+            while True:
+                batch.append(pop())
+        except IndexError:
+            pass
+        if batch:
+            with conn:
+                conn.executemany(self.INSERT, batch)
+            self.written += len(batch)
+
+    def _run(self):
+        try:
+            conn = self._connect()
+        except Exception as e:
+            print("Telemetry disabled:", e)
+            return
+        while True:
+            closed = self.closed
+            if not closed:
+                self.wake.wait(self.flush_interval)
+                self.wake.clear()
+            try:
+                self._drain(conn)
+            except Exception as e:
+                print("Failed writing telemetry:", e)
+            if closed:
+                break  # one last drain after close() caught everything logged before it
+        conn.close()
+
+    # ----------------------------
+    # queries (any thread; they only see what has been written)
+    # ----------------------------
+    def query(self, sql, args=()):
+        conn = sqlite3.connect(self.path)
+        try:
+            return conn.execute(sql, args).fetchall()
+        finally:
+            conn.close()
+
+    def error_rates(self, min_attempts=1, limit=None):
+        """[(food, category, attempts, wrong, error rate)], most missed first."""
+        return self.query(
+            "SELECT food, category, COUNT(*) AS attempts, SUM(kind = 'wrong'),"
+            " AVG(kind = 'wrong') AS rate FROM events WHERE kind IN ('correct', 'wrong')"
+            " GROUP BY food HAVING attempts >= ? ORDER BY rate DESC, attempts DESC LIMIT ?",
+            (min_attempts, -1 if limit is None else limit))
+
+    def decision_times(self, min_attempts=1, limit=None):
+        """[(food, decisions, mean ms, max ms)] from spawn to drop, slowest first."""
+        return self.query(
+            "SELECT food, COUNT(*) AS n, AVG(ms) AS mean, MAX(ms) FROM events"
+            " WHERE kind IN ('correct', 'wrong') AND ms IS NOT NULL"
+            " GROUP BY food HAVING n >= ? ORDER BY mean DESC LIMIT ?",
+            (min_attempts, -1 if limit is None else limit))
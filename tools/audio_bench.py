@@ -0,0 +1,164 @@
+"""SFX trigger latency and resident audio memory, old loading vs AudioManager.
+
+Each mode runs in a fresh interpreter (dummy SDL audio driver) so the
+resident memory numbers do not mix:
+
+* legacy:  one SoundLoader instance per effect, BGM decoded into memory
+           (what GameAssets did before puharam.audio)
+* manager: puharam.audio.AudioManager, SFX voice pools + streamed BGM
+
+Both then fire a burst of "correct"/"wrong" triggers faster than the
+effects last and report the time spent in play(), how many triggers cut
+off a sound that was still playing, and the load time / RSS growth.
+
+    python tools/audio_bench.py
+    python tools/audio_bench.py --triggers 80 --interval 0.03 --json audio.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from time import perf_counter, sleep
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+sys.path.insert(0, ROOT)
+CWD = os.getcwd()  # where the tool was started; --json is relative to it
+os.chdir(ROOT)  # assets are loaded with relative paths
+
+MODES = ("legacy", "manager")
+
+
+def rss_kb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def percentile(samples, q):
+    samples = sorted(samples)
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+
+def load_legacy():
+    from kivy.core.audio import SoundLoader
+    from puharam.assets import BGM_PATH, CORRECT_SFX_PATH, WRONG_SFX_PATH
+    bgm = SoundLoader.load(BGM_PATH)
+    bgm.loop = True
+    bgm.volume = 0.4
+    sounds = {"correct": SoundLoader.load(CORRECT_SFX_PATH),
+              "wrong": SoundLoader.load(WRONG_SFX_PATH)}
+
+    def trigger(name):
+        sound = sounds[name]
+        cut = sound.state == "play"
+        sound.play()  # a playing sound is restarted from the top
+        return cut
+    return bgm, trigger
+
+
+def load_manager():
+    from puharam.assets import GameAssets, create_audio, load_audio_step
+    audio = create_audio()
+    for step in GameAssets()._sounds:
+        load_audio_step(audio, step)
+
+    def trigger(name):
+        steals = audio.steals
+        audio.play(name)
+        return audio.steals != steals
+    return audio.bgm, trigger
+
+
+def run_mode(mode, triggers, interval):
+    # the provider, the mixer and the modules are not part of the comparison
+    from kivy.clock import Clock
+    from kivy.core.audio import SoundLoader
+    import puharam.audio  # noqa: F401
+    from puharam.assets import CORRECT_SFX_PATH
+    warm = SoundLoader.load(CORRECT_SFX_PATH)
+    warm.unload()
+
+    base = rss_kb()
+    t0 = perf_counter()
+    bgm, trigger = load_legacy() if mode == "legacy" else load_manager()
+    load_ms = (perf_counter() - t0) * 1000.
+    mem_kb = rss_kb() - base
+
+    bgm.play()
+    latency = []
+    cuts = 0
+    for i in range(triggers):
+        t = perf_counter()
+        cuts += trigger("correct" if i % 3 else "wrong")
+        latency.append((perf_counter() - t) * 1e6)
+        # let the sounds' Clock checks notice which voices finished
+        end = perf_counter() + interval
+        while perf_counter() < end:
+            Clock.tick()
+            sleep(0.002)
+    bgm.stop()
+    return {
+        "mode": mode,
+        "load_ms": load_ms,
+        "audio_rss_kb": mem_kb,
+        "bgm_loader": type(bgm).__name__,
+        "triggers": triggers,
+        "cut_off": cuts,
+        "trigger_us_p50": percentile(latency, 0.5),
+        "trigger_us_p99": percentile(latency, 0.99),
+        "trigger_us_max": max(latency),
+    }
+
+
+def run(triggers=60, interval=0.05):
+    results = []
+    for mode in MODES:
+        cmd = [sys.executable, os.path.abspath(__file__), "--child", mode,
+               "--triggers", str(triggers), "--interval", str(interval)]
+        proc = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise RuntimeError(proc.stderr[-2000:])
+        results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--triggers", type=int, default=60)
+    parser.add_argument("--interval", type=float, default=0.05,
+                        help="seconds between triggers (the effects last ~0.25 s)")
+    parser.add_argument("--json", type=lambda path: os.path.join(CWD, os.path.expanduser(path)),
+                        help="write the result to this file")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_mode(args.child, args.triggers, args.interval)))
+        return 0
+
+    results = run(args.triggers, args.interval)
+    print(f"{'mode':8} {'load ms':>8} {'audio RSS':>10} {'bgm loader':>11} "
+          f"{'cut off':>8} {'trig p50':>9} {'trig p99':>9}")
+    for r in results:
+        print(f"{r['mode']:8} {r['load_ms']:8.1f} {r['audio_rss_kb']:7d} KB {r['bgm_loader']:>11} "
+              f"{r['cut_off']:4d}/{r['triggers']:<3d} {r['trigger_us_p50']:6.1f} us "
+              f"{r['trigger_us_p99']:6.1f} us")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
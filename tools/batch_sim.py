@@ -0,0 +1,168 @@
+"""Simulate many scripted sessions in parallel and summarise them.
+
+Runs puharam.core.World (no Kivy, no window) with a ScriptedPlayer for
+--sessions seeds across a process pool and prints score, level and
+session-length statistics, so the difficulty curve can be tuned without
+playing the game. Results depend only on the seeds, not on --workers.
+
+    python tools/batch_sim.py --sessions 2000
+    python tools/batch_sim.py --set level_points=40 --set interval_step=0.25
+    python tools/batch_sim.py --accuracy 0.7 --reaction 2.5 --json sim.json
+    python tools/batch_sim.py --sessions 200 --workers 1      # serial
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from puharam.core import Difficulty, ScriptedPlayer, World  # noqa: E402
+from puharam.dataset import FOOD_JSON, load_food_dataset  # noqa: E402
+
+DATASET = os.path.join(ROOT, FOOD_JSON)  # FOOD_JSON is relative to the repo root
+
+METRICS = ("score", "level", "duration_s", "correct", "wrong", "spawns", "max_live")
+
+_dataset = None  # per worker process (see _init_worker)
+
+
+def _init_worker(json_path):
+    global _dataset
+    _dataset = load_food_dataset(json_path)
+
+
+def simulate(seed, config):
+    world = World(_dataset, seed=seed, size=config["size"], sim_hz=config["sim_hz"],
+                  difficulty=Difficulty(**config["difficulty"]),
+                  selection=config["selection"], physics=config["physics"])
+    player = ScriptedPlayer(random.Random(seed * 7919 + 1), **config["player"])
+    result = world.run(player, config["max_time"])
+    result["seed"] = seed
+    return result
+
+
+def simulate_chunk(seeds, config):
+    return [simulate(seed, config) for seed in seeds]
+
+
+def run(sessions, config, workers=None, first_seed=0, json_path=DATASET):
+    seeds = list(range(first_seed, first_seed + sessions))
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker(json_path)
+        return simulate_chunk(seeds, config)
+    # a few chunks per worker: low pickling overhead, still balanced
+    size = max(1, sessions // (workers * 4))
+    chunks = [seeds[i:i + size] for i in range(0, sessions, size)]
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(json_path,)) as pool:
+        results = []
+        for part in pool.map(simulate_chunk, chunks, [config] * len(chunks)):
+            results.extend(part)
+    return results
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def summarize(results):
+    summary = {"sessions": len(results),
+               "game_over_rate": sum(r["game_over"] for r in results) / float(len(results))}
+    for name in METRICS:
+        values = [r[name] for r in results]
+        summary[name] = {"mean": statistics.fmean(values), "p10": percentile(values, 0.1),
+                         "p50": percentile(values, 0.5), "p90": percentile(values, 0.9),
+                         "max": max(values)}
+    # how many sessions reach each level, and when (median seconds)
+    levels = {}
+    for r in results:
+        for level, t in r["level_times"].items():
+            levels.setdefault(int(level), []).append(t)
+    summary["levels"] = {level: {"reached": len(times) / float(len(results)),
+                                 "median_s": statistics.median(times)}
+                         for level, times in sorted(levels.items())}
+    return summary
+
+
+def parse_setting(text):
+    key, _, value = text.partition("=")
+    try:
+        value = json.loads(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"bad value in {text!r}")
+    return key.strip(), value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None, help="default: one per CPU")
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--set", dest="settings", type=parse_setting, action="append", default=[],
+                        metavar="KEY=VALUE", help="difficulty override, e.g. level_points=40 "
+                        "(keys: %s)" % ", ".join(Difficulty().settings()))
+    parser.add_argument("--accuracy", type=float, default=0.85, help="player: chance of a right drop")
+    parser.add_argument("--reaction", type=float, default=2.0, help="player: mean seconds per decision")
+    parser.add_argument("--read", type=float, default=2.5, help="player: seconds on the education card")
+    parser.add_argument("--max-time", type=float, default=600.0, help="session cap in seconds")
+    parser.add_argument("--size", default="720x1280")
+    parser.add_argument("--sim-hz", type=float, default=60.0)
+    parser.add_argument("--selection", default="srs")
+    parser.add_argument("--physics", default="scalar")
+    parser.add_argument("--json", help="write the config, summary and per-session results here")
+    args = parser.parse_args(argv)
+
+    try:
+        difficulty = Difficulty(**dict(args.settings))
+    except ValueError as e:
+        parser.error(str(e))
+    w, h = (int(v) for v in args.size.lower().split("x"))
+    config = {
+        "difficulty": difficulty.settings(),
+        "player": {"accuracy": args.accuracy, "reaction_s": args.reaction, "read_s": args.read},
+        "size": (w, h),
+        "sim_hz": args.sim_hz,
+        "selection": args.selection,
+        "physics": args.physics,
+        "max_time": args.max_time,
+    }
+
+    if not load_food_dataset(DATASET):
+        # an empty dataset simulates nothing and would report all-zero stats
+        print("No foods in", DATASET)
+        return 1
+
+    t0 = perf_counter()
+    results = run(args.sessions, config, args.workers, args.first_seed)
+    elapsed = perf_counter() - t0
+    summary = summarize(results)
+
+    print(f"{len(results)} sessions in {elapsed:.1f} s ({len(results) / elapsed:.0f}/s "
+          f"on {args.workers or os.cpu_count() or 1} processes)")
+    print("difficulty:", ", ".join(f"{k}={v}" for k, v in config["difficulty"].items()))
+    print(f"game over in {summary['game_over_rate'] * 100:.0f}% of sessions "
+          f"(cap {args.max_time:g} s)")
+    print(f"{'':12} {'mean':>8} {'p10':>8} {'p50':>8} {'p90':>8} {'max':>8}")
+    for name in METRICS:
+        s = summary[name]
+        print(f"{name:12} {s['mean']:8.1f} {s['p10']:8.1f} {s['p50']:8.1f} {s['p90']:8.1f} "
+              f"{s['max']:8.1f}")
+    print("level  reached  median time")
+    for level, s in summary["levels"].items():
+        print(f"{level:5d}  {s['reached'] * 100:6.1f}%  {s['median_s']:8.1f} s")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"config": config, "summary": summary, "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,410 @@
+"""Headless benchmark for bubble simulation and game logic.
+
+Runs GameScreen without a real window (mock GL backend, offscreen SDL
+video driver), spawns bubbles through spawn_bubble_step, steps the world,
+sends synthetic drags/drops through the touch handlers, opens and closes
+the pause, education and game-over overlays and reports frames/sec,
+per-frame latency percentiles, popup latency and peak memory.
+
+    python tools/bench.py --bubbles 300 --frames 600
+    python tools/bench.py --save-baseline bench_baseline.json
+    python tools/bench.py --baseline bench_baseline.json --tolerance 0.25
+    python tools/bench.py --check-physics
+    python tools/bench.py --check-timestep
+    python tools/bench.py --check-governor
+    PUHARAM_QUALITY=low python tools/bench.py      # benchmark one quality tier
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import tracemalloc
+from time import perf_counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+os.environ.setdefault("KIVY_GL_BACKEND", "mock")
+os.environ.setdefault("SDL_VIDEODRIVER", "offscreen")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+sys.path.insert(0, ROOT)
+CWD = os.getcwd()  # where the tool was started; CLI paths are relative to it
+os.chdir(ROOT)  # assets are loaded with relative paths
+
+from kivy.animation import Animation  # noqa: E402
+from kivy.core.window import Window  # noqa: E402,F401  (creates the headless window)
+from kivy.input.motionevent import MotionEvent  # noqa: E402
+from kivy.uix.button import Button  # noqa: E402
+
+from puharam.game import GameScreen  # noqa: E402
+from puharam.perf import PerfMonitor  # noqa: E402
+from puharam.physics import create_physics, load_numpy  # noqa: E402
+from puharam.telemetry import Telemetry  # noqa: E402
+
+SCREEN_SIZE = (720, 1280)
+
+# metric name -> True if higher is better
+METRICS = {
+    "frames_per_sec": True,
+    "frame_ms_p50": False,
+    "frame_ms_p95": False,
+    "frame_ms_p99": False,
+    "spawn_ms_per_bubble": False,
+    "drag_ms_p50": False,
+    "drag_ms_p95": False,
+    "popup_ms_p50": False,
+    "popup_ms_p95": False,
+    "peak_mem_kb": False,
+}
+
+
+class BenchTouch(MotionEvent):
+    """Synthetic touch in window coordinates."""
+
+    def __init__(self, touch_id, x, y):
+        super().__init__("bench", touch_id, (x, y), is_touch=True)
+
+    def depack(self, args):
+        self.sx, self.sy = args
+        self.px, self.py = self.ox, self.oy = args
+        self.x, self.y = args
+        self.pos = args
+        super().depack(args)
+
+    def move_to(self, x, y):
+        self.px, self.py = self.x, self.y
+        self.x, self.y = x, y
+        self.pos = (x, y)
+
+
+def cli_path(path):
+    # argparse type for file arguments (also used by tools/replay.py)
+    return os.path.join(CWD, os.path.expanduser(path))
+
+
+def percentile(values, p):
+    return PerfMonitor.percentile(values, p)
+
+
+def layout(screen, size=SCREEN_SIZE):
+    screen.size = size
+    for w in screen.walk():
+        if hasattr(w, "do_layout"):
+            w.do_layout()
+
+
+def make_screen(physics=None, renderer=None, seed=None, telemetry=None, governor=False):
+    screen = GameScreen(name="game", renderer=renderer, seed=seed, telemetry=telemetry,
+                        governor=governor)
+    screen.physics = create_physics(physics)
+    # running, but with no background spawns or ticks; the benchmark drives everything
+    screen.state = "running"
+    screen.spawner.stop()
+    screen.world_event.cancel()
+    layout(screen)
+    return screen
+
+
+def close_popups(screen):
+    # press the "Lanjut" button of any open education card
+    for w in list(screen.walk(restrict=True)):
+        if isinstance(w, Button) and w.text == "Lanjut":
+            w.dispatch("on_release")
+
+
+def drag(screen, bubble, target, touch_id, steps=6):
+    touch = BenchTouch(touch_id, bubble.center_x, bubble.center_y)
+    screen.on_touch_down(touch)
+    x0, y0 = bubble.center
+    x1, y1 = target.center
+    for i in range(1, steps + 1):
+        touch.move_to(x0 + (x1 - x0) * i / steps, y0 + (y1 - y0) * i / steps)
+        screen.on_touch_move(touch)
+    screen.on_touch_up(touch)
+
+
+def scenario(bubbles, frames, drags, physics, seed, popups=30, renderer=None, telemetry=None):
+    screen = make_screen(physics, renderer, seed, telemetry)
+    screen.spawner.max_live = bubbles
+    screen.game.lives = 10 ** 6  # wrong drops must not end the run
+
+    t0 = perf_counter()
+    for _ in range(bubbles):
+        screen.spawn_bubble_step()
+    spawn_time = perf_counter() - t0
+
+    frame_times = []
+    for _ in range(frames):
+        t = perf_counter()
+        screen.update_world(1 / 60.)
+        frame_times.append(perf_counter() - t)
+
+    drag_times = []
+    for i in range(drags):
+        if not screen.bubble_widgets:
+            break
+        bubble = screen.bubble_widgets[-1]
+        # alternate correct and wrong buckets
+        right = screen.bucket_halal if bubble.category == "HALAL" else screen.bucket_haram
+        wrong = screen.bucket_haram if right is screen.bucket_halal else screen.bucket_halal
+        t = perf_counter()
+        drag(screen, bubble, right if i % 2 == 0 else wrong, touch_id=i)
+        drag_times.append(perf_counter() - t)
+        close_popups(screen)
+        screen.update_world(1 / 60.)
+
+    # time to show each overlay (pause, education card, game over)
+    popup_times = []
+    for i in range(popups):
+        kind = i % 3
+        if kind == 0:
+            t = perf_counter()
+            screen.pause_game()
+            popup_times.append(perf_counter() - t)
+            screen._resume_from_overlay()
+        elif kind == 1 and screen.bubble_widgets:
+            bubble = screen.bubble_widgets[0]
+            t = perf_counter()
+            screen.show_education_popup(bubble)
+            popup_times.append(perf_counter() - t)
+            close_popups(screen)
+        elif kind == 2:
+            t = perf_counter()
+            screen.game_over_popup()
+            popup_times.append(perf_counter() - t)
+            screen._restart_from_overlay()
+            screen.spawner.stop()
+            screen.game.lives = 10 ** 6
+            for _ in range(5):
+                screen.spawn_bubble_step()
+    return screen, spawn_time, frame_times, drag_times, popup_times
+
+
+def run(bubbles=200, frames=600, drags=50, physics=None, seed=1234, memory=True, popups=30,
+        renderer=None, telemetry=False):
+    store = None
+    if telemetry:
+        # events go to a throwaway database, flushed by the worker as in the game
+        tmp = tempfile.mkdtemp()
+        store = Telemetry(os.path.join(tmp, "telemetry.db"), flush_interval=0.05)
+        store.start()
+    screen, spawn_time, frame_times, drag_times, popup_times = scenario(
+        bubbles, frames, drags, physics, seed, popups, renderer, store)
+    if store is not None:
+        store.close()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    # tracemalloc slows everything down, so peak memory comes from a second pass
+    peak = 0
+    if memory:
+        tracemalloc.start()
+        scenario(bubbles, frames, drags, physics, seed, popups, renderer)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    total = sum(frame_times)
+    return {
+        "bubbles": bubbles,
+        "frames": frames,
+        "drags": len(drag_times),
+        "physics": screen.physics.name,
+        "renderer": screen.renderer,
+        "frames_per_sec": frames / total if total else 0.0,
+        "frame_ms_p50": percentile(frame_times, 50) * 1000,
+        "frame_ms_p95": percentile(frame_times, 95) * 1000,
+        "frame_ms_p99": percentile(frame_times, 99) * 1000,
+        "spawn_ms_per_bubble": spawn_time / bubbles * 1000 if bubbles else 0.0,
+        "drag_ms_p50": percentile(drag_times, 50) * 1000,
+        "drag_ms_p95": percentile(drag_times, 95) * 1000,
+        "popups": len(popup_times),
+        "popup_ms_p50": percentile(popup_times, 50) * 1000,
+        "popup_ms_p95": percentile(popup_times, 95) * 1000,
+        "peak_mem_kb": peak / 1024,
+        "score": screen.score,
+        "pool": screen.bubble_pool.stats(),
+        "telemetry": store.stats() if store is not None else None,
+    }
+
+
+def compare(result, baseline, tolerance):
+    """Return a list of regressions of `result` against `baseline`."""
+    failures = []
+    for name, higher_is_better in METRICS.items():
+        if name not in baseline or name not in result:
+            continue
+        old, new = baseline[name], result[name]
+        if not old:
+            continue
+        if higher_is_better:
+            regressed = new < old * (1 - tolerance)
+        else:
+            regressed = new > old * (1 + tolerance)
+        if regressed:
+            failures.append(f"{name}: {new:.3f} vs baseline {old:.3f}")
+    return failures
+
+
+def check_physics(bubbles=40, frames=900, seed=99):
+    """Run scalar and numpy physics from the same seed; trajectories must match."""
+    if load_numpy() is None:
+        print("numpy not installed, skipping physics check")
+        return True
+    trajectories = []
+    for backend in ("scalar", "numpy"):
+        screen = make_screen(backend, seed=seed)
+        screen.spawner.max_live = bubbles
+        frames_out = []
+        for f in range(frames):
+            if f % 20 == 0 and len(screen.bubble_widgets) < bubbles:
+                screen.game.level = 1 + f // 150
+                screen.spawn_bubble_step()
+            screen.update_world(1 / 60.)
+            frames_out.append([(b.x, b.y, b.dx, b.dy) for b in screen.bubble_widgets])
+        trajectories.append(frames_out)
+    ok = trajectories[0] == trajectories[1]
+    print("physics check:", "scalar and numpy trajectories match" if ok else "MISMATCH")
+    return ok
+
+
+def check_timestep(bubbles=20, seconds=3, seed=5, tolerance=1e-6):
+    """Same session at different frame and simulation rates must end up in the same place."""
+    finals = {}
+    for sim_hz, fps in ((60, 60), (60, 30), (60, 144), (30, 60), (120, 60)):
+        screen = make_screen(seed=seed)
+        screen.set_sim_rate(sim_hz)
+        for _ in range(bubbles):
+            screen.spawn_bubble_step()
+        for _ in range(int(seconds * fps)):
+            screen.update_world(1. / fps)
+        # finish the last partial step so every run covers the same time
+        if screen.sim_accumulator > 1e-9:
+            screen.update_world(screen.sim_step - screen.sim_accumulator)
+        finals[(sim_hz, fps)] = [(b.x, b.y) for b in screen.bubble_widgets]
+    ref = finals[(60, 60)]
+    ok = True
+    for key, got in finals.items():
+        err = max(abs(a - b) for p, q in zip(ref, got) for a, b in zip(p, q))
+        good = err <= tolerance
+        ok = ok and good
+        print(f"sim {key[0]:>3} Hz, {key[1]:>3} fps: max drift {err:.2e} px", "" if good else "MISMATCH")
+    return ok
+
+
+def check_governor(seed=7):
+    """Feed slow and fast frame times; the governor must step down, hold and step back up."""
+    screen = make_screen(seed=seed, governor=True)
+    governor = screen.governor
+    for _ in range(12):
+        screen.spawn_bubble_step()
+    clock = [0.0]
+    timeline = []
+
+    def frames(seconds, fps):
+        for _ in range(int(seconds * fps)):
+            screen.update_world(1. / fps)
+            clock[0] += 1. / fps
+            if not timeline or timeline[-1][1] != governor.current.name:
+                timeline.append((clock[0], governor.current.name))
+
+    ok = True
+
+    def expect(cond, message):
+        nonlocal ok
+        ok = ok and cond
+        print(f"  {'ok' if cond else 'FAIL'}  {message}")
+
+    frames(5, 60)
+    expect(governor.current.name == "high", "60 fps: stays on high")
+    frames(1, 60)
+    frames(0.5, 20)   # a short burst of slow frames
+    frames(1, 60)
+    expect(governor.current.name == "high", "a single slow window does not step down")
+    frames(8, 28)
+    expect(governor.current.name == "minimal", "28 fps: steps down to minimal")
+    expect(screen.sim_hz == 30 and screen.spawner.max_live == 8 and not screen.animations
+           and not screen.interpolate, "minimal: 30 Hz, 8 bubbles, no animations, no blending")
+    expect(all(b.bg_rect.segments == 24 for b in screen.bubble_widgets), "minimal: 24-segment bubbles")
+
+    before = len(Animation._instances)
+    b = screen.bubble_widgets[0]
+    screen.correct(b)
+    expect(len(Animation._instances) == before and b not in screen.bubble_widgets,
+           "minimal: correct() and the card open without animations")
+    close_popups(screen)
+
+    frames(20, 60)
+    expect(governor.current.name == "high" and screen.sim_hz == 60 and screen.animations,
+           "headroom back: steps up to high")
+    up_after = governor.up_after
+    frames(2, 28)
+    expect(governor.up_after == up_after * 2, "falling back right after a step up doubles the wait")
+
+    print("tier changes:", ", ".join(f"{t:.1f}s {name}" for t, name in timeline))
+    print("governor check:", "ok" if ok else "FAILED")
+    return ok
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bubbles", type=int, default=200)
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--drags", type=int, default=50)
+    parser.add_argument("--popups", type=int, default=30)
+    parser.add_argument("--physics", choices=("scalar", "numpy"), default=None)
+    parser.add_argument("--renderer", choices=("widgets", "field"), default=None)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--telemetry", action="store_true",
+                        help="log gameplay telemetry to a temporary SQLite database")
+    parser.add_argument("--json", type=cli_path, help="write the result to this file")
+    parser.add_argument("--save-baseline", type=cli_path, metavar="PATH")
+    parser.add_argument("--baseline", type=cli_path, metavar="PATH",
+                        help="fail if worse than this baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed relative regression (default 0.25)")
+    parser.add_argument("--check-physics", action="store_true",
+                        help="only compare scalar and numpy trajectories")
+    parser.add_argument("--check-timestep", action="store_true",
+                        help="only check that frame and simulation rate do not change gameplay")
+    parser.add_argument("--check-governor", action="store_true",
+                        help="only check that the performance governor steps quality tiers")
+    args = parser.parse_args(argv)
+
+    if args.check_physics:
+        return 0 if check_physics() else 1
+    if args.check_timestep:
+        return 0 if check_timestep() else 1
+    if args.check_governor:
+        return 0 if check_governor() else 1
+
+    result = run(args.bubbles, args.frames, args.drags, args.physics, args.seed,
+                 memory=not args.no_memory, popups=args.popups, renderer=args.renderer,
+                 telemetry=args.telemetry)
+    print(json.dumps(result, indent=2))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print("baseline saved to", args.save_baseline)
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        failures = compare(result, baseline, args.tolerance)
+        if failures:
+            print("REGRESSIONS:")
+            for line in failures:
+                print("  " + line)
+            return 1
+        print("no regressions against", args.baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,117 @@
+"""Pack the game icons into per-density Kivy atlases.
+
+The source icons are 1024x1024 PNGs but are drawn at 44 dp (hearts) and
+90 dp (pause button). This step downscales them once per density bucket
+(to the pixel size at that density) and packs each bucket into
+assets/atlas/icons-<bucket>.atlas, which the game picks at runtime from
+the device density (see puharam.assets.icon_source).
+
+Needs Pillow (build-time only):
+
+    python tools/build_atlas.py            # build and print the comparison
+    python tools/build_atlas.py --report   # only print the comparison
+"""
+import argparse
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUT_DIR = os.path.join(ROOT, "assets", "atlas")
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+sys.path.insert(0, ROOT)
+
+# the same buckets and icon sizes the game uses at runtime
+from puharam.assets import DENSITY_BUCKETS, HEART_SIZE, PAUSE_ICON_SIZE  # noqa: E402
+
+# atlas id -> (source file, on-screen size in dp)
+ICONS = {
+    "heart": (os.path.join(ROOT, "assets", "icons", "heart.png"), HEART_SIZE),
+    "pause": (os.path.join(ROOT, "assets", "icons", "pause_icon2.png"), PAUSE_ICON_SIZE),
+}
+
+PADDING = 2
+
+
+def pow2(n):
+    size = 16
+    while size < n:
+        size *= 2
+    return size
+
+
+def atlas_size(sizes):
+    # smallest power-of-two page that fits all icons side by side
+    need_w = sum(s + 2 * PADDING for s in sizes)
+    need_h = max(sizes) + 2 * PADDING
+    return pow2(need_w), pow2(need_h)
+
+
+def build():
+    from PIL import Image as PILImage
+    from kivy.atlas import Atlas
+
+    os.makedirs(OUT_DIR, exist_ok=True)
+    for bucket, scale in DENSITY_BUCKETS:
+        with tempfile.TemporaryDirectory() as tmp:
+            files, sizes = [], []
+            for name, (src, base) in ICONS.items():
+                px = int(round(base * scale))
+                img = PILImage.open(src).convert("RGBA")
+                img = img.resize((px, px), PILImage.LANCZOS)
+                path = os.path.join(tmp, name + ".png")
+                img.save(path, optimize=True)
+                files.append(path)
+                sizes.append(px)
+            outname = os.path.join(OUT_DIR, "icons-" + bucket)
+            Atlas.create(outname, files, atlas_size(sizes), padding=PADDING)
+            print("wrote", os.path.relpath(outname + ".atlas", ROOT))
+
+
+def measure(path):
+    """(file bytes, decoded RGBA bytes, decode ms) for one PNG."""
+    from PIL import Image as PILImage
+
+    t0 = perf_counter()
+    img = PILImage.open(path)
+    img.load()
+    ms = (perf_counter() - t0) * 1000
+    w, h = img.size
+    return os.path.getsize(path), w * h * 4, ms
+
+
+def report():
+    print("%-28s %10s %12s %10s" % ("file", "on disk", "decoded", "decode"))
+    total_src = [0, 0, 0.0]
+    for name, (src, _) in ICONS.items():
+        size, decoded, ms = measure(src)
+        total_src[0] += size
+        total_src[1] += decoded
+        total_src[2] += ms
+        print("%-28s %9.0fK %11.0fK %8.1fms" % (os.path.relpath(src, ROOT), size / 1024.,
+                                                 decoded / 1024., ms))
+    for bucket, _ in DENSITY_BUCKETS:
+        png = os.path.join(OUT_DIR, "icons-%s-0.png" % bucket)
+        if not os.path.exists(png):
+            continue
+        size, decoded, ms = measure(png)
+        print("%-28s %9.0fK %11.0fK %8.1fms  (%.0fx less memory, %.0fx faster)" % (
+            os.path.relpath(png, ROOT), size / 1024., decoded / 1024., ms,
+            total_src[1] / float(decoded), total_src[2] / max(ms, 1e-3)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--report", action="store_true", help="only print the comparison")
+    args = parser.parse_args(argv)
+    if not args.report:
+        build()
+    report()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
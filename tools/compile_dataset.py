@@ -0,0 +1,44 @@
+"""Compile a food dataset JSON into the binary format read by the game.
+
+The game compiles assets/datasets/food.json on first launch by itself;
+this script is for shipping pre-built files or inspecting large lists.
+
+    python tools/compile_dataset.py assets/datasets/food.json -o food.bin
+"""
+import argparse
+import os
+import sys
+from time import perf_counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+sys.path.insert(0, ROOT)
+
+from puharam import dataset  # noqa: E402
+
+
+def cli(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("json_path", nargs="?", default=os.path.join(ROOT, dataset.FOOD_JSON))
+    parser.add_argument("-o", "--output", help="output file (default: next to the JSON)")
+    args = parser.parse_args(argv)
+
+    t0 = perf_counter()
+    out = dataset.compile_food_dataset(args.json_path, args.output)
+    t1 = perf_counter()
+    ds = dataset.CompiledFoodDataset(out)
+    t2 = perf_counter()
+
+    print(f"wrote {out} ({os.path.getsize(out)} bytes) in {(t1 - t0) * 1000:.1f} ms")
+    print(f"opened in {(t2 - t1) * 1000:.2f} ms: {len(ds)} records, version {ds.version}")
+    for status in ds.statuses:
+        print(f"  status {status}: {len(ds.ids_by_status(status))}")
+    for category in ds.categories:
+        print(f"  category {category}: {len(ds.ids_by_category(category))}")
+    ds.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(cli())
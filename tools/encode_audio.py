@@ -0,0 +1,60 @@
+"""Encode the background music to Ogg Vorbis next to the .wav.
+
+The game streams the BGM and picks bgm_piano_islamic.ogg over the .wav
+when it exists (see puharam.audio.stream_source), so the APK can ship
+the small file. Sound effects stay .wav: they are short, preloaded and
+must start without decoding.
+
+Needs ffmpeg or oggenc on PATH (build-time only):
+
+    python tools/encode_audio.py                # writes assets/sounds/*.ogg
+    python tools/encode_audio.py --quality 3    # vorbis quality 0..10
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCES = [os.path.join(ROOT, "assets", "sounds", "bgm_piano_islamic.wav")]
+
+
+def encoder_command(src, dst, quality):
+    if shutil.which("ffmpeg"):
+        return ["ffmpeg", "-y", "-loglevel", "error", "-i", src,
+                "-c:a", "libvorbis", "-q:a", str(quality), dst]
+    if shutil.which("oggenc"):
+        return ["oggenc", "-Q", "-q", str(quality), "-o", dst, src]
+    return None
+
+
+def encode(src, quality=4):
+    dst = os.path.splitext(src)[0] + ".ogg"
+    cmd = encoder_command(src, dst, quality)
+    if cmd is None:
+        raise RuntimeError("neither ffmpeg nor oggenc found on PATH")
+    subprocess.run(cmd, check=True)
+    return dst
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quality", type=int, default=4)
+    parser.add_argument("sources", nargs="*", default=SOURCES)
+    args = parser.parse_args(argv)
+
+    for src in args.sources:
+        try:
+            dst = encode(src, args.quality)
+        except Exception as e:
+            print("Failed encoding", src, "-", e)
+            return 1
+        before, after = os.path.getsize(src), os.path.getsize(dst)
+        print(f"{os.path.basename(src)} {before / 1024.:.0f} KB -> "
+              f"{os.path.basename(dst)} {after / 1024.:.0f} KB ({after * 100. / before:.0f}%)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""Run the leaderboard client against the local stand-in server, offline first.
+
+1. no server: scores queue up, the client backs off, each score is on disk
+   at once (also in the middle of a long backoff), close() keeps the queue
+2. a new client (next app run) loads the queue; once the server is up every
+   score arrives exactly once, in batches, over one kept-alive connection
+3. leaderboard pages come from the cache within the TTL
+4. a server failing half the requests: retries, still no duplicates
+5. server gone, TTL expired: fetch falls back to the stale page
+6. with a slow server, submit() and fetch() still return at once
+
+Exits 1 on the first failed step.
+
+    python tools/leaderboard_check.py
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from time import perf_counter
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from leaderboard_server import LeaderboardServer  # noqa: E402
+from puharam.leaderboard import LeaderboardClient  # noqa: E402
+
+
+class CheckFailed(Exception):
+    pass
+
+
+def check(ok, message):
+    if not ok:
+        raise CheckFailed(message)
+    print("  ok  ", message)
+
+
+def wait_for(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def free_port():
+    probe = LeaderboardServer(("127.0.0.1", 0))
+    port = probe.server_address[1]
+    probe.server_close()
+    return port
+
+
+def client(url, path, **kwargs):
+    # callbacks run on the worker thread here; the game posts them via Clock
+    options = dict(batch_delay=0.05, backoff=0.05, max_backoff=0.2, timeout=2.0,
+                   post=lambda f: f())
+    options.update(kwargs)
+    c = LeaderboardClient(url, path, **options)
+    c.start()
+    return c
+
+
+def saved_queue(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("queue", [])
+    except (OSError, ValueError):
+        return []
+
+
+def fetch_sync(c, page=0, size=10):
+    done = threading.Event()
+    box = []
+
+    def got(result):
+        box.append(result)
+        done.set()
+
+    from_cache = c.fetch(got, page, size)
+    done.wait(10.0)
+    return (box[0] if box else None), from_cache
+
+
+def run(folder):
+    path = os.path.join(folder, "leaderboard.json")
+    port = free_port()
+    url = f"http://127.0.0.1:{port}"
+
+    print("1. offline")
+    c = client(url, path)
+    for score in (40, 90, 10):
+        c.submit(score, score // 50 + 1, seconds=60)
+    check(wait_for(lambda: c.stats()["failures"] >= 2), "unreachable server: client backs off and retries")
+    c.close()
+    check(c.stats()["queued"] == 3 and os.path.exists(path), "close() keeps the 3 scores in the queue file")
+    c = client(url, path, backoff=60.0, max_backoff=300.0)
+    check(wait_for(lambda: c.stats()["failures"] >= 1), "next run: the saved scores fail to send, long backoff")
+    c.submit(70, 2)
+    check(wait_for(lambda: len(saved_queue(path)) == 4, timeout=2.0),
+          "a score submitted during the backoff is saved at once")
+    c.close()
+
+    print("2. back online")
+    server = LeaderboardServer(("127.0.0.1", port)).start()
+    c = client(url, path, batch_size=20)
+    for i in range(30):
+        c.submit(100 + i, 3)
+    check(wait_for(lambda: c.stats()["queued"] == 0), "queue drained once the server is up")
+    check(server.board.submissions == 34, f"server got every score once ({server.board.submissions}/34)")
+    check(server.counts["submit"] <= 4, f"scores sent in batches ({server.counts['submit']} requests)")
+    check(server.counts["connections"] == 1, "one kept-alive connection for all requests")
+
+    print("3. page cache")
+    page, from_cache = fetch_sync(c)
+    check(page is not None and not from_cache and page["entries"][0]["score"] == 129,
+          "page 0 fetched, best score first")
+    fetches = server.counts["fetch"]
+    page, from_cache = fetch_sync(c)
+    check(from_cache and server.counts["fetch"] == fetches, "second fetch served from the cache")
+    c.submit(500, 9)
+    check(wait_for(lambda: c.stats()["cached_pages"] == 0), "a sent score invalidates the cache")
+    c.close()
+    server.stop()
+
+    print("4. flaky server")
+    server = LeaderboardServer(("127.0.0.1", port), fail_rate=0.5, seed=3).start()
+    c = client(url, path, batch_size=4)
+    for i in range(12):
+        c.submit(i, 1)
+    check(wait_for(lambda: c.stats()["queued"] == 0, timeout=20), "all scores sent despite 503s")
+    check(server.board.submissions == 12, f"no duplicates after retries ({server.board.submissions}/12)")
+    check(wait_for(lambda: fetch_sync(c)[0] is not None), "a page fetched (and cached) between 503s")
+    server.stop()
+
+    print("5. stale page")
+    c.cache_ttl = 0.0
+    page, from_cache = fetch_sync(c)
+    check(page is not None and page["stale"], "unreachable server: the cached page, marked stale")
+    c.close()
+
+    print("6. slow server")
+    server = LeaderboardServer(("127.0.0.1", port), latency=0.5).start()
+    c = client(url, path, cache_ttl=0.0)
+    t0 = perf_counter()
+    for i in range(5):
+        c.submit(i, 1)
+        c.fetch(lambda result: None)
+    ms = (perf_counter() - t0) * 1000
+    check(ms < 20, f"10 UI-thread calls took {ms:.1f} ms with a 500 ms server")
+    check(wait_for(lambda: c.stats()["queued"] == 0), "and the scores still arrive")
+    c.close()
+    server.stop()
+
+
+def main():
+    folder = tempfile.mkdtemp(prefix="leaderboard_check_")
+    try:
+        run(folder)
+    except CheckFailed as e:
+        print("FAILED:", e)
+        return 1
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+    print("leaderboard check passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
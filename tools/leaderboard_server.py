@@ -0,0 +1,216 @@
+"""A small local leaderboard server, the stand-in for the online one.
+
+Speaks the API puharam.leaderboard.LeaderboardClient uses (POST /scores,
+GET /leaderboard) over HTTP/1.1 keep-alive and keeps the best score per
+player, optionally in a JSON file. --fail-rate and --latency make it
+flaky or slow, to see the client back off and the UI stay smooth.
+
+    python tools/leaderboard_server.py --port 8765
+    PUHARAM_LEADERBOARD_URL=http://127.0.0.1:8765 python main.py
+
+    python tools/leaderboard_server.py --fail-rate 0.5 --latency 0.8 --db board.json
+"""
+import argparse
+import json
+import os
+import random
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+MAX_PAGE_SIZE = 100
+
+
+class Board:
+    """Best score per player; each submitted score id is counted once."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.lock = threading.Lock()
+        self.best = {}       # player -> entry
+        self.seen = set()    # score ids already applied
+        self.submissions = 0
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            self.best = stored.get("best", {})
+            self.seen = set(stored.get("seen", []))
+
+    def add(self, scores):
+        accepted = 0
+        with self.lock:
+            for s in scores:
+                if s["id"] in self.seen:
+                    continue  # a retried batch
+                self.seen.add(s["id"])
+                self.submissions += 1
+                accepted += 1
+                old = self.best.get(s["player"])
+                if old is None or s["score"] > old["score"]:
+                    self.best[s["player"]] = {"name": s["name"], "score": s["score"],
+                                              "level": s["level"], "ended": s.get("ended", 0)}
+                elif s["name"] != old["name"]:
+                    old["name"] = s["name"]
+            if self.path and accepted:
+                self.save()
+        return accepted
+
+    def page(self, page, size):
+        with self.lock:
+            ranked = sorted(self.best.values(), key=lambda e: (-e["score"], e["ended"]))
+        start = page * size
+        entries = [dict(e, rank=start + i + 1) for i, e in enumerate(ranked[start:start + size])]
+        return {"page": page, "size": size, "total": len(ranked), "entries": entries}
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"best": self.best, "seen": sorted(self.seen)}, f)
+        os.replace(tmp_path, self.path)
+
+
+def valid_score(s):
+    return (isinstance(s, dict) and isinstance(s.get("id"), str) and isinstance(s.get("player"), str)
+            and isinstance(s.get("name"), str) and isinstance(s.get("score"), int)
+            and isinstance(s.get("level"), int) and 0 <= s["score"] < 10 ** 7)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, like the real server
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose:
+            super().log_message(fmt, *args)
+
+    def reply(self, status, body=None):
+        data = json.dumps(body).encode("utf-8") if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def flaky(self):
+        # simulated slow / failing server; True when the request was failed
+        server = self.server
+        if server.latency:
+            time.sleep(server.latency)
+        if server.fail_rate and server.rng.random() < server.fail_rate:
+            self.reply(503, {"error": "simulated failure"})
+            return True
+        return False
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path != "/leaderboard":
+            return self.reply(404, {"error": "not found"})
+        self.server.count("fetch")
+        if self.flaky():
+            return
+        query = parse_qs(url.query)
+        try:
+            page = max(0, int(query.get("page", ["0"])[0]))
+            size = min(MAX_PAGE_SIZE, max(1, int(query.get("size", ["10"])[0])))
+        except ValueError:
+            return self.reply(400, {"error": "bad page or size"})
+        self.reply(200, self.server.board.page(page, size))
+
+    def do_POST(self):
+        if urlsplit(self.path).path != "/scores":
+            return self.reply(404, {"error": "not found"})
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length)
+        self.server.count("submit")
+        if self.flaky():
+            return
+        try:
+            scores = json.loads(raw.decode("utf-8"))["scores"]
+        except (ValueError, KeyError, TypeError):
+            return self.reply(400, {"error": "bad body"})
+        if not isinstance(scores, list) or not all(valid_score(s) for s in scores):
+            return self.reply(422, {"error": "bad score"})
+        self.reply(200, {"accepted": self.server.board.add(scores)})
+
+
+class LeaderboardServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), db=None, fail_rate=0.0, latency=0.0, seed=None,
+                 verbose=False):
+        super().__init__(address, Handler)
+        self.board = Board(db)
+        self.fail_rate = fail_rate
+        self.latency = latency
+        self.rng = random.Random(seed)
+        self.verbose = verbose
+        self.counts = {"fetch": 0, "submit": 0, "connections": 0}
+        self.counts_lock = threading.Lock()
+        self.sockets = set()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, kind):
+        with self.counts_lock:
+            self.counts[kind] += 1
+
+    def process_request(self, request, client_address):
+        self.count("connections")
+        with self.counts_lock:
+            self.sockets.add(request)
+        super().process_request(request, client_address)
+
+    def shutdown_request(self, request):
+        with self.counts_lock:
+            self.sockets.discard(request)
+        super().shutdown_request(request)
+
+    def start(self):
+        # serve on a daemon thread (tools/leaderboard_check.py)
+        thread = threading.Thread(target=self.serve_forever, name="leaderboard-server", daemon=True)
+        thread.start()
+        return self
+
+    def stop(self):
+        # like the server going away: kept-alive connections are cut too
+        self.shutdown()
+        self.server_close()
+        with self.counts_lock:
+            sockets, self.sockets = self.sockets, set()
+        for sock in sockets:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--db", help="keep the board in this JSON file (default: in memory)")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of requests answered 503")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    server = LeaderboardServer((args.host, args.port), args.db, args.fail_rate, args.latency,
+                               verbose=args.verbose)
+    print(f"leaderboard at {server.url} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    print("requests:", ", ".join(f"{k}={v}" for k, v in server.counts.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""Play restart cycles headless and fail if objects survive a restart.
+
+Each cycle enters the game, spawns bubbles, steps the world, drags
+bubbles into buckets (education cards and wrong answers included),
+pauses and resumes, leaves to the menu and comes back, ends with a game
+over and restarts through the overlay, like a player would. After every
+restart it collects garbage and checks (see puharam.diagnostics):
+
+* no bubble widget or record is alive outside the screen and its pools,
+* widgets and Clock events (not counting pooled bubbles), overlay cards,
+  animations and textures (outside the label cache) do not grow once the
+  warm-up cycles are done,
+* tracemalloc growth between the last two restarts stays under
+  --max-growth-kb.
+
+Kivy's Clock runs on a virtual time source here, advanced 1/60 s per
+frame, so fades and timers end at the same frame on every run. Before
+each measurement the sound effects are stopped and the clock runs on
+until every animation has finished.
+
+Exits 1 on a leak and prints the counts and the top allocation sites.
+
+    python tools/leak_check.py
+    python tools/leak_check.py --cycles 12 --renderer field
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import bench  # noqa: E402  (headless Kivy setup, BenchTouch, layout, drag)
+from kivy.animation import Animation  # noqa: E402
+from kivy.clock import Clock  # noqa: E402
+
+from puharam.diagnostics import MemoryTracker, counts, report, unaccounted  # noqa: E402
+from puharam.game import GameScreen  # noqa: E402
+from puharam.labels import label_cache  # noqa: E402
+
+# must not grow from one restart to the next once warmed up
+STABLE = ("widgets_outside_pool", "overlay_cards", "animations", "clock_events_outside_pool",
+          "textures_outside_cache")
+FRAME = 1 / 60.
+
+
+class FixedClock:
+    """Kivy's Clock on a virtual time source, advanced by hand."""
+
+    def __init__(self):
+        self.now = Clock.time()
+        Clock.time = lambda: self.now
+        Clock._max_fps = 0  # never sleep waiting for the next real frame
+
+    def tick(self, frames=1):
+        self.now += frames * FRAME
+        Clock.tick()
+
+
+def settle(screen, clock, max_frames=600):
+    # voices end on real audio time; animations and one-shot events on the clock
+    screen.audio.stop_sfx()
+    for _ in range(max_frames):
+        if not Animation._instances:
+            break
+        clock.tick()
+    clock.tick()
+
+
+def play_cycle(screen, bot, clock, frames=240):
+    screen.on_enter()
+    touch_id = 0
+    for f in range(frames):
+        if screen.state == "popup":
+            bench.close_popups(screen)
+        if f % 15 == 0 and screen.spawner.has_room():
+            screen.spawn_bubble_step()
+        screen.update_world(FRAME)
+        if f % 25 == 24 and screen.bubble_widgets:
+            touch_id += 1
+            target = bot.choice((screen.bucket_halal, screen.bucket_haram))
+            bench.drag(screen, bot.choice(screen.bubble_widgets), target, touch_id)
+        if f == frames // 3:
+            screen.pause_game()
+            screen._resume_from_overlay()
+        if f == frames // 2:
+            # to the menu and back
+            screen.on_leave()
+            screen.on_enter()
+        if f % 10 == 9:
+            clock.tick(10)  # lets animations, triggers and one-shot events run
+    if screen.state == "popup":
+        bench.close_popups(screen)
+    screen.state = "running"
+    screen.game_over_popup()
+    screen._restart_from_overlay()
+    for _ in range(3):
+        clock.tick()
+
+
+def measure(screen):
+    gc.collect()
+    c = counts(screen)
+    # the pool keeps up to its max_size bubbles; how many it reached is not a leak
+    pooled = c["bubble_pool_free"] + c["bubble_pool_live"]
+    c["widgets_outside_pool"] = c.get("widgets", 0) - pooled
+    c["clock_events_outside_pool"] = c["clock_events"] - c["bubble_clock_events"]
+    c["textures_outside_cache"] = c["textures"] - len(label_cache.entries)
+    return c
+
+
+def run(cycles=8, warmup=3, renderer=None, seed=1, max_growth_kb=256.0, verbose=False):
+    screen = GameScreen(name="game", seed=seed, renderer=renderer)
+    bench.layout(screen)
+    bot = random.Random(seed)
+    clock = FixedClock()
+    tracker = MemoryTracker()
+    history = []
+    failures = []
+    for cycle in range(cycles):
+        play_cycle(screen, bot, clock)
+        settle(screen, clock)
+        c = measure(screen)
+        history.append(c)
+        left = {k: v for k, v in unaccounted(screen, c).items() if v > 0}
+        if left:
+            failures.append(f"cycle {cycle}: survived the restart: {left}")
+        if cycle >= warmup - 1:
+            tracker.snapshot(f"restart {cycle}")
+        if verbose:
+            print(f"cycle {cycle}: " + ", ".join(f"{k}={c.get(k, 0)}" for k in STABLE))
+
+    base, last = history[warmup - 1], history[-1]
+    for key in STABLE:
+        if last.get(key, 0) > base.get(key, 0):
+            failures.append(f"{key} grew from {base.get(key, 0)} to {last.get(key, 0)} "
+                            f"over {cycles - warmup} restarts")
+    growth, stats = tracker.diff(top=8)
+    if growth > max_growth_kb * 1024:
+        failures.append(f"tracemalloc: {growth / 1024.:.1f} KB growth between the last two restarts")
+    tracker.stop()
+    return screen, history, growth, stats, failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=3,
+                        help="restarts before counts must stay flat (caches fill up)")
+    parser.add_argument("--renderer", choices=("widgets", "field", "both"), default="both")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--max-growth-kb", type=float, default=256.0)
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    renderers = ("widgets", "field") if args.renderer == "both" else (args.renderer,)
+    status = 0
+    for renderer in renderers:
+        screen, history, growth, stats, failures = run(
+            max(args.cycles, args.warmup + 1), args.warmup, renderer, args.seed,
+            args.max_growth_kb, args.verbose)
+        print(f"[{renderer}] {len(history)} restarts, tracemalloc {growth / 1024.:+.1f} KB "
+              f"between the last two")
+        for s in stats:
+            print(f"  {s.size_diff / 1024.:+8.1f} KB {s.count_diff:+6d}  {s.traceback[0]}")
+        if failures:
+            status = 1
+            print(report(screen))
+            print("LEAKS:")
+            for line in failures:
+                print("  " + line)
+        else:
+            print("  no leaks")
+        # the next renderer's counts must not include this screen
+        screen = history = None
+        gc.collect()
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""Run the same sessions on the scalar and the numpy physics; they must match.
+
+The numpy backend keeps bubble state in its own arrays between steps, so
+this plays the things that change them from outside: spawns up to a full
+screen, drags held over several steps, drops into the right bucket
+(removal), the wrong one (back to the start) and onto empty space,
+restarts, and a backend swapped in mid-game. Checked headless on
+GameScreen (both renderers) and on the Kivy-free core.World:
+
+* the positions and speeds of every bubble, every frame, are identical,
+* scripted World sessions end with identical stats and bubbles.
+
+Exits 1 on the first mismatch (skipped when numpy is not installed).
+
+    python tools/physics_check.py
+    python tools/physics_check.py --seeds 50 --frames 2000
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import bench  # noqa: E402  (headless Kivy setup, BenchTouch, layout)
+
+from puharam.core import ScriptedPlayer, World  # noqa: E402
+from puharam.dataset import load_food_dataset  # noqa: E402
+from puharam.physics import create_physics, load_numpy  # noqa: E402
+
+BACKENDS = ("scalar", "numpy")
+
+
+class CheckFailed(Exception):
+    pass
+
+
+def first_mismatch(a, b):
+    for i, (x, y) in enumerate(zip(a, b)):
+        if x != y:
+            return i
+    return min(len(a), len(b)) if len(a) != len(b) else None
+
+
+def compare(name, runs):
+    frame = first_mismatch(*runs)
+    if frame is not None:
+        raise CheckFailed(f"{name}: scalar and numpy differ from frame {frame}")
+    print("  ok  ", name, f"({len(runs[0])} frames)")
+
+
+# ----------------------------
+# GameScreen
+# ----------------------------
+def play(backend, renderer, seed, frames, max_live=30):
+    screen = bench.make_screen(backend, renderer, seed)
+    screen.spawner.max_live = max_live
+    screen.game.lives = 10 ** 6   # wrong drops must not end the run
+    screen.animations = False     # removal on the drop, not after a real-time fade
+    rng = random.Random(seed)
+    held = []                     # [(touch, bubble, frames left)]
+    out = []
+    for f in range(frames):
+        if rng.random() < 0.2 and len(screen.bubble_widgets) < max_live:
+            screen.game.level = 1 + f // 300
+            screen.spawn_bubble_step()
+        if screen.bubble_widgets and rng.random() < 0.05:
+            bubble = rng.choice(screen.bubble_widgets)
+            if not bubble.is_dragging:
+                touch = bench.BenchTouch(f, bubble.center_x, bubble.center_y)
+                screen.on_touch_down(touch)
+                held.append([touch, bubble, rng.randint(1, 20)])
+        for h in list(held):
+            touch, bubble, left = h
+            if left > 0:
+                h[2] -= 1
+                touch.move_to(touch.x + rng.uniform(-15, 15), touch.y + rng.uniform(-15, 15))
+                screen.on_touch_move(touch)
+                continue
+            where = rng.random()
+            if where < 0.6:
+                # into a bucket, right or wrong
+                bucket = rng.choice((screen.bucket_halal, screen.bucket_haram))
+                touch.move_to(*bucket.center)
+            elif where < 0.8:
+                # out of bounds: the next steps push it back in
+                touch.move_to(rng.uniform(-50, 800), rng.uniform(0, 1300))
+            screen.on_touch_move(touch)
+            screen.on_touch_up(touch)
+            held.remove(h)
+            bench.close_popups(screen)
+        if f and f % 700 == 0:
+            for touch, bubble, left in held:
+                screen.on_touch_up(touch)
+            held = []
+            screen._do_restart()
+            screen.spawner.stop()
+            screen.game.lives = 10 ** 6
+        screen.update_world(1 / 60.)
+        out.append([(b.x, b.y, b.dx, b.dy) for b in screen.bubble_widgets])
+    return screen, out
+
+
+def check_screen(seed, frames):
+    for renderer in ("widgets", "field"):
+        runs = [play(backend, renderer, seed, frames)[1] for backend in BACKENDS]
+        compare(f"GameScreen, {renderer} renderer, seed {seed}", runs)
+
+    # a backend swapped in with bubbles already on screen (tools/replay.py --physics)
+    runs = []
+    for backend in BACKENDS:
+        screen, out = play("scalar", None, seed, frames // 2)
+        screen.physics = create_physics(backend)
+        for _ in range(frames // 2):
+            screen.update_world(1 / 60.)
+            out.append([(b.x, b.y, b.dx, b.dy) for b in screen.bubble_widgets])
+        runs.append(out)
+    compare(f"GameScreen, backend swapped mid-game, seed {seed}", runs)
+
+
+# ----------------------------
+# core.World
+# ----------------------------
+def check_world(dataset, seeds):
+    for seed in range(seeds):
+        runs = []
+        for backend in BACKENDS:
+            world = World(dataset, seed=seed, physics=backend)
+            player = ScriptedPlayer(random.Random(seed * 7919 + 1))
+            result = world.run(player, max_time=240.0)
+            runs.append([result] + [(b.x, b.y, b.dx, b.dy) for b in world.bubbles])
+        if runs[0] != runs[1]:
+            raise CheckFailed(f"World seed {seed}: scalar and numpy sessions differ")
+    print("  ok  ", f"World, {seeds} scripted sessions")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seeds", type=int, default=20, help="scripted World sessions")
+    parser.add_argument("--frames", type=int, default=1500, help="GameScreen frames per run")
+    args = parser.parse_args(argv)
+
+    if load_numpy() is None:
+        print("numpy not installed, skipping physics check")
+        return 0
+    try:
+        check_screen(1, args.frames)
+        check_screen(2, args.frames)
+        check_world(load_food_dataset(), args.seeds)
+    except CheckFailed as e:
+        print("FAILED:", e)
+        return 1
+    print("physics check passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""Replay a recorded session headless and check it reproduces exactly.
+
+Sessions are recorded by the game with PUHARAM_RECORD=<dir> (see
+puharam.recording.SessionRecorder). The replayer rebuilds GameScreen
+with the recorded seed, physics, simulation rate, selection strategy
+and renderer, feeds every tick, spawn, touch and overlay action back
+through it and compares score, lives, level and the bubble trajectory
+digest at every checkpoint.
+
+    python tools/replay.py session.log.gz               # as fast as possible
+    python tools/replay.py session.log.gz --speed 1     # real time
+    python tools/replay.py session.log.gz --repeat 5 --json replay.json
+    python tools/replay.py --make-demo demo.log.gz --ticks 3600 --seed 7
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import bench  # noqa: E402  (headless Kivy setup, BenchTouch, layout)
+from bench import BenchTouch  # noqa: E402
+
+from puharam.dataset import open_food_dataset  # noqa: E402
+from puharam.game import GameScreen  # noqa: E402
+from puharam.physics import create_physics  # noqa: E402
+from puharam.recording import read_session, session_snapshot  # noqa: E402
+from puharam.selection import create_selector  # noqa: E402
+
+
+class Divergence(Exception):
+    pass
+
+
+def build_screen(header, physics=None, renderer=None):
+    screen = GameScreen(name="game", seed=header["seed"],
+                        renderer=renderer or header.get("renderer"))
+    screen.physics = create_physics(physics or header.get("physics"))
+    screen.set_sim_rate(header["sim_hz"])
+    screen.selector = create_selector(screen.food_dataset, header.get("selection"),
+                                      rng=screen.rng)
+    return screen
+
+
+def replay(path, speed=0.0, physics=None, renderer=None):
+    """Feed a session log through GameScreen; returns a result dict.
+
+    speed 0 runs as fast as possible, 1 is real time, 2 twice as fast.
+    Raises Divergence at the first checkpoint that does not match.
+    """
+    header, events = read_session(path)
+    dataset = getattr(open_food_dataset(), "version", None)
+    if header.get("dataset") != dataset:
+        print(f"warning: recorded with dataset {header.get('dataset')}, have {dataset}")
+
+    screen = build_screen(header, physics, renderer)
+    touches = {}
+    checks = ticks = 0
+    handlers = {
+        "spawn": screen.spawn_bubble_step,
+        "enter": screen.on_enter,
+        "leave": screen.on_leave,
+        "pause": screen.pause_game,
+        "resume": screen._resume_from_overlay,
+        "restart": screen._restart_from_overlay,
+        "menu": screen._menu_from_overlay,
+        "close_popup": screen._close_education_popup,
+    }
+
+    t0 = perf_counter()
+    for ms, kind, *args in events:
+        if speed > 0:
+            delay = ms / 1000. / speed - (perf_counter() - t0)
+            if delay > 0:
+                time.sleep(delay)
+        if kind == "tick":
+            screen.update_world(args[0])
+            ticks += 1
+        elif kind == "size":
+            bench.layout(screen, tuple(args))
+        elif kind == "down":
+            touch = touches[args[0]] = BenchTouch(args[0], args[1], args[2])
+            screen.on_touch_down(touch)
+        elif kind == "move":
+            touch = touches[args[0]]
+            touch.move_to(args[1], args[2])
+            screen.on_touch_move(touch)
+        elif kind == "up":
+            touch = touches.pop(args[0])
+            touch.move_to(args[1], args[2])
+            screen.on_touch_up(touch)
+        elif kind in ("check", "end"):
+            got = session_snapshot(screen)
+            if got != args:
+                raise Divergence(f"tick {ticks}: expected {args}, got {got}")
+            checks += 1
+        else:
+            handlers[kind]()
+    wall = perf_counter() - t0
+
+    recorded = events[-1][0] / 1000. if events else 0.0
+    return {
+        "events": len(events),
+        "ticks": ticks,
+        "checkpoints": checks,
+        "score": screen.score,
+        "lives": screen.lives,
+        "level": screen.level,
+        "recorded_s": recorded,
+        "replay_s": wall,
+        "speedup": recorded / wall if wall else 0.0,
+        "ticks_per_sec": ticks / wall if wall else 0.0,
+    }
+
+
+def make_demo(path, ticks=3600, seed=1234, bot_seed=1, renderer=None):
+    """Record a scripted session headless (a bot dragging bubbles)."""
+    bot = random.Random(bot_seed)
+    screen = GameScreen(name="game", seed=seed, renderer=renderer)
+    bench.layout(screen)
+    screen.start_recording(path)
+    screen.on_enter()
+    next_spawn = 0
+    touch_id = 0
+    for tick in range(ticks):
+        if screen.state == "popup":
+            screen._close_education_popup()
+        elif screen.state == "game_over":
+            screen._restart_from_overlay()
+        if tick >= next_spawn:
+            if screen.spawner.has_room():
+                screen.spawn_bubble_step()
+            next_spawn = tick + int(screen.spawner.interval() * 60)
+        screen.update_world(1 / 60.)
+        if tick % 45 == 44 and screen.bubble_widgets:
+            bubble = bot.choice(screen.bubble_widgets)
+            target = bot.choice((screen.bucket_halal, screen.bucket_haram))
+            touch_id += 1
+            bench.drag(screen, bubble, target, touch_id)
+    screen.stop_recording()
+    return path
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("log", nargs="?", type=bench.cli_path, help="session log (.log.gz)")
+    parser.add_argument("--speed", type=float, default=0.0,
+                        help="0 = as fast as possible (default), 1 = real time")
+    parser.add_argument("--repeat", type=int, default=1, help="replay N times, report the best")
+    parser.add_argument("--physics", choices=("scalar", "numpy"), default=None,
+                        help="override the recorded physics backend")
+    parser.add_argument("--renderer", choices=("widgets", "field"), default=None,
+                        help="override the recorded renderer")
+    parser.add_argument("--json", type=bench.cli_path, help="write the result to this file")
+    parser.add_argument("--make-demo", type=bench.cli_path, metavar="PATH",
+                        help="record a scripted session and exit")
+    parser.add_argument("--ticks", type=int, default=3600)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args(argv)
+
+    if args.make_demo:
+        print("recorded", make_demo(args.make_demo, args.ticks, args.seed, renderer=args.renderer))
+        return 0
+    if not args.log:
+        parser.error("a session log is required")
+
+    best = None
+    for _ in range(max(1, args.repeat)):
+        try:
+            result = replay(args.log, args.speed, args.physics, args.renderer)
+        except Divergence as e:
+            print("DIVERGED:", e)
+            return 1
+        if best is None or result["replay_s"] < best["replay_s"]:
+            best = result
+    print(json.dumps(best, indent=2))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(best, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,121 @@
+"""Import-time budget for the menu path, measured with `python -X importtime`.
+
+Imports puharam.app (everything needed to show the menu) in a fresh
+interpreter a few times, takes the median and fails when
+
+* the whole import is over --budget-ms,
+* the puharam modules themselves (self time) are over --own-budget-ms, or
+* a module that belongs to the game path (game screen, bubbles, numpy,
+  sqlite3, audio, ...) is imported before the game starts.
+
+    python tools/startup_bench.py
+    python tools/startup_bench.py --runs 9 --budget-ms 300 --json startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MENU_MODULE = "puharam.app"
+GAME_MODULE = "puharam.game"
+
+# must not be imported before the player presses Start
+GAME_ONLY = (
+    "puharam.game",
+    "puharam.bubbles",
+    "puharam.core",
+    "puharam.physics",
+    "puharam.labels",
+    "puharam.overlays",
+    "puharam.telemetry",
+    "puharam.recording",
+    "numpy",
+    "sqlite3",
+    "gzip",
+    "cProfile",
+    "kivy.core.audio",
+)
+
+
+def measure(*modules):
+    """{module: (self us, cumulative us)} for one fresh `import <modules>`."""
+    env = dict(os.environ, KIVY_NO_ARGS="1", KIVY_NO_CONSOLELOG="1")
+    cmd = [sys.executable, "-X", "importtime", "-c", "import " + ", ".join(modules)]
+    proc = subprocess.run(cmd, cwd=ROOT, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr[-2000:])
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative))
+    return times
+
+
+def run(runs=5):
+    measure(MENU_MODULE)  # warm-up: writes .pyc files, fills the OS cache
+    samples = [measure(MENU_MODULE) for _ in range(runs)]
+    last = samples[-1]
+
+    total = statistics.median(s[MENU_MODULE][1] for s in samples) / 1000.
+    own = statistics.median(sum(v[0] for k, v in s.items() if k.split(".")[0] == "puharam")
+                            for s in samples) / 1000.
+    # what pressing Start adds on top of the menu path
+    game = statistics.median(measure(MENU_MODULE, GAME_MODULE)[GAME_MODULE][1]
+                             for _ in range(runs)) / 1000.
+    slowest = sorted(((v[0], k) for k, v in last.items()), reverse=True)[:10]
+    return {
+        "runs": runs,
+        "menu_import_ms": total,
+        "own_modules_ms": own,
+        "game_import_ms": game,
+        "modules": len(last),
+        "game_modules_on_menu_path": [m for m in GAME_ONLY if m in last],
+        "slowest_self_ms": [(name, us / 1000.) for us, name in slowest],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=350.0,
+                        help="max median import time of the menu path (default 350)")
+    parser.add_argument("--own-budget-ms", type=float, default=20.0,
+                        help="max self time of the puharam modules on it (default 20)")
+    parser.add_argument("--json", help="write the result to this file")
+    args = parser.parse_args(argv)
+
+    result = run(args.runs)
+    print(f"menu path ({MENU_MODULE}): {result['menu_import_ms']:.1f} ms, "
+          f"{result['modules']} modules, puharam itself {result['own_modules_ms']:.1f} ms")
+    print(f"game path ({GAME_MODULE}, on Start): +{result['game_import_ms']:.1f} ms")
+    print("slowest imports (self time):")
+    for name, ms in result["slowest_self_ms"]:
+        print(f"  {ms:7.1f} ms  {name}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+    failures = []
+    if result["menu_import_ms"] > args.budget_ms:
+        failures.append(f"menu import {result['menu_import_ms']:.1f} ms > {args.budget_ms} ms")
+    if result["own_modules_ms"] > args.own_budget_ms:
+        failures.append(f"puharam modules {result['own_modules_ms']:.1f} ms > {args.own_budget_ms} ms")
+    for name in result["game_modules_on_menu_path"]:
+        failures.append(f"{name} is imported on the menu path")
+    if failures:
+        print("OVER BUDGET:")
+        for line in failures:
+            print("  " + line)
+        return 1
+    print("within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""Per-food error rate and time-to-decision from the telemetry database.
+
+The game writes gameplay events to telemetry.db in its user data dir (see
+puharam.telemetry.Telemetry). This prints the foods players miss most often and the
+ones they take longest to decide on:
+
+    python tools/telemetry_report.py path/to/telemetry.db
+    python tools/telemetry_report.py telemetry.db --min-attempts 5 --limit 10
+"""
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+
+from puharam.telemetry import Telemetry  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("db", help="telemetry.db written by the game")
+    parser.add_argument("--min-attempts", type=int, default=3)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        parser.error(f"{args.db} does not exist")
+    telemetry = Telemetry(args.db)
+
+    print("Most missed (attempts >= %d)" % args.min_attempts)
+    print("%-32s %-8s %8s %6s %7s" % ("food", "status", "attempts", "wrong", "error"))
+    for food, category, attempts, wrong, rate in telemetry.error_rates(args.min_attempts,
+                                                                       args.limit):
+        print("%-32s %-8s %8d %6d %6.0f%%" % (food[:32], category, attempts, wrong, rate * 100))
+
+    print()
+    print("Slowest decisions (spawn to drop)")
+    print("%-32s %8s %9s %9s" % ("food", "drops", "mean", "max"))
+    for food, n, mean, worst in telemetry.decision_times(args.min_attempts, args.limit):
+        print("%-32s %8d %7.0fms %7.0fms" % (food[:32], n, mean, worst))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())